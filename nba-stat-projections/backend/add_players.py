@@ -90,7 +90,7 @@ async def add_player_from_api(player_id, team_id):
         )
         
         # Save to database
-        created_player = await repo.create_player(player)
+        created_player, _ = await repo.create_player(player)
         print(f"✅ Successfully added player: {created_player.full_name}")
         return created_player
         
@@ -0,0 +1,145 @@
+"""
+Admin endpoints for regenerating projections on demand and fetching profiles
+"""
+import os
+import secrets
+import time
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from app.models.schemas import GenerationResult, PlayerProjection, ProfileSummary
+from app.projections.service import ProjectionService
+from app.api.projections import get_projection_service
+from app.utils.profiling import list_profiles, profile_file
+
+router = APIRouter()
+
+# Shared secret required in the X-Admin-Key header; admin endpoints are disabled when unset
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """Reject requests without the admin key, comparing in constant time"""
+    if not ADMIN_API_KEY or not secrets.compare_digest((x_admin_key or "").encode(), ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=403, detail="Admin key required")
+
+
+def generation_result(
+    service: ProjectionService,
+    projections: List[PlayerProjection],
+    started: float
+) -> GenerationResult:
+    """Summarize a generation run"""
+    return GenerationResult(
+        model_version=service.projection_model.model_version,
+        game_ids=sorted({projection.game_id for projection in projections}),
+        projections=len(projections),
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1)
+    )
+
+
+@router.post(
+    "/games/{game_id}/projections",
+    response_model=GenerationResult,
+    dependencies=[Depends(require_admin_key)]
+)
+async def generate_game_projections(
+    game_id: str,
+    service: ProjectionService = Depends(get_projection_service)
+):
+    """
+    Regenerate projections for every player in a game
+    
+    Args:
+        game_id: NBA API game ID
+        
+    Returns:
+        GenerationResult: Summary of the run
+    """
+    started = time.perf_counter()
+    try:
+        projections = await service.generate_game_projections(game_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return generation_result(service, projections, started)
+
+
+@router.post(
+    "/projections/generate",
+    response_model=GenerationResult,
+    dependencies=[Depends(require_admin_key)]
+)
+async def generate_date_projections(
+    game_date: Optional[date] = None,
+    service: ProjectionService = Depends(get_projection_service)
+):
+    """
+    Regenerate projections for every game on a date
+    
+    Args:
+        game_date: Slate date (defaults to today)
+        
+    Returns:
+        GenerationResult: Summary of the run
+    """
+    started = time.perf_counter()
+    try:
+        projections = await service.generate_date_projections(game_date or date.today())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return generation_result(service, projections, started)
+
+
+@router.get(
+    "/profiles",
+    response_model=List[ProfileSummary],
+    dependencies=[Depends(require_admin_key)]
+)
+async def get_profiles(
+    limit: int = Query(20, ge=1, le=200, description="Number of profiles to return")
+):
+    """
+    Latest captured profiles, newest first
+    
+    Profiles are only captured when PROFILING_ENABLED is set, and each
+    worker process writes to PROFILE_DIR on its own pod.
+    
+    Args:
+        limit: Number of profiles to return
+        
+    Returns:
+        List[ProfileSummary]: Profiles with their top functions or call tree
+    """
+    return list_profiles(limit)
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    dependencies=[Depends(require_admin_key)]
+)
+async def download_profile(profile_id: str):
+    """
+    Download a raw profile
+    
+    cProfile captures are pstats files (open with snakeviz or
+    python -m pstats); pyinstrument captures are HTML pages.
+    
+    Args:
+        profile_id: Profile ID from /profiles
+        
+    Returns:
+        FileResponse: The profile file
+    """
+    path = profile_file(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    
+    media_type = "text/html" if path.endswith(".html") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
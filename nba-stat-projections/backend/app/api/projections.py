@@ -2,57 +2,242 @@
 API endpoints for player projections
 """
 from datetime import date
-from typing import List, Optional
-from fastapi import APIRouter, Query, HTTPException, Depends
+from typing import List, Optional, Union
+from fastapi import APIRouter, Query, HTTPException, Depends, Request
 
-from app.models.schemas import ProjectionResponse, Player, Game, Team, PlayerProjection
-from app.projections.service import ProjectionService
+from app.models.schemas import (
+    ProjectionResponse, Player, Game, Team, PlayerProjection, PropScanRequest, PropScanResponse,
+    NormalizedProjectionsResponse, BatchProjectionRequest, PlayerSearchResult, LeaderboardEntry
+)
+from app.projections.service import (
+    ProjectionService, normalize_projection_responses, DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+)
+from app.projections.algorithms import PROJECTED_STATS
+from app.projections.registry import model_registry
+from app.data.repository import TEAM_ID_PATTERN
+from app.api.responses import ORJSONResponse, wants_ndjson, ndjson_response, sse_response
+from app.utils.http_cache import cache_headers, conditional_etag, is_not_modified, not_modified_response
 
 router = APIRouter()
 
+# Hot GET endpoints return ORJSONResponse directly: the service already builds
+# validated pydantic models, so re-validating them against response_model
+# only costs CPU. response_model is kept for the OpenAPI schema.
 
-def get_projection_service():
+
+def get_projection_service(
+    model_version: Optional[str] = Query(None, description="Serve projections from this model version")
+):
     """Dependency injection for projection service"""
-    return ProjectionService()
+    if model_version is None:
+        return ProjectionService()
+    
+    if not model_registry.is_registered(model_version):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown model version {model_version}. Expected a version starting with one of: "
+                   f"{', '.join(model_registry.prefixes())}"
+        )
+    
+    return ProjectionService(model_version=model_version, filter_model_version=True)
+
+
+def validate_confidence_stat(confidence_stat: Optional[str]) -> None:
+    """Reject unknown stat names for per-stat confidence filters"""
+    if confidence_stat is not None and confidence_stat not in PROJECTED_STATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown stat {confidence_stat}. Expected one of: {', '.join(PROJECTED_STATS)}"
+        )
+
 
+def validate_team_id(team_id: Optional[str]) -> None:
+    """Reject team IDs that are not numeric NBA API IDs"""
+    if team_id is not None and not TEAM_ID_PATTERN.fullmatch(team_id):
+        raise HTTPException(status_code=400, detail=f"Invalid team ID {team_id}. Expected a numeric NBA API team ID")
 
-@router.get("/players", response_model=List[Player])
+
+def parse_fields(fields: Optional[str], model) -> Optional[List[str]]:
+    """
+    Parse a comma-separated fields parameter against a model's fields
+    
+    Args:
+        fields: Comma-separated field names, or None for all fields
+        model: Pydantic model the fields must belong to
+        
+    Returns:
+        Optional[List[str]]: Field names, or None for all fields
+    """
+    if not fields:
+        return None
+    
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in names if name not in model.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields {', '.join(unknown)}. Expected any of: {', '.join(model.model_fields)}"
+        )
+    return names
+
+
+def page_headers(request: Request, next_cursor: Optional[str], headers: Optional[dict] = None) -> Optional[dict]:
+    """Add X-Next-Cursor and a Link rel="next" header when another page exists"""
+    if next_cursor is None:
+        return headers
+    
+    headers = dict(headers or {})
+    headers["X-Next-Cursor"] = next_cursor
+    headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    return headers
+
+
+@router.get("/players", response_model=List[Player], response_class=ORJSONResponse)
 async def get_players(
+    request: Request,
+    team_id: Optional[str] = Query(None, description="Filter by team ID"),
+    position: Optional[str] = Query(None, description="Filter by position"),
+    active_only: bool = Query(True, description="Only return active players"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_LIMIT, description=f"Page size (default {DEFAULT_PAGE_LIMIT}; NDJSON streams are unlimited)"
+    ),
+    fields: Optional[str] = Query(None, description="Comma-separated player fields to return"),
+    service: ProjectionService = Depends(get_projection_service)
+):
+    """
+    Get players with available projections, one page at a time
+    
+    Results are ordered by player ID. When more players remain, the
+    response carries an X-Next-Cursor header (and a Link rel="next" header)
+    to pass back as `cursor`.
+    
+    Send `Accept: application/x-ndjson` to stream every matching player,
+    one per line, as pages are fetched instead of receiving a single page.
+    The stream starts after `cursor`, carries only `fields`, and stops
+    after `limit` players when a limit is given.
+    
+    Args:
+        team_id: Optional team ID filter
+        position: Optional position filter
+        active_only: Whether to return only active players
+        cursor: Optional cursor from the previous page
+        limit: Page size (for NDJSON, the most players to stream)
+        fields: Optional comma-separated subset of player fields
+        
+    Returns:
+        List[Player]: One page of players
+    """
+    field_names = parse_fields(fields, Player)
+    
+    etag = await conditional_etag(request, service.repository)
+    if etag and is_not_modified(request, etag):
+        return not_modified_response(etag)
+    headers = cache_headers(etag) if etag else None
+    
+    if wants_ndjson(request):
+        return ndjson_response(
+            service.iter_players(
+                active_only=active_only,
+                team_id=team_id,
+                position=position,
+                cursor=cursor,
+                limit=limit,
+                fields=field_names
+            ),
+            headers=headers
+        )
+    
+    try:
+        players, next_cursor = await service.list_players(
+            active_only=active_only,
+            team_id=team_id,
+            position=position,
+            cursor=cursor,
+            limit=limit or DEFAULT_PAGE_LIMIT,
+            fields=field_names
+        )
+        return ORJSONResponse(players, headers=page_headers(request, next_cursor, headers))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/players/search", response_model=List[PlayerSearchResult], response_class=ORJSONResponse)
+async def search_players(
+    q: str = Query(..., min_length=1, max_length=100, description="Player name or part of it"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of matches"),
+    active_only: bool = Query(True, description="Only match active players"),
+    team_id: Optional[str] = Query(None, description="Filter by team ID"),
     service: ProjectionService = Depends(get_projection_service)
 ):
     """
-    Get all players with available projections
+    Search players by name
     
+    Matches whole names, name prefixes ("steph"), word prefixes in any
+    order ("james leb") and, failing those, misspellings ("embid",
+    "antetokumpo"). Accents and punctuation are ignored.
+    
+    Args:
+        q: Name query
+        limit: Maximum number of matches
+        active_only: Whether to match only active players
+        team_id: Optional team ID filter
+        
     Returns:
-        List[Player]: List of players with available projections
+        List[PlayerSearchResult]: Matching players with scores, best first
     """
     try:
-        return await service.get_players()
+        results = await service.search_players(q, limit=limit, active_only=active_only, team_id=team_id)
+        return ORJSONResponse(results)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/games", response_model=List[Game])
+@router.get("/games", response_model=List[Game], response_class=ORJSONResponse)
 async def get_games(
+    request: Request,
     date: Optional[date] = Query(None, description="Filter games by date (YYYY-MM-DD)"),
+    season: Optional[str] = Query(None, description="Filter by season ID (e.g. 22024)"),
+    team_id: Optional[str] = Query(None, description="Filter to games involving this team"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="Page size"),
+    fields: Optional[str] = Query(None, description="Comma-separated game fields to return"),
     service: ProjectionService = Depends(get_projection_service)
 ):
     """
-    Get all games with available projections
+    Get games with available projections, one page at a time
+    
+    Results are ordered by game ID and paged the same way as /players.
     
     Args:
         date: Optional date filter
+        season: Optional season ID filter
+        team_id: Optional filter for games involving this team
+        cursor: Optional cursor from the previous page
+        limit: Page size
+        fields: Optional comma-separated subset of game fields
         
     Returns:
-        List[Game]: List of games with available projections
+        List[Game]: One page of games
     """
+    validate_team_id(team_id)
+    field_names = parse_fields(fields, Game)
+    
     try:
-        return await service.get_games(date)
+        games, next_cursor = await service.list_games(
+            game_date=date,
+            season=season,
+            team_id=team_id,
+            cursor=cursor,
+            limit=limit,
+            fields=field_names
+        )
+        return ORJSONResponse(games, headers=page_headers(request, next_cursor))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/players/{player_id}/projections", response_model=List[ProjectionResponse])
+@router.get("/players/{player_id}/projections", response_model=List[ProjectionResponse], response_class=ORJSONResponse)
 async def get_player_projections(
     player_id: str,
     game_id: Optional[str] = Query(None, description="Filter by specific game ID"),
@@ -69,17 +254,21 @@ async def get_player_projections(
         List[ProjectionResponse]: List of projections for the player
     """
     try:
-        return await service.get_player_projections(player_id, game_id)
+        return ORJSONResponse(await service.get_player_projections(player_id, game_id))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/games/{game_id}/projections", response_model=List[ProjectionResponse])
+@router.get("/games/{game_id}/projections", response_model=List[ProjectionResponse], response_class=ORJSONResponse)
 async def get_game_projections(
+    request: Request,
     game_id: str,
     team_id: Optional[str] = Query(None, description="Filter by team ID"),
+    min_confidence: Optional[float] = Query(None, ge=0, le=100, description="Minimum confidence score"),
+    confidence_stat: Optional[str] = Query(None, description="Apply min_confidence to this stat's confidence"),
+    simulate: bool = Query(False, description="Attach simulated p10/p25/p50/p75/p90 per stat"),
     service: ProjectionService = Depends(get_projection_service)
 ):
     """
@@ -88,35 +277,190 @@ async def get_game_projections(
     Args:
         game_id: NBA API game ID
         team_id: Optional team ID filter
+        min_confidence: Optional minimum confidence score filter
+        confidence_stat: Optional stat whose confidence min_confidence applies to
+        simulate: Whether to attach simulated stat quantiles
         
     Returns:
         List[ProjectionResponse]: List of player projections for the game
     """
+    validate_confidence_stat(confidence_stat)
+    
+    etag = await conditional_etag(request, service.repository)
+    if etag and is_not_modified(request, etag):
+        return not_modified_response(etag)
+    headers = cache_headers(etag) if etag else None
+    
     try:
-        return await service.get_game_projections(game_id, team_id)
+        return ORJSONResponse(await service.get_game_projections(
+            game_id, team_id, min_confidence, confidence_stat, simulate
+        ), headers=headers)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/today", response_model=List[ProjectionResponse])
+@router.get(
+    "/today",
+    response_model=Union[List[ProjectionResponse], NormalizedProjectionsResponse],
+    response_class=ORJSONResponse
+)
 async def get_today_projections(
+    request: Request,
     player_id: Optional[str] = Query(None, description="Filter by player ID"),
     team_id: Optional[str] = Query(None, description="Filter by team ID"),
+    min_confidence: Optional[float] = Query(None, ge=0, le=100, description="Minimum confidence score"),
+    confidence_stat: Optional[str] = Query(None, description="Apply min_confidence to this stat's confidence"),
+    simulate: bool = Query(False, description="Attach simulated p10/p25/p50/p75/p90 per stat"),
+    normalized: bool = Query(False, description="Emit teams, games and players once and reference them by ID"),
     service: ProjectionService = Depends(get_projection_service)
 ):
     """
     Get projections for today's games
     
+    Send `Accept: application/x-ndjson` to stream one projection per line as
+    they are assembled instead of receiving a single JSON array. Pass
+    `normalized=true` for a much smaller document where each team, game and
+    player appears once.
+    
     Args:
         player_id: Optional player ID filter
         team_id: Optional team ID filter
+        min_confidence: Optional minimum confidence score filter
+        confidence_stat: Optional stat whose confidence min_confidence applies to
+        simulate: Whether to attach simulated stat quantiles
+        normalized: Whether to return the normalized listing
         
     Returns:
         List[ProjectionResponse]: List of projections for today's games
     """
+    validate_confidence_stat(confidence_stat)
+    
+    etag = await conditional_etag(request, service.repository)
+    if etag and is_not_modified(request, etag):
+        return not_modified_response(etag)
+    headers = cache_headers(etag) if etag else None
+    
+    try:
+        if wants_ndjson(request):
+            if simulate:
+                # Quantiles need the whole slate before the first row can be sent
+                return ndjson_response(await service.get_today_projections(
+                    player_id, team_id, min_confidence, confidence_stat, simulate
+                ), headers=headers)
+            return ndjson_response(
+                service.iter_today_projections(player_id, team_id, min_confidence, confidence_stat),
+                headers=headers
+            )
+        
+        responses = await service.get_today_projections(
+            player_id, team_id, min_confidence, confidence_stat, simulate
+        )
+        if normalized:
+            return ORJSONResponse(normalize_projection_responses(responses), headers=headers)
+        return ORJSONResponse(responses, headers=headers)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+
+@router.get("/leaderboards/{stat}", response_model=List[LeaderboardEntry], response_class=ORJSONResponse)
+async def get_leaderboard(
+    request: Request,
+    stat: str,
+    limit: int = Query(10, ge=1, le=100, description="Number of players"),
+    service: ProjectionService = Depends(get_projection_service)
+):
+    """
+    Get the highest projections for a stat in today's games
+    
+    Args:
+        stat: Stat to rank by (points, rebounds, assists, ...)
+        limit: Number of players
+        
+    Returns:
+        List[LeaderboardEntry]: Ranked projections, best first
+    """
+    if stat not in PROJECTED_STATS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown stat {stat}. Expected one of: {', '.join(PROJECTED_STATS)}"
+        )
+    
+    etag = await conditional_etag(request, service.repository)
+    if etag and is_not_modified(request, etag):
+        return not_modified_response(etag)
+    headers = cache_headers(etag) if etag else None
+    
+    try:
+        return ORJSONResponse(await service.get_leaderboard(stat, limit), headers=headers)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stream")
+async def stream_projection_changes(
+    game_id: Optional[str] = Query(None, description="Only push changes for this game"),
+    player_id: Optional[str] = Query(None, description="Only push changes for this player"),
+    service: ProjectionService = Depends(get_projection_service)
+):
+    """
+    Push projection changes as server-sent events
+    
+    Each "projections" event carries a JSON list of diffs, one per changed
+    projection, with the row's player_id, game_id and model_version and only
+    the fields that changed. A "resync" event means this client fell behind
+    and should refetch before applying further diffs.
+    
+    Args:
+        game_id: Optional game ID filter
+        player_id: Optional player ID filter
+        
+    Returns:
+        StreamingResponse: text/event-stream of projection diffs
+    """
+    return sse_response(service.stream_projection_changes(game_id=game_id, player_id=player_id))
+
+
+@router.post("/batch", response_model=List[ProjectionResponse], response_class=ORJSONResponse)
+async def get_batch_projections(
+    request: BatchProjectionRequest,
+    service: ProjectionService = Depends(get_projection_service)
+):
+    """
+    Get projections for many players and/or games in one round trip
+    
+    Args:
+        request: Player IDs and/or game IDs; when both are given, only those
+            players' projections in those games are returned
+        
+    Returns:
+        List[ProjectionResponse]: Matching projections ordered by player, then game
+    """
+    if not request.player_ids and not request.game_ids:
+        raise HTTPException(status_code=400, detail="Provide at least one player_id or game_id")
+    
     try:
-        return await service.get_today_projections(player_id, team_id)
+        return ORJSONResponse(await service.get_batch_projections(request.player_ids, request.game_ids))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/props/edges", response_model=PropScanResponse)
+async def scan_prop_lines(
+    request: PropScanRequest,
+    service: ProjectionService = Depends(get_projection_service)
+):
+    """
+    Rank a bulk upload of prop lines by edge against simulated projections
+    
+    Args:
+        request: Prop lines and optional slate date
+        
+    Returns:
+        PropScanResponse: Lines ranked by edge, plus lines with no matching projection
+    """
+    try:
+        return await service.scan_prop_lines(request.lines, request.game_date)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,119 @@
+"""
+Response helpers for projection endpoints
+"""
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Optional, Union
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app.utils.tracing import span
+
+# Media type for newline-delimited JSON streams
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Media type for server-sent event streams
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def _orjson_default(value: Any) -> Any:
+    """Serialize pydantic models that orjson does not handle natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes with orjson"""
+    return orjson.dumps(content, default=_orjson_default)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson
+
+    Returning this from an endpoint also skips FastAPI's response_model
+    validation, so it is meant for data the service has already built as
+    validated pydantic models.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Render content to JSON bytes"""
+        with span("serialize"):
+            return dumps(content)
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Whether the client asked for a newline-delimited JSON stream"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _ndjson_lines(rows: Union[Iterable[BaseModel], AsyncIterable[BaseModel]]) -> AsyncIterator[bytes]:
+    """Serialize each row to one JSON line as soon as it is produced"""
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            yield dumps(row) + b"\n"
+    else:
+        for row in rows:
+            yield dumps(row) + b"\n"
+
+
+def ndjson_response(
+    rows: Union[Iterable[BaseModel], AsyncIterable[BaseModel]],
+    headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """
+    Stream rows as newline-delimited JSON
+
+    Args:
+        rows: Rows to stream, either produced lazily or already built
+        headers: Optional extra response headers
+
+    Returns:
+        StreamingResponse: One JSON object per line
+    """
+    return StreamingResponse(_ndjson_lines(rows), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+async def _sse_messages(events: AsyncIterable[Optional[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """
+    Frame feed events as server-sent events
+
+    {'diffs': [...]} becomes a "projections" event, {'resync': True} a
+    "resync" event, and None a comment line that keeps proxies from closing
+    an idle connection.
+    """
+    yield b"retry: 5000\n\n"
+    event_id = 0
+    try:
+        async for event in events:
+            if event is None:
+                yield b": keepalive\n\n"
+                continue
+
+            event_id += 1
+            if event.get("resync"):
+                yield b"id: %d\nevent: resync\ndata: {}\n\n" % event_id
+            else:
+                yield b"id: %d\nevent: projections\ndata: " % event_id + dumps(event["diffs"]) + b"\n\n"
+    finally:
+        # Release the subscription as soon as the client goes away
+        if hasattr(events, "aclose"):
+            await events.aclose()
+
+
+def sse_response(events: AsyncIterable[Optional[Dict[str, Any]]]) -> StreamingResponse:
+    """
+    Stream feed events as server-sent events
+
+    Args:
+        events: Feed events from ProjectionService.stream_projection_changes
+
+    Returns:
+        StreamingResponse: text/event-stream response
+    """
+    return StreamingResponse(
+        _sse_messages(events),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
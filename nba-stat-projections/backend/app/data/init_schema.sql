@@ -96,11 +96,49 @@ CREATE TABLE IF NOT EXISTS player_projections (
     projected_field_goal_percentage NUMERIC NOT NULL,
     projected_free_throw_percentage NUMERIC NOT NULL,
     confidence_score NUMERIC NOT NULL,
+    stat_confidence JSONB,
+    stat_std JSONB,
+    stat_quantiles JSONB,
     model_version TEXT NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    -- Stamped by the database on every insert and update; change feeds read by it
+    written_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT clock_timestamp(),
     UNIQUE(player_id, game_id, model_version)
 );
 
+-- Data version counters, bumped whenever ingested data changes so API
+-- pods can answer conditional GETs without re-querying the data
+CREATE TABLE IF NOT EXISTS data_versions (
+    key TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Atomically increment a data version counter and return the new value
+CREATE OR REPLACE FUNCTION bump_data_version(version_key TEXT DEFAULT 'projections')
+RETURNS BIGINT AS $$
+    INSERT INTO data_versions (key, version) VALUES (version_key, 1)
+    ON CONFLICT (key) DO UPDATE
+        SET version = data_versions.version + 1, updated_at = CURRENT_TIMESTAMP
+    RETURNING version;
+$$ LANGUAGE sql;
+
+-- Atomically increment several data version counters in one call and return their new values
+CREATE OR REPLACE FUNCTION bump_data_versions(version_keys TEXT[])
+RETURNS TABLE (key TEXT, version BIGINT) AS $$
+    INSERT INTO data_versions AS counters (key, version)
+    SELECT DISTINCT unnest(version_keys), 1
+    ON CONFLICT (key) DO UPDATE
+        SET version = counters.version + 1, updated_at = CURRENT_TIMESTAMP
+    RETURNING counters.key, counters.version;
+$$ LANGUAGE sql;
+
+-- Columns added after the initial release
+ALTER TABLE player_projections ADD COLUMN IF NOT EXISTS stat_confidence JSONB;
+ALTER TABLE player_projections ADD COLUMN IF NOT EXISTS stat_std JSONB;
+ALTER TABLE player_projections ADD COLUMN IF NOT EXISTS stat_quantiles JSONB;
+ALTER TABLE player_projections ADD COLUMN IF NOT EXISTS written_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT clock_timestamp();
+
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_players_team_id ON players(team_id);
 CREATE INDEX IF NOT EXISTS idx_games_game_date ON games(game_date);
@@ -111,6 +149,7 @@ CREATE INDEX IF NOT EXISTS idx_player_stats_game_id ON player_stats(game_id);
 CREATE INDEX IF NOT EXISTS idx_player_projections_player_id ON player_projections(player_id);
 CREATE INDEX IF NOT EXISTS idx_player_projections_game_id ON player_projections(game_id);
 CREATE INDEX IF NOT EXISTS idx_player_projections_created_at ON player_projections(created_at);
+CREATE INDEX IF NOT EXISTS idx_player_projections_written_at ON player_projections(written_at);
 
 -- Create or replace function for updating updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -142,6 +181,22 @@ CREATE TRIGGER update_player_stats_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Stamp projection writes with the database clock, whatever the writer sends,
+-- so readers can catch up on writes from every process by written_at
+CREATE OR REPLACE FUNCTION stamp_written_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.written_at = clock_timestamp();
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS stamp_player_projections_written_at ON player_projections;
+CREATE TRIGGER stamp_player_projections_written_at
+    BEFORE INSERT OR UPDATE ON player_projections
+    FOR EACH ROW
+    EXECUTE FUNCTION stamp_written_at_column();
+
 -- Create a view for today's games
 CREATE OR REPLACE VIEW today_games AS
 SELECT * FROM games
@@ -4,14 +4,19 @@ NBA API Client for fetching data
 import time
 from typing import Dict, List, Any, Optional
 import logging
-from nba_api.stats.endpoints import (
-    commonplayerinfo,
-    playergamelog,
-    leaguegamefinder,
-    boxscoreadvancedv2,
-    scoreboardv2,
-)
-from nba_api.stats.static import players, teams
+
+from app.utils.lazy import lazy_import
+from app.utils.metrics import NBA_API_LATENCY, NBA_API_RATE_LIMIT_WAIT, observe
+
+# nba_api (and the pandas it pulls in) loads on the first NBA API call rather
+# than at API start-up; read-only requests never make one
+commonplayerinfo = lazy_import("nba_api.stats.endpoints.commonplayerinfo")
+playergamelog = lazy_import("nba_api.stats.endpoints.playergamelog")
+leaguegamefinder = lazy_import("nba_api.stats.endpoints.leaguegamefinder")
+boxscoreadvancedv2 = lazy_import("nba_api.stats.endpoints.boxscoreadvancedv2")
+scoreboardv2 = lazy_import("nba_api.stats.endpoints.scoreboardv2")
+players = lazy_import("nba_api.stats.static.players")
+teams = lazy_import("nba_api.stats.static.teams")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -44,6 +49,7 @@ class NBADataClient:
             sleep_time = self.rate_limit_delay - elapsed
             logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
             time.sleep(sleep_time)
+            NBA_API_RATE_LIMIT_WAIT.inc(sleep_time)
         
         self.last_request_time = time.time()
     
@@ -78,7 +84,8 @@ class NBADataClient:
             Dictionary with player information
         """
         self._apply_rate_limit()
-        player_info = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
+        with observe(NBA_API_LATENCY, 'commonplayerinfo'):
+            player_info = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
         return player_info.get_normalized_dict()
     
     def get_player_game_logs(self, player_id: str, season: str) -> Dict[str, Any]:
@@ -93,10 +100,11 @@ class NBADataClient:
             Dictionary with player game logs
         """
         self._apply_rate_limit()
-        game_logs = playergamelog.PlayerGameLog(
-            player_id=player_id, 
-            season=season
-        )
+        with observe(NBA_API_LATENCY, 'playergamelog'):
+            game_logs = playergamelog.PlayerGameLog(
+                player_id=player_id, 
+                season=season
+            )
         return game_logs.get_normalized_dict()
     
     def get_scoreboard(self, game_date: str) -> Dict[str, Any]:
@@ -110,7 +118,8 @@ class NBADataClient:
             Dictionary with scoreboard data
         """
         self._apply_rate_limit()
-        scores = scoreboardv2.ScoreboardV2(game_date=game_date)
+        with observe(NBA_API_LATENCY, 'scoreboardv2'):
+            scores = scoreboardv2.ScoreboardV2(game_date=game_date)
         return scores.get_normalized_dict()
     
     def get_games(
@@ -132,17 +141,18 @@ class NBADataClient:
         """
         self._apply_rate_limit()
         
-        if team_id:
-            games = leaguegamefinder.LeagueGameFinder(
-                season_nullable=season,
-                season_type_nullable=season_type,
-                team_id_nullable=team_id
-            )
-        else:
-            games = leaguegamefinder.LeagueGameFinder(
-                season_nullable=season,
-                season_type_nullable=season_type
-            )
+        with observe(NBA_API_LATENCY, 'leaguegamefinder'):
+            if team_id:
+                games = leaguegamefinder.LeagueGameFinder(
+                    season_nullable=season,
+                    season_type_nullable=season_type,
+                    team_id_nullable=team_id
+                )
+            else:
+                games = leaguegamefinder.LeagueGameFinder(
+                    season_nullable=season,
+                    season_type_nullable=season_type
+                )
             
         return games.get_normalized_dict()
     
@@ -157,5 +167,6 @@ class NBADataClient:
             Dictionary with advanced box score data
         """
         self._apply_rate_limit()
-        box_score = boxscoreadvancedv2.BoxScoreAdvancedV2(game_id=game_id)
+        with observe(NBA_API_LATENCY, 'boxscoreadvancedv2'):
+            box_score = boxscoreadvancedv2.BoxScoreAdvancedV2(game_id=game_id)
         return box_score.get_normalized_dict() 
\ No newline at end of file
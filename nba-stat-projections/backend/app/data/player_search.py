@@ -0,0 +1,272 @@
+"""
+In-memory player name search
+"""
+import asyncio
+import heapq
+import logging
+import os
+import re
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.models.schemas import Player
+from app.utils.http_cache import ROSTER_VERSION_KEY
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# How long a process trusts its index before re-checking the roster version
+PLAYER_INDEX_CHECK_SECONDS = float(os.getenv("PLAYER_INDEX_CHECK_SECONDS", 30))
+
+# Smallest share of a query's trigrams a name must contain to match fuzzily
+TRIGRAM_MIN_SIMILARITY = 0.5
+
+# Scores by match kind; fuzzy matches score their similarity scaled below prefix matches
+SCORE_EXACT = 1.0
+SCORE_NAME_PREFIX = 0.9
+SCORE_TOKEN_PREFIX = 0.8
+SCORE_FUZZY = 0.7
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Fold a name for matching: strip accents, lowercase, drop punctuation
+
+    Args:
+        name: Name or query
+
+    Returns:
+        str: Space-separated lowercase ASCII tokens (e.g. "Luka Dončić" -> "luka doncic")
+    """
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALPHANUMERIC.sub(" ", ascii_name.lower()).strip()
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """
+    Trigrams of each token, padded so that word starts and ends count
+
+    Args:
+        normalized: Output of normalize_name
+
+    Returns:
+        Set[str]: Trigrams (e.g. "jo" -> {"  j", " jo", "jo "})
+    """
+    grams = set()
+    for token in normalized.split():
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class PlayerSearchIndex:
+    """
+    Prefix and trigram index over Player.full_name
+
+    Every token of every name is kept in one sorted list, so the players
+    with a token starting with a prefix are a contiguous run found by
+    bisection. Queries that match no name by prefix fall back to trigram
+    similarity, which tolerates typos ("antetokumpo" finds "Giannis
+    Antetokounmpo"). Accents are folded, so "jokic" finds "Nikola Jokić".
+
+    The index rebuilds from the database when the roster version moves,
+    checking at most every PLAYER_INDEX_CHECK_SECONDS, and players written
+    through ProjectionService in this process are applied to it immediately.
+    """
+
+    def __init__(self, check_seconds: float = PLAYER_INDEX_CHECK_SECONDS):
+        """
+        Initialize an empty index
+
+        Args:
+            check_seconds: Seconds between roster version checks
+        """
+        self.check_seconds = check_seconds
+        self.version = -1
+        self._checked_at = float("-inf")
+        self._refreshing = asyncio.Lock()
+        self._players: Dict[str, Player] = {}
+        self._names: Dict[str, str] = {}
+        self._tokens: List[Tuple[str, str]] = []
+        self._trigrams: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def build(self, players: Iterable[Player], version: int = -1) -> None:
+        """
+        Replace the index contents
+
+        Args:
+            players: Every player to index
+            version: Roster version the players were read at
+        """
+        index = PlayerSearchIndex(self.check_seconds)
+        for player in players:
+            index._add(player)
+        index._tokens.sort()
+
+        self._players, self._names = index._players, index._names
+        self._tokens, self._trigrams = index._tokens, index._trigrams
+        self.version = version
+
+    def upsert(self, player: Player, version: Optional[int] = None) -> None:
+        """
+        Add or replace one player
+
+        Args:
+            player: Player as written
+            version: Roster version after the write; the index takes it only
+                if it was current just before, so writes from elsewhere still
+                trigger a rebuild
+        """
+        self.remove(player.id)
+        self._add(player, sort=True)
+        if version is not None and version == self.version + 1:
+            self.version = version
+
+    def remove(self, player_id: str) -> None:
+        """Drop a player from the index"""
+        normalized = self._names.pop(player_id, None)
+        if normalized is None:
+            return
+        del self._players[player_id]
+        for token in set(normalized.split()):
+            position = bisect_left(self._tokens, (token, player_id))
+            if position < len(self._tokens) and self._tokens[position] == (token, player_id):
+                del self._tokens[position]
+        for gram in trigrams(normalized):
+            ids = self._trigrams.get(gram)
+            if ids is not None:
+                ids.discard(player_id)
+                if not ids:
+                    del self._trigrams[gram]
+
+    def _add(self, player: Player, sort: bool = False) -> None:
+        normalized = normalize_name(player.full_name)
+        self._players[player.id] = player
+        self._names[player.id] = normalized
+        for token in set(normalized.split()):
+            if sort:
+                insort(self._tokens, (token, player.id))
+            else:
+                self._tokens.append((token, player.id))
+        for gram in trigrams(normalized):
+            self._trigrams.setdefault(gram, set()).add(player.id)
+
+    def _prefixed(self, prefix: str) -> Set[str]:
+        """IDs of players with a name token starting with prefix"""
+        start = bisect_left(self._tokens, (prefix,))
+        end = bisect_left(self._tokens, (prefix + "\uffff",))
+        return {player_id for _, player_id in self._tokens[start:end]}
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        active_only: bool = False,
+        team_id: Optional[str] = None
+    ) -> List[Tuple[Player, float]]:
+        """
+        Rank players by how well their name matches a query
+
+        Exact names rank first, then names starting with the query, then
+        names where every query word starts some name word ("leb jam").
+        Only when nothing matches by prefix are fuzzy trigram matches
+        returned. Ties go to active players, then shorter and alphabetically
+        earlier names.
+
+        Args:
+            query: Free-text name query
+            limit: Maximum number of matches
+            active_only: Only match active players
+            team_id: Only match players on this team
+
+        Returns:
+            List[Tuple[Player, float]]: Players and their scores (0-1), best first
+        """
+        normalized = normalize_name(query)
+        tokens = normalized.split()
+        if not tokens:
+            return []
+
+        def wanted(player_id: str) -> bool:
+            player = self._players[player_id]
+            return (not active_only or player.is_active) and (not team_id or player.team_id == team_id)
+
+        scores: Dict[str, float] = {}
+        candidates = self._prefixed(tokens[0])
+        for token in tokens[1:]:
+            if not candidates:
+                break
+            candidates &= self._prefixed(token)
+        for player_id in filter(wanted, candidates):
+            name = self._names[player_id]
+            if name == normalized:
+                scores[player_id] = SCORE_EXACT
+            elif name.startswith(normalized):
+                scores[player_id] = SCORE_NAME_PREFIX
+            else:
+                scores[player_id] = SCORE_TOKEN_PREFIX
+
+        if not scores:
+            query_grams = trigrams(normalized)
+            shared: Counter = Counter()
+            for gram in query_grams:
+                shared.update(self._trigrams.get(gram, ()))
+            # Similarity is the share of the query's trigrams found in the name,
+            # so a partial name ("wemby") still matches a long one
+            min_shared = TRIGRAM_MIN_SIMILARITY * len(query_grams)
+            for player_id, count in shared.items():
+                if count >= min_shared and wanted(player_id):
+                    scores[player_id] = round(SCORE_FUZZY * count / len(query_grams), 4)
+
+        matches = [(self._players[player_id], score) for player_id, score in scores.items()]
+        return heapq.nsmallest(
+            limit, matches, key=lambda m: (-m[1], not m[0].is_active, len(self._names[m[0].id]), self._names[m[0].id])
+        )
+
+    async def refresh(self, repository: Any) -> None:
+        """
+        Rebuild from the database if the roster changed since the last build
+
+        Checks the roster version at most every check_seconds. Concurrent
+        callers share one rebuild; once the index has been built, they keep
+        searching the current contents instead of waiting for it.
+
+        Args:
+            repository: Repository to read the roster version and players from
+        """
+        if time.monotonic() - self._checked_at < self.check_seconds:
+            return
+        if self._refreshing.locked() and self.version >= 0:
+            return
+
+        async with self._refreshing:
+            if time.monotonic() - self._checked_at < self.check_seconds:
+                return
+            version = await repository.get_data_version(ROSTER_VERSION_KEY)
+            if version != self.version:
+                players = [player async for player in repository.iter_players(active_only=False)]
+                self.build(players, version)
+                logger.info(f"Built player search index at roster version {version}: {len(players)} players")
+            self._checked_at = time.monotonic()
+
+    async def warm(self) -> None:
+        """Build the index at startup, logging rather than raising if the database is unavailable"""
+        from app.data.repository import NBARepository
+
+        try:
+            await self.refresh(NBARepository())
+        except Exception as e:
+            logger.warning(f"Could not build player search index at startup: {str(e)}")
+
+
+# Process-wide index
+player_index = PlayerSearchIndex()
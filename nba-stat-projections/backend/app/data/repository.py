@@ -1,21 +1,132 @@
 """
 Repository for database operations using Supabase
 """
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 from datetime import date, datetime
 
 from app.utils.database import get_supabase_client
+from app.utils.http_cache import DATA_VERSION_KEY, ROSTER_VERSION_KEY, record_data_version
+from app.utils.metrics import DB_QUERY_LATENCY, observe
+from app.utils.tracing import span
 from app.models.schemas import Player, Team, Game, PlayerStats, PlayerProjection
 
+# Rows fetched per request when paging through large tables
+PAGE_SIZE = 500
+
+# NBA API team IDs are all digits; anything else could alter a PostgREST or() filter
+TEAM_ID_PATTERN = re.compile(r"[0-9]+")
+
+
+def select_columns(fields: Optional[List[str]]) -> str:
+    """
+    Build a select clause, always including the ID used as the page cursor
+    
+    Args:
+        fields: Columns to select, or None for all columns
+        
+    Returns:
+        str: Select clause
+    """
+    if not fields:
+        return '*'
+    return ','.join(['id'] + [field for field in fields if field != 'id'])
+
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse a timestamp as PostgREST returns it
+    
+    Args:
+        value: ISO 8601 timestamp, possibly ending in Z
+        
+    Returns:
+        datetime: Parsed timestamp
+    """
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 
 class NBARepository:
     """
     Repository for NBA data operations in Supabase
     """
     
-    def __init__(self):
-        """Initialize with Supabase client"""
-        self.supabase = get_supabase_client()
+    def __init__(self, client: Optional[Any] = None):
+        """
+        Initialize with Supabase client
+        
+        Args:
+            client: Optional client to use instead of the shared Supabase client
+        """
+        self.supabase = client if client is not None else get_supabase_client()
+    
+    def _execute(self, query: Any, table: str, operation: str) -> Any:
+        """
+        Execute a query, recording its latency per table and operation
+        
+        Args:
+            query: Supabase query builder
+            table: Table (or RPC function) the query targets
+            operation: select, insert, update, upsert or rpc
+            
+        Returns:
+            Any: Query response
+        """
+        with observe(DB_QUERY_LATENCY, table, operation), span(f"db-{table}"):
+            return query.execute()
+    
+    # Data version operations
+    
+    async def get_data_version(self, key: str = DATA_VERSION_KEY) -> int:
+        """
+        Get the current data version counter
+        
+        Args:
+            key: Counter key
+            
+        Returns:
+            int: Current version (0 if never bumped)
+        """
+        response = self._execute(self.supabase.table('data_versions').select('version').eq('key', key), 'data_versions', 'select')
+        
+        if not response.data:
+            return 0
+            
+        return int(response.data[0]['version'])
+    
+    async def bump_data_version(self, key: str = DATA_VERSION_KEY) -> int:
+        """
+        Increment the data version counter after data changes
+        
+        Args:
+            key: Counter key
+            
+        Returns:
+            int: New version
+        """
+        response = self._execute(self.supabase.rpc('bump_data_version', {'version_key': key}), 'bump_data_version', 'rpc')
+        version = int(response.data)
+        if key == DATA_VERSION_KEY:
+            record_data_version(version)
+        return version
+    
+    async def bump_data_versions(self, *keys: str) -> Dict[str, int]:
+        """
+        Increment several data version counters in one call
+        
+        Args:
+            keys: Counter keys
+            
+        Returns:
+            Dict[str, int]: New version per key
+        """
+        response = self._execute(
+            self.supabase.rpc('bump_data_versions', {'version_keys': list(keys)}), 'bump_data_versions', 'rpc'
+        )
+        versions = {row['key']: int(row['version']) for row in response.data}
+        if DATA_VERSION_KEY in versions:
+            record_data_version(versions[DATA_VERSION_KEY])
+        return versions
     
     # Team operations
     
@@ -26,7 +137,7 @@ class NBARepository:
         Returns:
             List[Team]: List of teams
         """
-        response = self.supabase.table('teams').select('*').execute()
+        response = self._execute(self.supabase.table('teams').select('*'), 'teams', 'select')
         teams_data = response.data
         return [Team(**team) for team in teams_data]
     
@@ -40,7 +151,7 @@ class NBARepository:
         Returns:
             Optional[Team]: Team if found, None otherwise
         """
-        response = self.supabase.table('teams').select('*').eq('id', team_id).execute()
+        response = self._execute(self.supabase.table('teams').select('*').eq('id', team_id), 'teams', 'select')
         teams_data = response.data
         
         if not teams_data:
@@ -48,6 +159,22 @@ class NBARepository:
             
         return Team(**teams_data[0])
     
+    async def get_teams_by_ids(self, team_ids: List[str]) -> Dict[str, Team]:
+        """
+        Get several teams in one query
+        
+        Args:
+            team_ids: Team IDs
+            
+        Returns:
+            Dict[str, Team]: Teams found, keyed by ID
+        """
+        if not team_ids:
+            return {}
+            
+        response = self._execute(self.supabase.table('teams').select('*').in_('id', list(set(team_ids))), 'teams', 'select')
+        return {row['id']: Team(**row) for row in response.data}
+    
     async def create_team(self, team: Team) -> Team:
         """
         Create a new team
@@ -58,7 +185,8 @@ class NBARepository:
         Returns:
             Team: Created team
         """
-        response = self.supabase.table('teams').insert(team.dict()).execute()
+        response = self._execute(self.supabase.table('teams').insert(team.dict()), 'teams', 'insert')
+        await self.bump_data_version()
         return Team(**response.data[0])
     
     async def update_team(self, team: Team) -> Team:
@@ -71,7 +199,8 @@ class NBARepository:
         Returns:
             Team: Updated team
         """
-        response = self.supabase.table('teams').update(team.dict()).eq('id', team.id).execute()
+        response = self._execute(self.supabase.table('teams').update(team.dict()).eq('id', team.id), 'teams', 'update')
+        await self.bump_data_version()
         return Team(**response.data[0])
     
     # Player operations
@@ -91,10 +220,107 @@ class NBARepository:
         if active_only:
             query = query.eq('is_active', True)
             
-        response = query.execute()
+        response = self._execute(query, 'players', 'select')
         players_data = response.data
         return [Player(**player) for player in players_data]
     
+    async def get_players_page(
+        self,
+        active_only: bool = True,
+        team_id: Optional[str] = None,
+        position: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = PAGE_SIZE,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get one keyset page of players, filtered in the database
+        
+        Args:
+            active_only: Whether to return only active players
+            team_id: Optional team ID filter
+            position: Optional position filter
+            after: Return players with IDs after this cursor
+            limit: Maximum number of rows
+            fields: Optional columns to select (ID is always included)
+            
+        Returns:
+            List[Dict[str, Any]]: Player rows ordered by ID
+        """
+        query = self.supabase.table('players').select(select_columns(fields))
+        
+        if active_only:
+            query = query.eq('is_active', True)
+            
+        if team_id:
+            query = query.eq('team_id', team_id)
+            
+        if position:
+            query = query.eq('position', position)
+            
+        if after:
+            query = query.gt('id', after)
+            
+        response = self._execute(query.order('id').limit(limit), 'players', 'select')
+        return response.data
+    
+    async def iter_players(
+        self,
+        active_only: bool = True,
+        team_id: Optional[str] = None,
+        position: Optional[str] = None,
+        page_size: int = PAGE_SIZE
+    ) -> AsyncIterator[Player]:
+        """
+        Yield players page by page, keeping only one page in memory
+        
+        Args:
+            active_only: Whether to return only active players
+            team_id: Optional team ID filter
+            position: Optional position filter
+            page_size: Number of rows fetched per request
+            
+        Yields:
+            Player: Players ordered by ID
+        """
+        after = None
+        while True:
+            rows = await self.get_players_page(
+                active_only=active_only,
+                team_id=team_id,
+                position=position,
+                after=after,
+                limit=page_size
+            )
+            for player in rows:
+                yield Player(**player)
+                
+            if len(rows) < page_size:
+                return
+            after = rows[-1]['id']
+    
+    async def get_players_by_team_ids(self, team_ids: List[str], active_only: bool = True) -> List[Player]:
+        """
+        Get the rosters of several teams in one query
+        
+        Args:
+            team_ids: Team IDs
+            active_only: Whether to return only active players
+            
+        Returns:
+            List[Player]: Players on the teams
+        """
+        if not team_ids:
+            return []
+            
+        query = self.supabase.table('players').select('*').in_('team_id', list(set(team_ids)))
+        
+        if active_only:
+            query = query.eq('is_active', True)
+            
+        response = self._execute(query.order('id'), 'players', 'select')
+        return [Player(**player) for player in response.data]
+    
     async def get_player(self, player_id: str) -> Optional[Player]:
         """
         Get a player by ID
@@ -105,7 +331,7 @@ class NBARepository:
         Returns:
             Optional[Player]: Player if found, None otherwise
         """
-        response = self.supabase.table('players').select('*').eq('id', player_id).execute()
+        response = self._execute(self.supabase.table('players').select('*').eq('id', player_id), 'players', 'select')
         players_data = response.data
         
         if not players_data:
@@ -113,31 +339,53 @@ class NBARepository:
             
         return Player(**players_data[0])
     
-    async def create_player(self, player: Player) -> Player:
+    async def get_players_by_ids(self, player_ids: List[str]) -> Dict[str, Player]:
+        """
+        Get several players in one query
+        
+        Args:
+            player_ids: Player IDs
+            
+        Returns:
+            Dict[str, Player]: Players found, keyed by ID
+        """
+        if not player_ids:
+            return {}
+            
+        response = self._execute(self.supabase.table('players').select('*').in_('id', list(set(player_ids))), 'players', 'select')
+        return {row['id']: Player(**row) for row in response.data}
+    
+    async def create_player(self, player: Player) -> Tuple[Player, int]:
         """
         Create a new player
         
+        Bumps the data and roster versions together in one call.
+        
         Args:
             player: Player to create
             
         Returns:
-            Player: Created player
+            Tuple[Player, int]: Created player and the roster version after the write
         """
-        response = self.supabase.table('players').insert(player.dict()).execute()
-        return Player(**response.data[0])
+        response = self._execute(self.supabase.table('players').insert(player.dict()), 'players', 'insert')
+        versions = await self.bump_data_versions(DATA_VERSION_KEY, ROSTER_VERSION_KEY)
+        return Player(**response.data[0]), versions[ROSTER_VERSION_KEY]
     
-    async def update_player(self, player: Player) -> Player:
+    async def update_player(self, player: Player) -> Tuple[Player, int]:
         """
         Update a player
         
+        Bumps the data and roster versions together in one call.
+        
         Args:
             player: Player to update
             
         Returns:
-            Player: Updated player
+            Tuple[Player, int]: Updated player and the roster version after the write
         """
-        response = self.supabase.table('players').update(player.dict()).eq('id', player.id).execute()
-        return Player(**response.data[0])
+        response = self._execute(self.supabase.table('players').update(player.dict()).eq('id', player.id), 'players', 'update')
+        versions = await self.bump_data_versions(DATA_VERSION_KEY, ROSTER_VERSION_KEY)
+        return Player(**response.data[0]), versions[ROSTER_VERSION_KEY]
     
     # Game operations
     
@@ -158,10 +406,56 @@ class NBARepository:
             date_str = game_date.isoformat()
             query = query.gte('game_date', f"{date_str}T00:00:00Z").lt('game_date', f"{date_str}T23:59:59Z")
             
-        response = query.execute()
+        response = self._execute(query, 'games', 'select')
         games_data = response.data
         return [Game(**game) for game in games_data]
     
+    async def get_games_page(
+        self,
+        game_date: Optional[date] = None,
+        season: Optional[str] = None,
+        team_id: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = PAGE_SIZE,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get one keyset page of games, filtered in the database
+        
+        Args:
+            game_date: Optional date filter
+            season: Optional season ID filter
+            team_id: Optional filter for games involving this team
+            after: Return games with IDs after this cursor
+            limit: Maximum number of rows
+            fields: Optional columns to select (ID is always included)
+            
+        Returns:
+            List[Dict[str, Any]]: Game rows ordered by ID
+            
+        Raises:
+            ValueError: If team_id is not a numeric team ID
+        """
+        query = self.supabase.table('games').select(select_columns(fields))
+        
+        if game_date:
+            date_str = game_date.isoformat()
+            query = query.gte('game_date', f"{date_str}T00:00:00Z").lt('game_date', f"{date_str}T23:59:59Z")
+            
+        if season:
+            query = query.eq('season_id', season)
+            
+        if team_id:
+            if not TEAM_ID_PATTERN.fullmatch(team_id):
+                raise ValueError(f"Invalid team ID {team_id!r}")
+            query = query.or_(f"home_team_id.eq.{team_id},visitor_team_id.eq.{team_id}")
+            
+        if after:
+            query = query.gt('id', after)
+            
+        response = self._execute(query.order('id').limit(limit), 'games', 'select')
+        return response.data
+    
     async def get_game(self, game_id: str) -> Optional[Game]:
         """
         Get a game by ID
@@ -172,7 +466,7 @@ class NBARepository:
         Returns:
             Optional[Game]: Game if found, None otherwise
         """
-        response = self.supabase.table('games').select('*').eq('id', game_id).execute()
+        response = self._execute(self.supabase.table('games').select('*').eq('id', game_id), 'games', 'select')
         games_data = response.data
         
         if not games_data:
@@ -180,6 +474,22 @@ class NBARepository:
             
         return Game(**games_data[0])
     
+    async def get_games_by_ids(self, game_ids: List[str]) -> Dict[str, Game]:
+        """
+        Get several games in one query
+        
+        Args:
+            game_ids: Game IDs
+            
+        Returns:
+            Dict[str, Game]: Games found, keyed by ID
+        """
+        if not game_ids:
+            return {}
+            
+        response = self._execute(self.supabase.table('games').select('*').in_('id', list(set(game_ids))), 'games', 'select')
+        return {row['id']: Game(**row) for row in response.data}
+    
     async def create_game(self, game: Game) -> Game:
         """
         Create a new game
@@ -190,7 +500,8 @@ class NBARepository:
         Returns:
             Game: Created game
         """
-        response = self.supabase.table('games').insert(game.dict()).execute()
+        response = self._execute(self.supabase.table('games').insert(game.dict()), 'games', 'insert')
+        await self.bump_data_version()
         return Game(**response.data[0])
     
     async def update_game(self, game: Game) -> Game:
@@ -203,7 +514,8 @@ class NBARepository:
         Returns:
             Game: Updated game
         """
-        response = self.supabase.table('games').update(game.dict()).eq('id', game.id).execute()
+        response = self._execute(self.supabase.table('games').update(game.dict()).eq('id', game.id), 'games', 'update')
+        await self.bump_data_version()
         return Game(**response.data[0])
     
     # Player stats operations
@@ -224,10 +536,45 @@ class NBARepository:
         if game_id:
             query = query.eq('game_id', game_id)
             
-        response = query.execute()
+        response = self._execute(query, 'player_stats', 'select')
         stats_data = response.data
         return [PlayerStats(**stats) for stats in stats_data]
     
+    async def get_player_stats_batch(
+        self,
+        player_ids: List[str],
+        page_size: int = PAGE_SIZE * 2
+    ) -> Dict[str, List[PlayerStats]]:
+        """
+        Get the stat histories of several players, paging through the rows
+        
+        Args:
+            player_ids: Player IDs
+            page_size: Number of rows fetched per request
+            
+        Returns:
+            Dict[str, List[PlayerStats]]: Stats keyed by player ID (every requested player is present)
+        """
+        histories: Dict[str, List[PlayerStats]] = {player_id: [] for player_id in player_ids}
+        if not player_ids:
+            return histories
+            
+        start = 0
+        while True:
+            query = (
+                self.supabase.table('player_stats').select('*')
+                .in_('player_id', list(histories))
+                .order('player_id').order('game_id')
+                .range(start, start + page_size - 1)
+            )
+            response = self._execute(query, 'player_stats', 'select')
+            for stats in response.data:
+                histories[stats['player_id']].append(PlayerStats(**stats))
+                
+            if len(response.data) < page_size:
+                return histories
+            start += page_size
+    
     async def create_player_stats(self, stats: PlayerStats) -> PlayerStats:
         """
         Create player stats
@@ -238,7 +585,7 @@ class NBARepository:
         Returns:
             PlayerStats: Created player stats
         """
-        response = self.supabase.table('player_stats').insert(stats.dict()).execute()
+        response = self._execute(self.supabase.table('player_stats').insert(stats.dict()), 'player_stats', 'insert')
         return PlayerStats(**response.data[0])
     
     # Player projection operations
@@ -247,7 +594,8 @@ class NBARepository:
         self, 
         player_id: Optional[str] = None,
         game_id: Optional[str] = None,
-        game_date: Optional[date] = None
+        game_date: Optional[date] = None,
+        model_versions: Optional[List[str]] = None
     ) -> List[PlayerProjection]:
         """
         Get player projections
@@ -256,6 +604,7 @@ class NBARepository:
             player_id: Optional player ID filter
             game_id: Optional game ID filter
             game_date: Optional game date filter
+            model_versions: Optional model version filter
             
         Returns:
             List[PlayerProjection]: List of player projections
@@ -277,7 +626,10 @@ class NBARepository:
         if game_id:
             query = query.eq('game_id', game_id)
             
-        response = query.execute()
+        if model_versions:
+            query = query.in_('model_version', model_versions)
+            
+        response = self._execute(query, 'player_projections', 'select')
         
         if game_date:
             # If we joined with games, we need to extract just the player_projections part
@@ -285,7 +637,93 @@ class NBARepository:
         else:
             projections_data = response.data
             
-        return [PlayerProjection(**projection) for projection in projections_data]
+        with span("parse"):
+            return [PlayerProjection(**projection) for projection in projections_data]
+    
+    async def get_projections_batch(
+        self,
+        player_ids: Optional[List[str]] = None,
+        game_ids: Optional[List[str]] = None,
+        model_versions: Optional[List[str]] = None
+    ) -> List[PlayerProjection]:
+        """
+        Get projections for many players and/or games in one query
+        
+        When both lists are given, only projections matching a listed player
+        in a listed game are returned.
+        
+        Args:
+            player_ids: Optional player IDs
+            game_ids: Optional game IDs
+            model_versions: Optional model version filter
+            
+        Returns:
+            List[PlayerProjection]: Matching projections
+        """
+        query = self.supabase.table('player_projections').select('*')
+        
+        if player_ids:
+            query = query.in_('player_id', list(set(player_ids)))
+            
+        if game_ids:
+            query = query.in_('game_id', list(set(game_ids)))
+            
+        if model_versions:
+            query = query.in_('model_version', model_versions)
+            
+        response = self._execute(query, 'player_projections', 'select')
+        with span("parse"):
+            return [PlayerProjection(**projection) for projection in response.data]
+    
+    async def get_latest_projection_write(self) -> Optional[datetime]:
+        """
+        Get the database time of the most recent projection write
+        
+        written_at is stamped by the database on every insert and update, so
+        it orders writes from every process regardless of their clocks.
+        
+        Returns:
+            Optional[datetime]: written_at of the newest write, or None if there are no projections
+        """
+        query = (
+            self.supabase.table('player_projections').select('written_at')
+            .order('written_at', desc=True).limit(1)
+        )
+        response = self._execute(query, 'player_projections', 'select')
+        return parse_timestamp(response.data[0]['written_at']) if response.data else None
+    
+    async def get_projection_writes_since(
+        self,
+        written_since: Optional[datetime],
+        page_size: int = PAGE_SIZE * 2
+    ) -> Tuple[List[PlayerProjection], Optional[datetime]]:
+        """
+        Get projections the database wrote at or after a time, paging through the rows
+        
+        Args:
+            written_since: Earliest written_at to return, or None for every projection
+            page_size: Number of rows fetched per request
+            
+        Returns:
+            Tuple[List[PlayerProjection], Optional[datetime]]: Projections in write
+            order, and the newest written_at among them (None if there are none)
+        """
+        projections: List[PlayerProjection] = []
+        latest = None
+        start = 0
+        while True:
+            query = self.supabase.table('player_projections').select('*')
+            if written_since is not None:
+                query = query.gte('written_at', written_since.isoformat(timespec='microseconds'))
+            query = query.order('written_at').order('id').range(start, start + page_size - 1)
+            response = self._execute(query, 'player_projections', 'select')
+            projections.extend(PlayerProjection(**projection) for projection in response.data)
+            if response.data:
+                latest = parse_timestamp(response.data[-1]['written_at'])
+            
+            if len(response.data) < page_size:
+                return projections, latest
+            start += page_size
     
     async def create_player_projection(self, projection: PlayerProjection) -> PlayerProjection:
         """
@@ -297,5 +735,50 @@ class NBARepository:
         Returns:
             PlayerProjection: Created player projection
         """
-        response = self.supabase.table('player_projections').insert(projection.dict()).execute()
-        return PlayerProjection(**response.data[0]) 
\ No newline at end of file
+        response = self._execute(
+            self.supabase.table('player_projections').insert(projection.model_dump(mode='json')), 'player_projections', 'insert'
+        )
+        await self.bump_data_version()
+        return PlayerProjection(**response.data[0])
+    
+    async def create_player_projections(self, projections: List[PlayerProjection]) -> List[PlayerProjection]:
+        """
+        Create several player projections in one request
+        
+        Args:
+            projections: Player projections to create
+            
+        Returns:
+            List[PlayerProjection]: Created player projections
+        """
+        if not projections:
+            return []
+            
+        rows = [projection.model_dump(mode='json') for projection in projections]
+        response = self._execute(self.supabase.table('player_projections').insert(rows), 'player_projections', 'insert')
+        await self.bump_data_version()
+        return [PlayerProjection(**projection) for projection in response.data]
+    
+    async def upsert_player_projections(self, projections: List[PlayerProjection]) -> List[PlayerProjection]:
+        """
+        Insert or replace player projections in one request
+        
+        Existing rows for the same player, game and model version are
+        overwritten, so a slate can be regenerated in place.
+        
+        Args:
+            projections: Player projections to write
+            
+        Returns:
+            List[PlayerProjection]: Written player projections
+        """
+        if not projections:
+            return []
+            
+        rows = [projection.model_dump(mode='json') for projection in projections]
+        query = self.supabase.table('player_projections').upsert(
+            rows, on_conflict='player_id,game_id,model_version'
+        )
+        response = self._execute(query, 'player_projections', 'upsert')
+        await self.bump_data_version()
+        return [PlayerProjection(**projection) for projection in response.data]
\ No newline at end of file
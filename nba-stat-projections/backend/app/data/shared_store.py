@@ -0,0 +1,176 @@
+"""
+Shared-memory store of the day's games, teams, players and projections
+
+The store is a projection snapshot (see app.data.snapshot) that every
+worker in a pod memory-maps read-only. Its pages live in the page cache
+once, however many workers attach, and each worker keeps only the
+snapshot's header.
+
+A snapshot the ingestion pipeline published to SNAPSHOT_DIR is used as is
+when it is current. Otherwise the first worker to see a new data version
+takes a file lock, reads the day's rows from the database once and writes
+the store file on tmpfs (/dev/shm); the others keep reading the database
+until it lands.
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.data.snapshot import SNAPSHOT_DIR, ProjectionSnapshot, build_snapshot, snapshot_path
+from app.utils.http_cache import get_data_version
+from app.utils.metrics import record_cache
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - fcntl is POSIX-only
+    fcntl = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Serve today's projections from the shared store (off by default)
+SHARED_STORE_ENABLED = os.getenv("SHARED_STORE_ENABLED", "").lower() in ("1", "true", "yes")
+
+# Where the store lives; tmpfs keeps it in memory shared by every worker in the pod
+SHARED_STORE_DIR = os.getenv(
+    "SHARED_STORE_DIR",
+    "/dev/shm/nba-projections" if os.path.isdir("/dev/shm") else os.path.join(tempfile.gettempdir(), "nba-projections")
+)
+
+STORE_FILE = "today.snap"
+
+
+class SharedStore:
+    """
+    Finds, builds and attaches the shared store for one process
+
+    Call snapshot() on each read. While the attached snapshot matches the
+    current data version this costs nothing; when the version moves, one
+    worker rebuilds the store and the rest keep reading the database until
+    it lands.
+    """
+
+    def __init__(self, directory: str = SHARED_STORE_DIR, snapshot_dir: str = SNAPSHOT_DIR):
+        """
+        Initialize the store
+
+        Args:
+            directory: Directory holding the store file and its lock
+            snapshot_dir: Directory of published snapshots, or "" for none
+        """
+        self.path = os.path.join(directory, STORE_FILE)
+        self.snapshot_dir = snapshot_dir
+        self._current: Optional[ProjectionSnapshot] = None
+        self._attached: Dict[str, Tuple[Tuple[int, int], ProjectionSnapshot]] = {}
+        self._building = asyncio.Lock()
+
+    async def snapshot(self, repository: Any, day: date) -> Optional[ProjectionSnapshot]:
+        """
+        The snapshot for a day if it is current, building it if no worker is
+
+        If the data version cannot be read, the latest snapshot for the day
+        is served regardless of its version.
+
+        Args:
+            repository: Repository to read the data version and rows from
+            day: Date being served
+
+        Returns:
+            Optional[ProjectionSnapshot]: Current snapshot, or None if the caller
+            should read the database
+        """
+        try:
+            version: Optional[int] = await get_data_version(repository)
+        except Exception as e:
+            logger.warning(f"Could not read data version, serving the latest snapshot: {str(e)}")
+            version = None
+
+        if not _is_current(self._current, day, version):
+            self._current = self._find(day, version)
+        record_cache("shared_store", self._current is not None)
+        if self._current is not None or version is None:
+            return self._current
+
+        if self._building.locked():
+            return None
+        async with self._building:
+            return await self._build(repository, day, version)
+
+    def _paths(self, day: date) -> List[str]:
+        if self.snapshot_dir:
+            return [snapshot_path(self.snapshot_dir, day), self.path]
+        return [self.path]
+
+    def _find(self, day: date, version: Optional[int]) -> Optional[ProjectionSnapshot]:
+        """The first current snapshot among the published one and the store file"""
+        for path in self._paths(day):
+            snapshot = self._attach(path)
+            if _is_current(snapshot, day, version):
+                return snapshot
+        return None
+
+    def _attach(self, path: str) -> Optional[ProjectionSnapshot]:
+        """Map a snapshot file, again only if it was replaced since it was last mapped"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        file_id = (stat.st_ino, stat.st_mtime_ns)
+        attached = self._attached.get(path)
+        if attached is None or attached[0] != file_id:
+            try:
+                attached = (file_id, ProjectionSnapshot(path))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not attach snapshot {path}: {str(e)}")
+                return None
+            self._attached[path] = attached
+        return attached[1]
+
+    async def _build(self, repository: Any, day: date, version: int) -> Optional[ProjectionSnapshot]:
+        """Rebuild the store file unless another worker holds the lock"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".lock", "w") as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return None
+
+            # Another worker may have finished a build while we waited
+            snapshot = self._attach(self.path)
+            if not _is_current(snapshot, day, version):
+                try:
+                    await self.rebuild(repository, day, version)
+                except Exception as e:
+                    logger.error(f"Error building shared store for {day}: {str(e)}")
+                    return None
+                snapshot = self._attach(self.path)
+
+        self._current = snapshot if _is_current(snapshot, day, version) else None
+        return self._current
+
+    async def rebuild(self, repository: Any, day: date, version: int) -> None:
+        """
+        Read the day's rows and write them to the store file
+
+        Args:
+            repository: Repository to read from
+            day: Date of the games
+            version: Data version the rows are read at
+        """
+        await build_snapshot(repository, day, self.path, data_version=version)
+
+
+def _is_current(snapshot: Optional[ProjectionSnapshot], day: date, version: Optional[int]) -> bool:
+    if snapshot is None or snapshot.date != day:
+        return False
+    return version is None or snapshot.data_version >= version
+
+
+# Process-wide store, or None when disabled
+shared_store: Optional[SharedStore] = SharedStore() if SHARED_STORE_ENABLED else None
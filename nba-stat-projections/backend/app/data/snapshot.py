@@ -0,0 +1,483 @@
+"""
+Compact binary snapshots of a date's projections
+
+A snapshot holds everything the projection endpoints read for one date:
+projections as fixed-width columns, plus the games, teams and players they
+reference. Snapshots are written by the ingestion pipeline after each
+generation run and memory-mapped by API pods, which then serve the date
+without querying the database.
+
+File layout (little-endian, sections 8-byte aligned):
+
+    magic (8 bytes) | format version (uint32) | header length (uint32)
+    header (JSON): date, data version, ID dictionaries, column names and
+                   the offset and size of each section below
+    created_at     float64[rows]             seconds since the epoch, UTC
+    codes          uint32[3, rows]           player, game and model version,
+                                             as positions in the dictionaries
+    values         float32[columns, rows]    one column per projected value
+    entities       JSON documents for each game, team and player, back to back
+
+Rows are grouped by game, so a game's projections are one contiguous slice.
+Readers must reject a format version they do not know.
+
+Build one from the database with:
+
+    python -m app.data.snapshot --date 2026-01-15 --out /var/lib/nba/snapshots
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+from app.models.schemas import Game, Player, PlayerProjection, Team
+from app.utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Where the pipeline publishes snapshots and API pods look for them (disabled when unset)
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "")
+
+SNAPSHOT_MAGIC = b"NBASNAP\x00"
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Values are read back rounded to this many decimals, which recovers the
+# 1-3 decimal values the models write exactly from their float32 form
+SNAPSHOT_DECIMALS = 4
+
+# Scalar projection fields stored as float32 columns, in column order
+VALUE_FIELDS = (
+    'projected_minutes',
+    'projected_points',
+    'projected_assists',
+    'projected_rebounds',
+    'projected_steals',
+    'projected_blocks',
+    'projected_turnovers',
+    'projected_three_pointers',
+    'projected_field_goal_percentage',
+    'projected_free_throw_percentage',
+    'confidence_score',
+)
+
+# Per-stat fields stored as one float32 column per stat (NaN where missing)
+STAT_FIELDS = ('stat_confidence', 'stat_std')
+
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 8
+
+# (offset, length) of an entity within the entities section
+RowSpan = Tuple[int, int]
+
+
+def snapshot_path(directory: str, day: date) -> str:
+    """Path of a date's snapshot in a directory"""
+    return os.path.join(directory, f"{day.isoformat()}.snap")
+
+
+def _aligned(size: int) -> int:
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def _timestamp(moment: datetime) -> float:
+    # Naive times are UTC, as the database stores them
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _stat_names(projections: Sequence[PlayerProjection], field: str) -> List[str]:
+    names: Dict[str, None] = {}
+    for projection in projections:
+        names.update(dict.fromkeys(getattr(projection, field) or ()))
+    return list(names)
+
+
+def write_snapshot(
+    path: str,
+    day: date,
+    data_version: int,
+    games: Sequence[Game],
+    teams: Sequence[Team],
+    players: Sequence[Player],
+    projections: Sequence[PlayerProjection]
+) -> None:
+    """
+    Write a snapshot, replacing any existing file atomically
+
+    Readers that have the old file mapped keep reading it until they
+    re-attach.
+
+    Args:
+        path: Snapshot file path
+        day: Date the games are on
+        data_version: Data version the rows were read at
+        games: The date's games, in the order they are served
+        teams: Teams playing
+        players: Players with projections
+        projections: Projections for the games, in the order they are served within each game
+    """
+    # Group rows by game, keeping the given order within each game
+    game_ids = [game.id for game in games]
+    game_codes = {game_id: code for code, game_id in enumerate(game_ids)}
+    for projection in projections:
+        if projection.game_id not in game_codes:
+            game_codes[projection.game_id] = len(game_ids)
+            game_ids.append(projection.game_id)
+    projections = sorted(projections, key=lambda p: game_codes[p.game_id])
+
+    player_codes: Dict[str, int] = {}
+    model_codes: Dict[str, int] = {}
+    codes = np.array([
+        [player_codes.setdefault(p.player_id, len(player_codes)) for p in projections],
+        [game_codes[p.game_id] for p in projections],
+        [model_codes.setdefault(p.model_version, len(model_codes)) for p in projections],
+    ], dtype='<u4').reshape(3, len(projections))
+
+    stat_names = {field: _stat_names(projections, field) for field in STAT_FIELDS}
+    quantile_stats = _stat_names(projections, 'stat_quantiles')
+    quantile_count = max((len(q) for p in projections for q in (p.stat_quantiles or {}).values()), default=0)
+
+    columns = list(VALUE_FIELDS)
+    columns += [f"{field}.{name}" for field in STAT_FIELDS for name in stat_names[field]]
+    columns += [f"stat_quantiles.{name}.{i}" for name in quantile_stats for i in range(quantile_count)]
+
+    nan = float('nan')
+    records = []
+    for projection in projections:
+        record = [getattr(projection, field) for field in VALUE_FIELDS]
+        for field in STAT_FIELDS:
+            stats = getattr(projection, field) or {}
+            record.extend(stats.get(name, nan) for name in stat_names[field])
+        quantiles = projection.stat_quantiles or {}
+        for name in quantile_stats:
+            levels = list(quantiles.get(name, ()))
+            record.extend(levels + [nan] * (quantile_count - len(levels)))
+        records.append(record)
+    values = np.array(records, dtype='<f4').reshape(len(projections), len(columns)).T.copy()
+
+    created_at = np.array([_timestamp(p.created_at) for p in projections], dtype='<f8')
+
+    entities = bytearray()
+
+    def append(model: Any) -> RowSpan:
+        data = orjson.dumps(model.model_dump(mode='json'))
+        entities.extend(data)
+        return (len(entities) - len(data), len(data))
+
+    ranges: Dict[str, List[int]] = {}
+    for row, game_code in enumerate(codes[1].tolist()):
+        ranges.setdefault(game_ids[game_code], [row, row])[1] = row + 1
+
+    sections = []
+    offset = 0
+    for name, data in (("created_at", created_at.tobytes()), ("codes", codes.tobytes()), ("values", values.tobytes())):
+        sections.append((name, offset, data))
+        offset = _aligned(offset + len(data))
+
+    header = orjson.dumps({
+        "date": day.isoformat(),
+        "data_version": data_version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "rows": len(projections),
+        "decimals": SNAPSHOT_DECIMALS,
+        "dictionaries": {
+            "players": list(player_codes),
+            "games": game_ids,
+            "model_versions": list(model_codes),
+        },
+        "columns": columns,
+        "stat_fields": stat_names,
+        "quantiles": {"stats": quantile_stats, "count": quantile_count},
+        "game_rows": ranges,
+        "entities": {
+            "games": {game.id: append(game) for game in games},
+            "teams": {team.id: append(team) for team in teams},
+            "players": {player.id: append(player) for player in players},
+        },
+        "sections": {
+            **{name: [start, len(data)] for name, start, data in sections},
+            "entities": [offset, len(entities)],
+        },
+    })
+    base = _aligned(_PREAMBLE.size + len(header))
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header)))
+            f.write(header)
+            for _, start, data in sections:
+                f.seek(base + start)
+                f.write(data)
+            f.seek(base + offset)
+            f.write(entities)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class ProjectionSnapshot:
+    """
+    A snapshot mapped read-only into this process
+
+    Columns are NumPy views of the mapping, so nothing is copied at load and
+    every process mapping the same file shares its pages. Serves the subset
+    of NBARepository reads that the date's projection endpoints make.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a snapshot file
+
+        Args:
+            path: Snapshot file path
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported format version
+        """
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < _PREAMBLE.size:
+            raise ValueError(f"{path} is truncated")
+        magic, format_version, header_length = _PREAMBLE.unpack_from(self._map)
+        if magic != SNAPSHOT_MAGIC or format_version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {SNAPSHOT_FORMAT_VERSION} projection snapshot")
+
+        header = orjson.loads(self._map[_PREAMBLE.size:_PREAMBLE.size + header_length])
+        base = _aligned(_PREAMBLE.size + header_length)
+        sections = {name: (base + start, size) for name, (start, size) in header["sections"].items()}
+        if max(start + size for start, size in sections.values()) > len(self._map):
+            raise ValueError(f"{path} is truncated")
+
+        self.date = date.fromisoformat(header["date"])
+        self.data_version: int = header["data_version"]
+        self.rows: int = header["rows"]
+        self.columns: List[str] = header["columns"]
+        self._decimals: int = header["decimals"]
+
+        # (field, first column, stat names, columns per stat) for each per-stat field
+        self._layout: List[Tuple[str, int, List[str], int]] = []
+        start = len(VALUE_FIELDS)
+        for field in STAT_FIELDS:
+            names = header["stat_fields"].get(field, [])
+            self._layout.append((field, start, names, 1))
+            start += len(names)
+        quantiles = header["quantiles"]
+        self._layout.append(('stat_quantiles', start, quantiles["stats"], quantiles["count"]))
+
+        dictionaries = header["dictionaries"]
+        self.player_ids: List[str] = dictionaries["players"]
+        self.game_ids: List[str] = dictionaries["games"]
+        self.model_versions: List[str] = dictionaries["model_versions"]
+        self._game_rows: Dict[str, Tuple[int, int]] = {
+            game_id: (start, stop) for game_id, (start, stop) in header["game_rows"].items()
+        }
+
+        self.created_at = self._column(sections["created_at"], '<f8', (self.rows,))
+        self.codes = self._column(sections["codes"], '<u4', (3, self.rows))
+        self.values = self._column(sections["values"], '<f4', (len(self.columns), self.rows))
+
+        entities_start, entities_size = sections["entities"]
+        self._entities = memoryview(self._map)[entities_start:entities_start + entities_size]
+        self._games: Dict[str, RowSpan] = {k: tuple(v) for k, v in header["entities"]["games"].items()}
+        self._teams: Dict[str, RowSpan] = {k: tuple(v) for k, v in header["entities"]["teams"].items()}
+        self._players: Dict[str, RowSpan] = {k: tuple(v) for k, v in header["entities"]["players"].items()}
+
+    def _column(self, section: Tuple[int, int], dtype: str, shape: Tuple[int, ...]) -> Any:
+        start, size = section
+        count = size // np.dtype(dtype).itemsize
+        return np.frombuffer(self._map, dtype=dtype, count=count, offset=start).reshape(shape)
+
+    def _entity(self, model: Any, row: Optional[RowSpan]) -> Any:
+        if row is None:
+            return None
+        offset, length = row
+        return model(**orjson.loads(self._entities[offset:offset + length]))
+
+    def column(self, name: str) -> Any:
+        """
+        One value column as a read-only float32 view
+
+        Args:
+            name: Column name (e.g. "projected_points" or "stat_confidence.points")
+
+        Returns:
+            np.ndarray: Values for every row
+        """
+        return self.values[self.columns.index(name)]
+
+    def projections(self, rows: Any) -> List[PlayerProjection]:
+        """
+        Build projection models for some rows
+
+        Args:
+            rows: Row positions (array, list or slice)
+
+        Returns:
+            List[PlayerProjection]: Projections in row order
+        """
+        values = np.round(self.values[:, rows].astype(np.float64), self._decimals).T
+        gaps = np.isnan(values).any(axis=1).tolist()
+        records = values.tolist()
+        codes = self.codes[:, rows].T.tolist()
+        created_at = self.created_at[rows].tolist()
+
+        projections = []
+        for record, gap, (player, game, model), timestamp in zip(records, gaps, codes, created_at):
+            fields: Dict[str, Any] = dict(zip(VALUE_FIELDS, record))
+            for field, start, names, width in self._layout:
+                stats: Dict[str, Any] = {}
+                for i, name in enumerate(names):
+                    position = start + i * width
+                    stats[name] = record[position] if width == 1 else record[position:position + width]
+                if gap:
+                    # Missing stats and quantile levels are stored as NaN
+                    if width == 1:
+                        stats = {name: value for name, value in stats.items() if value == value}
+                    else:
+                        stats = {name: [v for v in value if v == v] for name, value in stats.items()}
+                        stats = {name: value for name, value in stats.items() if value}
+                fields[field] = stats or None
+
+            projections.append(PlayerProjection(
+                player_id=self.player_ids[player],
+                game_id=self.game_ids[game],
+                model_version=self.model_versions[model],
+                created_at=datetime.fromtimestamp(timestamp, timezone.utc),
+                **fields
+            ))
+        return projections
+
+    def game_rows(self, game_id: str) -> slice:
+        """Rows holding a game's projections"""
+        return slice(*self._game_rows.get(game_id, (0, 0)))
+
+    def has_game(self, game_id: str) -> bool:
+        """Whether the snapshot covers a game"""
+        return game_id in self._games
+
+    async def get_games(self, game_date: Optional[date] = None) -> List[Game]:
+        """The snapshot's games, or none if game_date is another day"""
+        if game_date and game_date != self.date:
+            return []
+        return [self._entity(Game, row) for row in self._games.values()]
+
+    async def get_game(self, game_id: str) -> Optional[Game]:
+        """Game by ID"""
+        return self._entity(Game, self._games.get(game_id))
+
+    async def get_team(self, team_id: str) -> Optional[Team]:
+        """Team by ID"""
+        return self._entity(Team, self._teams.get(team_id))
+
+    async def get_player(self, player_id: str) -> Optional[Player]:
+        """Player by ID"""
+        return self._entity(Player, self._players.get(player_id))
+
+    async def get_players_by_ids(self, player_ids: List[str]) -> Dict[str, Player]:
+        """Players found among the IDs, keyed by ID"""
+        return {
+            player_id: self._entity(Player, self._players[player_id])
+            for player_id in set(player_ids) if player_id in self._players
+        }
+
+    async def get_player_projections(
+        self,
+        game_id: str,
+        model_versions: Optional[List[str]] = None
+    ) -> List[PlayerProjection]:
+        """
+        Projections for one of the snapshot's games
+
+        Args:
+            game_id: Game ID
+            model_versions: Optional model version filter
+
+        Returns:
+            List[PlayerProjection]: Projections, in the order they were written
+        """
+        rows = self.game_rows(game_id)
+        if model_versions:
+            wanted = [code for code, version in enumerate(self.model_versions) if version in model_versions]
+            rows = rows.start + np.flatnonzero(np.isin(self.codes[2, rows], wanted))
+        return self.projections(rows)
+
+
+async def read_date(repository: Any, day: date) -> Tuple[List[Game], List[Team], List[Player], List[PlayerProjection]]:
+    """
+    Read everything a date's snapshot holds from the database
+
+    Args:
+        repository: Repository to read from
+        day: Date of the games
+
+    Returns:
+        Tuple: Games, teams, players and projections
+    """
+    games = await repository.get_games(day)
+
+    projections: List[PlayerProjection] = []
+    for game in games:
+        projections.extend(await repository.get_player_projections(game_id=game.id))
+
+    team_ids = {team_id for game in games for team_id in (game.home_team_id, game.visitor_team_id)}
+    teams = await repository.get_teams_by_ids(list(team_ids))
+    players = await repository.get_players_by_ids(list({p.player_id for p in projections}))
+    return games, list(teams.values()), list(players.values()), projections
+
+
+async def build_snapshot(repository: Any, day: date, path: str, data_version: Optional[int] = None) -> int:
+    """
+    Write a date's snapshot from the database
+
+    Args:
+        repository: Repository to read from
+        day: Date of the games
+        path: Snapshot file path
+        data_version: Data version the rows are read at (read from the database if omitted)
+
+    Returns:
+        int: Number of projections written
+    """
+    if data_version is None:
+        data_version = await repository.get_data_version()
+    games, teams, players, projections = await read_date(repository, day)
+    write_snapshot(path, day, data_version, games, teams, players, projections)
+    logger.info(f"Wrote snapshot for {day} at data version {data_version} to {path}: {len(projections)} projections")
+    return len(projections)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build a date's snapshot from the database"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="Slate date (default: today)")
+    parser.add_argument("--out", default=SNAPSHOT_DIR or ".", help="Output directory (default: $SNAPSHOT_DIR)")
+    args = parser.parse_args(argv)
+
+    from app.data.repository import NBARepository
+
+    asyncio.run(build_snapshot(NBARepository(), args.date, snapshot_path(args.out, args.date)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,36 @@
 """
 NBA Player Stat Prop Projection System - Main FastAPI Application
 """
+import asyncio
 import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.data.player_search import player_index
+from app.utils.compression import CompressionMiddleware
+from app.utils.metrics import MetricsMiddleware, metrics_content_type, render_metrics
+from app.utils.profiling import PROFILING_ENABLED, ProfilingMiddleware
+from app.utils.tracing import SERVER_TIMING_ENABLED, ServerTimingMiddleware
+
 # Import routers
 from app.api.projections import router as projections_router
+from app.api.admin import router as admin_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the player search index in the background so start-up is not delayed"""
+    warm_index = asyncio.ensure_future(player_index.warm())
+    yield
+    warm_index.cancel()
 
 # Create FastAPI app
 app = FastAPI(
     title="NBA Player Stat Prop Projection System",
     description="API for NBA player statistical projections",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS middleware
@@ -24,6 +42,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses above the size threshold (brotli if installed, else gzip)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024)),
+)
+
+# Report per-request spans in a Server-Timing header when enabled
+if SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Write cProfile/pyinstrument profiles of sampled requests when enabled
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Record per-route latency (outermost, so it includes compression time)
+app.add_middleware(MetricsMiddleware)
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -40,8 +75,15 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics in the text exposition format"""
+    return Response(render_metrics(), media_type=metrics_content_type())
+
 # Include routers
 app.include_router(projections_router, prefix="/api/projections", tags=["projections"])
+app.include_router(admin_router, prefix="/api/admin", tags=["admin"])
 
 # Run the application with uvicorn when executed directly
 if __name__ == "__main__":
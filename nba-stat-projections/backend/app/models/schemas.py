@@ -1,9 +1,9 @@
 """
 Pydantic models for NBA player projection data
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class Player(BaseModel):
@@ -92,6 +92,11 @@ class PlayerProjection(BaseModel):
     projected_field_goal_percentage: float = Field(..., description="Projected field goal percentage")
     projected_free_throw_percentage: float = Field(..., description="Projected free throw percentage")
     confidence_score: float = Field(..., description="Confidence score for the projection (0-100)")
+    stat_confidence: Optional[Dict[str, float]] = Field(None, description="Per-stat confidence scores (0-100) keyed by stat name")
+    stat_std: Optional[Dict[str, float]] = Field(None, description="Per-stat standard deviations keyed by stat name")
+    stat_quantiles: Optional[Dict[str, List[float]]] = Field(
+        None, description="Simulated p10/p25/p50/p75/p90 per stat keyed by stat name"
+    )
     created_at: datetime = Field(..., description="When the projection was created")
     model_version: str = Field(..., description="Version of the projection model used")
     
@@ -102,4 +107,118 @@ class ProjectionResponse(BaseModel):
     game: Game
     projection: PlayerProjection
     opponent_team: Team
-    home_team: bool = Field(..., description="Whether the player's team is the home team") 
\ No newline at end of file
+    home_team: bool = Field(..., description="Whether the player's team is the home team") 
+
+
+class LeaderboardEntry(ProjectionResponse):
+    """Projection ranked on a stat leaderboard"""
+    rank: int = Field(..., description="Position on the leaderboard, starting at 1")
+    value: float = Field(..., description="Projected value of the ranked stat")
+
+
+class NormalizedProjection(PlayerProjection):
+    """Player projection referencing its teams and game by ID"""
+    opponent_team_id: str = Field(..., description="Opponent team ID")
+    home_team: bool = Field(..., description="Whether the player's team is the home team")
+
+
+class NormalizedProjectionsResponse(BaseModel):
+    """Projection listing with each team, game and player emitted once"""
+    teams: Dict[str, Team] = Field(..., description="Teams keyed by ID")
+    games: Dict[str, Game] = Field(..., description="Games keyed by ID")
+    players: Dict[str, Player] = Field(..., description="Players keyed by ID")
+    projections: List[NormalizedProjection] = Field(..., description="Projections referencing the maps above")
+
+
+class PlayerSearchResult(BaseModel):
+    """Player matching a name search"""
+    player: Player
+    score: float = Field(..., description="Match quality from 0 to 1: 1 exact, 0.9 name prefix, 0.8 word prefixes, below 0.7 fuzzy")
+
+
+class PropLine(BaseModel):
+    """Sportsbook prop line for a player stat"""
+    player_id: str = Field(..., description="NBA API player ID")
+    stat: str = Field(..., description="Stat name (points, rebounds, assists, ...)")
+    line: float = Field(..., description="Line value")
+    over_odds: int = Field(-110, description="American odds for the over")
+    under_odds: int = Field(-110, description="American odds for the under")
+    
+    @field_validator("over_odds", "under_odds")
+    @classmethod
+    def check_american_odds(cls, odds: int) -> int:
+        """American odds are at least 100 in magnitude (-110, +100, +150, ...)"""
+        if abs(odds) < 100:
+            raise ValueError(f"American odds must be -100 or below, or +100 or above, got {odds}")
+        return odds
+
+
+class PropLineEdge(BaseModel):
+    """Projected edge on a prop line"""
+    player_id: str = Field(..., description="NBA API player ID")
+    game_id: str = Field(..., description="NBA API game ID")
+    stat: str = Field(..., description="Stat name")
+    line: float = Field(..., description="Line value")
+    projected: float = Field(..., description="Projected stat value")
+    prob_over: float = Field(..., description="Simulated probability of finishing over the line")
+    prob_under: float = Field(..., description="Simulated probability of finishing under the line")
+    side: str = Field(..., description="Side with the larger edge (over or under)")
+    edge: float = Field(..., description="Simulated probability minus the odds-implied probability for the side")
+
+
+class GenerationResult(BaseModel):
+    """Summary of an on-demand projection run"""
+    model_version: str = Field(..., description="Model version the projections were generated with")
+    game_ids: List[str] = Field(..., description="Games covered")
+    projections: int = Field(..., description="Number of projections written for the model version")
+    elapsed_ms: float = Field(..., description="Wall time for the run in milliseconds")
+
+
+class ProfiledFunction(BaseModel):
+    """One function's row in a cProfile summary"""
+    function: str = Field(..., description="Function name with its file and line")
+    calls: int = Field(..., description="Number of calls")
+    total_ms: float = Field(..., description="Time in the function itself in milliseconds")
+    cumulative_ms: float = Field(..., description="Time in the function and its callees in milliseconds")
+
+
+class ProfileSummary(BaseModel):
+    """A captured profile of a request or pipeline stage"""
+    id: str = Field(..., description="Profile ID, used to download the raw profile")
+    kind: str = Field(..., description="request or stage")
+    profiler: str = Field(..., description="cprofile or pyinstrument")
+    file: str = Field(..., description="Raw profile file name (.prof for pstats, .html for pyinstrument)")
+    created_at: datetime = Field(..., description="When the profile was written")
+    duration_ms: float = Field(..., description="Wall time of the profiled request or stage in milliseconds")
+    request_id: Optional[str] = Field(None, description="Request ID (requests only)")
+    method: Optional[str] = Field(None, description="HTTP method (requests only)")
+    path: Optional[str] = Field(None, description="Request path (requests only)")
+    route: Optional[str] = Field(None, description="Route template (requests only)")
+    query: Optional[str] = Field(None, description="Query string (requests only)")
+    status: Optional[int] = Field(None, description="Response status (requests only)")
+    stage: Optional[str] = Field(None, description="Stage name (stages only)")
+    details: Dict[str, Any] = Field(default_factory=dict, description="Stage details")
+    top_functions: Optional[List[ProfiledFunction]] = Field(
+        None, description="Functions with the most time spent in their own code (cProfile)"
+    )
+    text: Optional[str] = Field(None, description="Call tree as text (pyinstrument)")
+
+
+class BatchProjectionRequest(BaseModel):
+    """Projections for many players and/or games in one request"""
+    player_ids: List[str] = Field(default_factory=list, max_length=500, description="Player IDs")
+    game_ids: List[str] = Field(
+        default_factory=list, max_length=100, description="Game IDs (combined with player_ids when both are given)"
+    )
+
+
+class PropScanRequest(BaseModel):
+    """Bulk upload of prop lines to scan"""
+    game_date: Optional[date] = Field(None, description="Slate date (defaults to today)")
+    lines: List[PropLine] = Field(..., description="Prop lines to scan")
+
+
+class PropScanResponse(BaseModel):
+    """Prop lines ranked by edge"""
+    edges: List[PropLineEdge] = Field(..., description="Matched lines ranked by edge, best first")
+    unmatched: List[PropLine] = Field(..., description="Lines with no projection or an unknown stat")
@@ -1,25 +1,325 @@
 """
 Statistical algorithms for player projections
 """
-from typing import List, Dict, Any, Optional
-import pandas as pd
-import numpy as np
+from __future__ import annotations
+
+from typing import List, Dict, Any, NamedTuple, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
+from operator import attrgetter
 
 from app.models.schemas import PlayerStats, PlayerProjection
+from app.utils.lazy import lazy_import
+
+# numpy loads when a model first computes, not at API start-up
+np = lazy_import("numpy")
+
+# Box score columns reduced by the projection models, in stacked-matrix order
+STAT_COLUMNS = (
+    'minutes',
+    'points',
+    'assists',
+    'rebounds',
+    'steals',
+    'blocks',
+    'turnovers',
+    'three_pointers_made',
+    'field_goals_made',
+    'field_goals_attempted',
+    'free_throws_made',
+    'free_throws_attempted',
+)
+
+# Projected stats (keyed by short stat name) mapped to their box score column
+PROJECTED_STATS = {
+    'minutes': 'minutes',
+    'points': 'points',
+    'assists': 'assists',
+    'rebounds': 'rebounds',
+    'steals': 'steals',
+    'blocks': 'blocks',
+    'turnovers': 'turnovers',
+    'three_pointers': 'three_pointers_made',
+}
+
+# Stats averaged into the headline confidence score
+HEADLINE_CONFIDENCE_STATS = ('points', 'rebounds', 'assists')
+
+# Column positions in STAT_COLUMNS for each projected stat
+_PROJECTED_STAT_INDEX = [STAT_COLUMNS.index(column) for column in PROJECTED_STATS.values()]
+
+# Reads a box score's STAT_COLUMNS as a tuple
+_read_stat_columns = attrgetter(*STAT_COLUMNS)
+
+
+def weighted_moments(values: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute weighted means and variances of stacked stats in a single reduction
+    
+    The values and their squares are reduced together, so the variance comes
+    out of the same pass over the data as the mean.
+    
+    Args:
+        values: Stat values with shape (..., games, stats)
+        weights: Normalized game weights with shape (..., games)
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Weighted means and variances with shape (..., stats)
+    """
+    n_stats = values.shape[-1]
+    moments = np.einsum('...g,...gs->...s', weights, np.concatenate([values, values * values], axis=-1))
+    mean = moments[..., :n_stats]
+    variance = np.maximum(moments[..., n_stats:] - mean * mean, 0.0)
+    return mean, variance
+
+
+def consistency_confidence(
+    mean: np.ndarray,
+    variance: np.ndarray,
+    games_factor: Any
+) -> np.ndarray:
+    """
+    Convert weighted moments into confidence scores (0-100)
+    
+    Confidence falls with the coefficient of variation of the stat and is
+    scaled by how much of the window the player has actually played.
+    
+    Args:
+        mean: Weighted stat means
+        variance: Weighted stat variances
+        games_factor: Share of the window covered by history (0-1)
+        
+    Returns:
+        np.ndarray: Confidence scores with the same shape as mean
+    """
+    std = np.sqrt(variance)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # A stat that is always zero is perfectly consistent
+        cv = np.where(mean > 0, std / mean, np.where(std > 0, np.inf, 0.0))
+    consistency = 1.0 / (1.0 + cv)
+    return 100.0 * np.asarray(games_factor)[..., np.newaxis] * consistency
+
+
+# Stats boosted by home court advantage
+HOME_ADJUSTED_STATS = ('points', 'assists', 'rebounds')
+
+# Minimum number of games in the window before a model projection is trusted
+MIN_GAMES = 3
+
+_HOME_ADJUSTED_INDEX = [STAT_COLUMNS.index(PROJECTED_STATS[name]) for name in HOME_ADJUSTED_STATS]
+
+
+class BatchProjection(NamedTuple):
+    """Projected stat moments for a stacked batch of players"""
+    mean: np.ndarray      # (players, stats) projected means in STAT_COLUMNS order
+    variance: np.ndarray  # (players, stats) projected variances in STAT_COLUMNS order
+    games: np.ndarray     # (players,) number of games the projection is based on
+    window_size: int      # Window the games were drawn from
+
+
+def window_slots(
+    players: np.ndarray,
+    game_ids: np.ndarray,
+    n_players: int,
+    window_size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Place box score rows in a stacked window, most recent game first
+    
+    Rows are grouped by player and ordered by game_id (assuming it contains
+    date information); each player's most recent game gets slot 0 and games
+    beyond the window are dropped.
+    
+    Args:
+        players: Stack position of each row's player, in any order
+        game_ids: Game ID of each row
+        n_players: Number of players in the stack
+        window_size: Number of most recent games to keep
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Indices of the rows inside
+        the window, and the player and slot each of them goes to
+    """
+    # Sort by player, then game ascending; a row's slot counts the later games of its player
+    order = np.lexsort((game_ids, players))
+    sorted_players = players[order]
+    counts = np.bincount(players, minlength=n_players)
+    first_row = np.cumsum(counts) - counts
+    slots = counts[sorted_players] - 1 - (np.arange(len(order)) - first_row[sorted_players])
+    inside = slots < window_size
+    return order[inside], sorted_players[inside], slots[inside]
+
+
+def stack_histories(
+    histories: Sequence[List[PlayerStats]],
+    window_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack player histories into one array, most recent game first
+    
+    Every player's history is sorted by game (assuming game_id contains date
+    information) and truncated to the window. Shorter histories are padded
+    with zeros and their length is returned separately. Only the rows that
+    fall inside the window are read into the array.
+    
+    Args:
+        histories: Historical stats per player
+        window_size: Number of most recent games to keep
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Values with shape (players, window_size, stats)
+        and the number of games per player
+    """
+    n_players = len(histories)
+    values = np.zeros((n_players, window_size, len(STAT_COLUMNS)))
+    
+    stats = [stat for history in histories for stat in history]
+    if not stats:
+        return values, np.zeros(n_players, dtype=int)
+    
+    players = np.repeat(np.arange(n_players), [len(history) for history in histories])
+    game_ids = np.array([stat.game_id for stat in stats])
+    rows, players, slots = window_slots(players, game_ids, n_players, window_size)
+    
+    # Missing stats (None) become NaN and count as zero
+    window = np.array([_read_stat_columns(stats[row]) for row in rows], dtype=float)
+    values[players, slots] = np.nan_to_num(window)
+    return values, np.bincount(players, minlength=n_players)
+
+
+def stack_frame(
+    frame: Any,
+    player_ids: Sequence[str],
+    window_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack box scores held in a pandas DataFrame
+    
+    Optional adapter for callers that already have a DataFrame (e.g. from
+    nba_api's get_data_frames()); the models themselves never need pandas,
+    and this module does not import it. Rows for players not in player_ids
+    are ignored.
+    
+    Args:
+        frame: DataFrame with player_id, game_id and the STAT_COLUMNS columns
+        player_ids: Player at each stack position
+        window_size: Number of most recent games to keep
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Values with shape (players, window_size, stats)
+        and the number of games per player, as from stack_histories
+    """
+    n_players = len(player_ids)
+    values = np.zeros((n_players, window_size, len(STAT_COLUMNS)))
+    
+    position = {player_id: i for i, player_id in enumerate(player_ids)}
+    players = np.fromiter(
+        (position.get(player_id, -1) for player_id in frame['player_id']), dtype=np.int64, count=len(frame)
+    )
+    known = players >= 0
+    if not known.any():
+        return values, np.zeros(n_players, dtype=int)
+    
+    game_ids = frame['game_id'].to_numpy(dtype=str)[known]
+    stats = frame[list(STAT_COLUMNS)].to_numpy(dtype=float)[known]
+    rows, players, slots = window_slots(players[known], game_ids, n_players, window_size)
+    values[players, slots] = np.nan_to_num(stats[rows])
+    return values, np.bincount(players, minlength=n_players)
+
+
+def window_mask(counts: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Mask of the filled slots in a stacked window
+    
+    Args:
+        counts: Number of games per player
+        window_size: Window size
+        
+    Returns:
+        np.ndarray: Boolean mask with shape (players, window_size)
+    """
+    return np.arange(window_size)[np.newaxis, :] < np.minimum(counts, window_size)[:, np.newaxis]
+
+
+def normalize_weights(weights: np.ndarray) -> np.ndarray:
+    """Normalize per-player weights to sum to 1, leaving empty rows at zero"""
+    totals = weights.sum(axis=-1, keepdims=True)
+    return np.divide(weights, totals, out=np.zeros_like(weights), where=totals > 0)
 
 
 class BaseProjectionModel:
     """Base class for projection models"""
     
-    def __init__(self, model_version: str = "0.1.0"):
+    def __init__(
+        self,
+        model_version: str = "0.1.0",
+        window_size: int = 10,
+        home_advantage: float = 0.05
+    ):
         """
         Initialize the projection model
         
         Args:
             model_version: Version of the model
+            window_size: Number of recent games the model looks at
+            home_advantage: Percentage adjustment for home games
         """
         self.model_version = model_version
+        self.window_size = window_size
+        self.home_advantage = home_advantage
+    
+    def project_batch(
+        self,
+        values: np.ndarray,
+        counts: np.ndarray,
+        is_home: np.ndarray
+    ) -> BatchProjection:
+        """
+        Project stat moments for a stacked batch of players
+        
+        The stack may be wider than this model's window; only the first
+        window_size (most recent) games are used.
+        
+        Args:
+            values: Stacked stats with shape (players, games, stats), most recent first
+            counts: Number of games per player
+            is_home: Whether each player's team is the home team
+            
+        Returns:
+            BatchProjection: Projected means and variances
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+    
+    def _apply_home_advantage(self, batch: BatchProjection, is_home: np.ndarray) -> BatchProjection:
+        """Scale home players' home-adjusted stats by the home advantage"""
+        factor = np.where(np.asarray(is_home, dtype=bool), 1 + self.home_advantage, 1.0)[:, np.newaxis]
+        mean = batch.mean.copy()
+        variance = batch.variance.copy()
+        mean[:, _HOME_ADJUSTED_INDEX] *= factor
+        variance[:, _HOME_ADJUSTED_INDEX] *= factor * factor
+        return batch._replace(mean=mean, variance=variance)
+    
+    def project_many(
+        self,
+        player_ids: Sequence[str],
+        game_ids: Sequence[str],
+        histories: Sequence[List[PlayerStats]],
+        is_home: Sequence[bool]
+    ) -> List[PlayerProjection]:
+        """
+        Generate projections for a batch of players in one pass
+        
+        Args:
+            player_ids: Player ID per projection
+            game_ids: Game ID per projection
+            histories: Historical stats per projection
+            is_home: Whether each player's team is the home team
+            
+        Returns:
+            List[PlayerProjection]: Generated projections in input order
+        """
+        values, counts = stack_histories(histories, self.window_size)
+        batch = self.project_batch(values, counts, np.asarray(is_home, dtype=bool))
+        return self.build_projections(player_ids, game_ids, batch, self.model_version)
     
     def project(
         self, 
@@ -44,7 +344,129 @@ class BaseProjectionModel:
         Returns:
             PlayerProjection: Generated projection
         """
-        raise NotImplementedError("Subclasses must implement this method")
+        # TODO: Apply opponent strength adjustment when we have team defense data
+        return self.project_many([player_id], [game_id], [historical_stats], [is_home])[0]
+    
+    def build_projections(
+        self,
+        player_ids: Sequence[str],
+        game_ids: Sequence[str],
+        batch: BatchProjection,
+        model_version: str
+    ) -> List[PlayerProjection]:
+        """
+        Turn projected stat moments into projection models
+        
+        Args:
+            player_ids: Player ID per row
+            game_ids: Game ID per row
+            batch: Projected means and variances
+            model_version: Model version to record on the projections
+            
+        Returns:
+            List[PlayerProjection]: One projection per row, with a default
+            projection for players with fewer than MIN_GAMES games
+        """
+        mean = batch.mean
+        stat = {column: mean[:, i] for i, column in enumerate(STAT_COLUMNS)}
+        
+        # Calculate percentages
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fg_pct = np.where(
+                stat['field_goals_attempted'] > 0,
+                stat['field_goals_made'] / stat['field_goals_attempted'],
+                0.0
+            )
+            ft_pct = np.where(
+                stat['free_throws_attempted'] > 0,
+                stat['free_throws_made'] / stat['free_throws_attempted'],
+                0.0
+            )
+        
+        # Per-stat confidence from the coefficient of variation of each stat,
+        # scaled by how much of the window the player has played
+        games_played_factor = np.minimum(batch.games / batch.window_size, 1.0)
+        confidence = consistency_confidence(
+            mean[:, _PROJECTED_STAT_INDEX],
+            batch.variance[:, _PROJECTED_STAT_INDEX],
+            games_played_factor
+        )
+        headline_index = [list(PROJECTED_STATS).index(name) for name in HEADLINE_CONFIDENCE_STATS]
+        
+        # Round everything in bulk before building the models
+        projected = np.round(mean[:, _PROJECTED_STAT_INDEX], 1).tolist()
+        confidence_rounded = np.round(confidence, 1).tolist()
+        confidence_score = np.round(np.round(confidence[:, headline_index], 1).mean(axis=1), 1).tolist()
+        std = np.round(np.sqrt(batch.variance[:, _PROJECTED_STAT_INDEX]), 2).tolist()
+        fg_pct = np.round(fg_pct, 3).tolist()
+        ft_pct = np.round(ft_pct, 3).tolist()
+        created_at = datetime.now()
+        
+        projections = []
+        for row, (player_id, game_id) in enumerate(zip(player_ids, game_ids)):
+            if batch.games[row] < MIN_GAMES:
+                # Not enough data, return default projection
+                projections.append(self._create_default_projection(player_id, game_id, model_version))
+                continue
+            
+            values = dict(zip(PROJECTED_STATS, projected[row]))
+            projections.append(PlayerProjection(
+                player_id=player_id,
+                game_id=game_id,
+                projected_minutes=values['minutes'],
+                projected_points=values['points'],
+                projected_assists=values['assists'],
+                projected_rebounds=values['rebounds'],
+                projected_steals=values['steals'],
+                projected_blocks=values['blocks'],
+                projected_turnovers=values['turnovers'],
+                projected_three_pointers=values['three_pointers'],
+                projected_field_goal_percentage=fg_pct[row],
+                projected_free_throw_percentage=ft_pct[row],
+                confidence_score=confidence_score[row],
+                stat_confidence=dict(zip(PROJECTED_STATS, confidence_rounded[row])),
+                stat_std=dict(zip(PROJECTED_STATS, std[row])),
+                created_at=created_at,
+                model_version=model_version
+            ))
+        
+        return projections
+    
+    def _create_default_projection(
+        self,
+        player_id: str,
+        game_id: str,
+        model_version: Optional[str] = None
+    ) -> PlayerProjection:
+        """
+        Create a default projection when not enough data is available
+        
+        Args:
+            player_id: Player ID
+            game_id: Game ID
+            model_version: Model version the default stands in for
+            
+        Returns:
+            PlayerProjection: Default projection
+        """
+        return PlayerProjection(
+            player_id=player_id,
+            game_id=game_id,
+            projected_minutes=25.0,
+            projected_points=10.0,
+            projected_assists=2.5,
+            projected_rebounds=4.0,
+            projected_steals=0.8,
+            projected_blocks=0.5,
+            projected_turnovers=1.5,
+            projected_three_pointers=1.0,
+            projected_field_goal_percentage=0.450,
+            projected_free_throw_percentage=0.750,
+            confidence_score=20.0,  # Low confidence for default projection
+            stat_confidence={name: 20.0 for name in PROJECTED_STATS},
+            created_at=datetime.now(),
+            model_version=f"{model_version or self.model_version}_default"
+        )
 
 
 class MovingAverageModel(BaseProjectionModel):
@@ -75,147 +497,108 @@ class MovingAverageModel(BaseProjectionModel):
             home_advantage: Percentage adjustment for home games
             model_version: Version of the model
         """
-        super().__init__(model_version)
-        self.window_size = window_size
+        super().__init__(model_version, window_size, home_advantage)
         self.recency_weight = recency_weight
-        self.home_advantage = home_advantage
     
-    def project(
-        self, 
-        player_id: str,
-        game_id: str, 
-        historical_stats: List[PlayerStats],
-        opponent_id: str,
-        is_home: bool,
-        **kwargs
-    ) -> PlayerProjection:
+    def project_batch(
+        self,
+        values: np.ndarray,
+        counts: np.ndarray,
+        is_home: np.ndarray
+    ) -> BatchProjection:
         """
-        Generate projections using weighted moving average
+        Project weighted moving averages for a stacked batch of players
         
         Args:
-            player_id: Player ID
-            game_id: Game ID
-            historical_stats: List of historical player stats
-            opponent_id: Opponent team ID
-            is_home: Whether the player's team is the home team
-            **kwargs: Additional parameters
+            values: Stacked stats with shape (players, games, stats), most recent first
+            counts: Number of games per player
+            is_home: Whether each player's team is the home team
             
         Returns:
-            PlayerProjection: Generated projection
+            BatchProjection: Projected means and variances
         """
-        # Convert to DataFrame for easier manipulation
-        if not historical_stats:
-            # Not enough data, return default projection
-            return self._create_default_projection(player_id, game_id)
-            
-        stats_df = pd.DataFrame([stat.dict() for stat in historical_stats])
-        
-        # Sort by date (assuming game_id contains date information)
-        # In production, we would use actual game dates
-        stats_df = stats_df.sort_values('game_id', ascending=False)
-        
-        # Limit to window size
-        stats_df = stats_df.head(self.window_size)
-        
-        if len(stats_df) < 3:
-            # Not enough data, return default projection
-            return self._create_default_projection(player_id, game_id)
-        
-        # Calculate weights - more recent games get higher weights
-        weights = np.linspace(1, self.recency_weight, len(stats_df))
-        weights = weights / weights.sum()  # Normalize to sum to 1
+        values = values[:, :self.window_size]
+        games = np.minimum(counts, self.window_size)
         
-        # Calculate weighted averages for key stats
-        projected_minutes = (stats_df['minutes'].fillna(0) * weights).sum()
-        projected_points = (stats_df['points'].fillna(0) * weights).sum()
-        projected_assists = (stats_df['assists'].fillna(0) * weights).sum()
-        projected_rebounds = (stats_df['rebounds'].fillna(0) * weights).sum()
-        projected_steals = (stats_df['steals'].fillna(0) * weights).sum()
-        projected_blocks = (stats_df['blocks'].fillna(0) * weights).sum()
-        projected_turnovers = (stats_df['turnovers'].fillna(0) * weights).sum()
-        projected_three_pointers = (stats_df['three_pointers_made'].fillna(0) * weights).sum()
+        # Weights fall linearly from 1 on the latest game to recency_weight on
+        # the oldest game each player actually has; one row per game count
+        weight_rows = np.zeros((self.window_size + 1, self.window_size))
+        for n in range(1, self.window_size + 1):
+            row = np.linspace(1, self.recency_weight, n)
+            weight_rows[n, :n] = row / row.sum()
+        weights = weight_rows[games]
         
-        # Calculate percentages
-        fg_made = (stats_df['field_goals_made'].fillna(0) * weights).sum()
-        fg_attempted = (stats_df['field_goals_attempted'].fillna(0) * weights).sum()
-        projected_field_goal_percentage = fg_made / fg_attempted if fg_attempted > 0 else 0
-        
-        ft_made = (stats_df['free_throws_made'].fillna(0) * weights).sum()
-        ft_attempted = (stats_df['free_throws_attempted'].fillna(0) * weights).sum()
-        projected_free_throw_percentage = ft_made / ft_attempted if ft_attempted > 0 else 0
-        
-        # Apply home court advantage if applicable
-        if is_home:
-            projected_points *= (1 + self.home_advantage)
-            projected_assists *= (1 + self.home_advantage)
-            projected_rebounds *= (1 + self.home_advantage)
-        
-        # TODO: Apply opponent strength adjustment when we have team defense data
-        
-        # Calculate confidence score (simple version)
-        # More games = higher confidence, up to 90%
-        games_played_factor = min(len(stats_df) / self.window_size, 0.9)
-        consistency_factor = 0.1  # Placeholder for consistency calculation
-        confidence_score = (games_played_factor + consistency_factor) * 100
-        
-        # Create projection
-        projection = PlayerProjection(
-            player_id=player_id,
-            game_id=game_id,
-            projected_minutes=round(projected_minutes, 1),
-            projected_points=round(projected_points, 1),
-            projected_assists=round(projected_assists, 1),
-            projected_rebounds=round(projected_rebounds, 1),
-            projected_steals=round(projected_steals, 1),
-            projected_blocks=round(projected_blocks, 1),
-            projected_turnovers=round(projected_turnovers, 1),
-            projected_three_pointers=round(projected_three_pointers, 1),
-            projected_field_goal_percentage=round(projected_field_goal_percentage, 3),
-            projected_free_throw_percentage=round(projected_free_throw_percentage, 3),
-            confidence_score=round(confidence_score, 1),
-            created_at=datetime.now(),
-            model_version=self.model_version
-        )
+        # Weighted means and variances for every stat in one reduction
+        mean, variance = weighted_moments(values, weights)
+        batch = BatchProjection(mean, variance, games, self.window_size)
+        return self._apply_home_advantage(batch, is_home)
+
+
+class EWMAModel(BaseProjectionModel):
+    """
+    Exponentially weighted moving average model for player projections
+    
+    Recent games are weighted by (1 - alpha) ** games_ago, so the model reacts
+    faster to role changes than the linear moving average.
+    """
+    
+    def __init__(
+        self,
+        window_size: int = 15,
+        alpha: float = 0.25,
+        home_advantage: float = 0.05,
+        model_version: str = "ewma_0.1.0"
+    ):
+        """
+        Initialize the EWMA model
         
-        return projection
+        Args:
+            window_size: Number of games to include
+            alpha: Smoothing factor (0-1), higher reacts faster
+            home_advantage: Percentage adjustment for home games
+            model_version: Version of the model
+        """
+        super().__init__(model_version, window_size, home_advantage)
+        self.alpha = alpha
     
-    def _create_default_projection(self, player_id: str, game_id: str) -> PlayerProjection:
+    def project_batch(
+        self,
+        values: np.ndarray,
+        counts: np.ndarray,
+        is_home: np.ndarray
+    ) -> BatchProjection:
         """
-        Create a default projection when not enough data is available
+        Project exponentially weighted averages for a stacked batch of players
         
         Args:
-            player_id: Player ID
-            game_id: Game ID
+            values: Stacked stats with shape (players, games, stats), most recent first
+            counts: Number of games per player
+            is_home: Whether each player's team is the home team
             
         Returns:
-            PlayerProjection: Default projection
+            BatchProjection: Projected means and variances
         """
-        return PlayerProjection(
-            player_id=player_id,
-            game_id=game_id,
-            projected_minutes=25.0,
-            projected_points=10.0,
-            projected_assists=2.5,
-            projected_rebounds=4.0,
-            projected_steals=0.8,
-            projected_blocks=0.5,
-            projected_turnovers=1.5,
-            projected_three_pointers=1.0,
-            projected_field_goal_percentage=0.450,
-            projected_free_throw_percentage=0.750,
-            confidence_score=20.0,  # Low confidence for default projection
-            created_at=datetime.now(),
-            model_version=f"{self.model_version}_default"
-        )
+        values = values[:, :self.window_size]
+        games = np.minimum(counts, self.window_size)
+        
+        decay = (1 - self.alpha) ** np.arange(self.window_size)
+        weights = np.where(window_mask(games, self.window_size), decay[np.newaxis, :], 0.0)
+        
+        mean, variance = weighted_moments(values, normalize_weights(weights))
+        batch = BatchProjection(mean, variance, games, self.window_size)
+        return self._apply_home_advantage(batch, is_home)
 
 
 class RegressionModel(BaseProjectionModel):
     """
-    Placeholder for regression-based projection model
+    Trend regression model for player projections
     
-    This is a more sophisticated model that will be implemented in Phase 2.
-    It will use regression techniques to predict player performance based on:
-    - Player's historical performance
+    Fits a least-squares line through each stat over the player's recent
+    games and extrapolates one game ahead, damping the trend so short hot or
+    cold streaks are not projected forward in full. The spread of the
+    projection is the residual variance of the fit.
+    
+    Later phases will add regressors for:
     - Opponent defensive metrics
     - Game context (home/away, back-to-back, etc.)
     - Team pace and style
@@ -224,32 +607,206 @@ class RegressionModel(BaseProjectionModel):
     
     def __init__(
         self, 
+        window_size: int = 10,
+        trend_damping: float = 0.5,
+        home_advantage: float = 0.05,
         model_version: str = "regression_0.1.0"
     ):
-        """Initialize the regression model"""
-        super().__init__(model_version)
+        """
+        Initialize the regression model
+        
+        Args:
+            window_size: Number of games to fit
+            trend_damping: Share of the fitted trend applied to the projection (0-1)
+            home_advantage: Percentage adjustment for home games
+            model_version: Version of the model
+        """
+        super().__init__(model_version, window_size, home_advantage)
+        self.trend_damping = trend_damping
     
-    def project(
-        self, 
-        player_id: str,
-        game_id: str, 
-        historical_stats: List[PlayerStats],
-        opponent_id: str,
-        is_home: bool,
-        **kwargs
-    ) -> PlayerProjection:
+    def project_batch(
+        self,
+        values: np.ndarray,
+        counts: np.ndarray,
+        is_home: np.ndarray
+    ) -> BatchProjection:
         """
-        Placeholder for regression-based projection implementation
+        Project damped linear trends for a stacked batch of players
         
-        This will be implemented in Phase 2 of the project.
+        Args:
+            values: Stacked stats with shape (players, games, stats), most recent first
+            counts: Number of games per player
+            is_home: Whether each player's team is the home team
+            
+        Returns:
+            BatchProjection: Projected means and variances
         """
-        # For now, just use the moving average model as a fallback
-        fallback_model = MovingAverageModel()
-        return fallback_model.project(
-            player_id=player_id,
-            game_id=game_id,
-            historical_stats=historical_stats,
-            opponent_id=opponent_id,
-            is_home=is_home,
-            **kwargs
-        ) 
\ No newline at end of file
+        values = values[:, :self.window_size]
+        games = np.minimum(counts, self.window_size)
+        weights = normalize_weights(window_mask(games, self.window_size).astype(float))
+        
+        # Game position: 0 for the latest game, -k for k games ago
+        x = -np.arange(self.window_size, dtype=float)[np.newaxis, :]
+        x_mean = (weights * x).sum(axis=1)
+        x_var = (weights * x * x).sum(axis=1) - x_mean * x_mean
+        
+        # Moments of y, y^2 and x*y in one reduction
+        n_stats = values.shape[-1]
+        moments = np.einsum(
+            'pg,pgs->ps',
+            weights,
+            np.concatenate([values, values * values, x[..., np.newaxis] * values], axis=-1)
+        )
+        y_mean = moments[:, :n_stats]
+        y_var = np.maximum(moments[:, n_stats:2 * n_stats] - y_mean * y_mean, 0.0)
+        xy_cov = moments[:, 2 * n_stats:] - x_mean[:, np.newaxis] * y_mean
+        
+        safe_x_var = np.where(x_var > 0, x_var, 1.0)[:, np.newaxis]
+        slope = np.where(x_var[:, np.newaxis] > 0, xy_cov / safe_x_var, 0.0)
+        
+        # Extrapolate to the next game (x = 1)
+        mean = np.maximum(y_mean + self.trend_damping * slope * (1 - x_mean)[:, np.newaxis], 0.0)
+        variance = np.maximum(y_var - slope * slope * x_var[:, np.newaxis], 0.0)
+        
+        batch = BatchProjection(mean, variance, games, self.window_size)
+        return self._apply_home_advantage(batch, is_home)
+
+
+# Default member weights for the ensemble model, keyed by member name
+DEFAULT_ENSEMBLE_WEIGHTS = {
+    'moving_avg': 0.5,
+    'ewma': 0.3,
+    'regression': 0.2,
+}
+
+# Member model classes available to the ensemble, keyed by member name
+ENSEMBLE_MEMBERS = {
+    'moving_avg': MovingAverageModel,
+    'ewma': EWMAModel,
+    'regression': RegressionModel,
+}
+
+
+class EnsembleModel(BaseProjectionModel):
+    """
+    Weighted blend of several projection models
+    
+    All members run over the same stacked history array, so the slate is
+    fetched and stacked once no matter how many members there are. Each
+    member's projections are reported under "<ensemble version>:<member
+    version>" alongside the blend.
+    """
+    
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        members: Optional[Dict[str, BaseProjectionModel]] = None,
+        model_version: str = "ensemble_0.1.0"
+    ):
+        """
+        Initialize the ensemble model
+        
+        Args:
+            weights: Blend weight per member name (defaults to DEFAULT_ENSEMBLE_WEIGHTS)
+            members: Member models per name (defaults to ENSEMBLE_MEMBERS with default settings)
+            model_version: Version of the model
+        """
+        weights = dict(weights or DEFAULT_ENSEMBLE_WEIGHTS)
+        if members is None:
+            unknown = set(weights) - set(ENSEMBLE_MEMBERS)
+            if unknown:
+                raise ValueError(f"Unknown ensemble members: {', '.join(sorted(unknown))}")
+            members = {name: ENSEMBLE_MEMBERS[name]() for name in weights}
+        
+        total = sum(weights[name] for name in members)
+        if total <= 0:
+            raise ValueError("Ensemble weights must sum to a positive value")
+        
+        self.members = members
+        self.weights = {name: weights[name] / total for name in members}
+        window_size = max(member.window_size for member in members.values())
+        super().__init__(model_version, window_size, home_advantage=0.0)
+    
+    def member_version(self, name: str) -> str:
+        """Model version recorded for a member's projections"""
+        return f"{self.model_version}:{self.members[name].model_version}"
+    
+    def project_members(
+        self,
+        values: np.ndarray,
+        counts: np.ndarray,
+        is_home: np.ndarray
+    ) -> Dict[str, BatchProjection]:
+        """
+        Run every member over the stacked array and blend the results
+        
+        Args:
+            values: Stacked stats with shape (players, games, stats), most recent first
+            counts: Number of games per player
+            is_home: Whether each player's team is the home team
+            
+        Returns:
+            Dict[str, BatchProjection]: Batch per member version plus the blend
+            under the ensemble's own version
+        """
+        results = {}
+        mean = np.zeros((values.shape[0], values.shape[2]))
+        second_moment = np.zeros_like(mean)
+        for name, member in self.members.items():
+            batch = member.project_batch(values, counts, is_home)
+            results[self.member_version(name)] = batch
+            weight = self.weights[name]
+            mean += weight * batch.mean
+            second_moment += weight * (batch.variance + batch.mean * batch.mean)
+        
+        # Variance of the mixture of member distributions
+        variance = np.maximum(second_moment - mean * mean, 0.0)
+        results[self.model_version] = BatchProjection(
+            mean, variance, np.minimum(counts, self.window_size), self.window_size
+        )
+        return results
+    
+    def project_batch(
+        self,
+        values: np.ndarray,
+        counts: np.ndarray,
+        is_home: np.ndarray
+    ) -> BatchProjection:
+        """
+        Project the blended stat moments for a stacked batch of players
+        
+        Args:
+            values: Stacked stats with shape (players, games, stats), most recent first
+            counts: Number of games per player
+            is_home: Whether each player's team is the home team
+            
+        Returns:
+            BatchProjection: Blended means and variances
+        """
+        return self.project_members(values, counts, is_home)[self.model_version]
+    
+    def project_many_members(
+        self,
+        player_ids: Sequence[str],
+        game_ids: Sequence[str],
+        histories: Sequence[List[PlayerStats]],
+        is_home: Sequence[bool]
+    ) -> Dict[str, List[PlayerProjection]]:
+        """
+        Generate member and blended projections for a batch of players in one pass
+        
+        Args:
+            player_ids: Player ID per projection
+            game_ids: Game ID per projection
+            histories: Historical stats per projection
+            is_home: Whether each player's team is the home team
+            
+        Returns:
+            Dict[str, List[PlayerProjection]]: Projections per model version
+        """
+        values, counts = stack_histories(histories, self.window_size)
+        batches = self.project_members(values, counts, np.asarray(is_home, dtype=bool))
+        return {
+            version: self.build_projections(player_ids, game_ids, batch, version)
+            for version, batch in batches.items()
+        }
@@ -0,0 +1,181 @@
+"""
+Live feed of projection changes for push subscribers
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import os
+
+from app.models.schemas import PlayerProjection
+from app.utils.pubsub import Broker, Subscription
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# How often the watcher checks the data version while anyone is subscribed
+FEED_POLL_SECONDS = float(os.getenv("PROJECTION_FEED_POLL_SECONDS", 2))
+
+# Projections remembered for diffing; older ones are re-sent in full if they change
+FEED_MAX_TRACKED = int(os.getenv("PROJECTION_FEED_MAX_TRACKED", 20000))
+
+# How far before the newest write seen catch-up reads start, so rows that
+# were still committing when a newer row was read are picked up next time
+WRITE_LOOKBACK_SECONDS = float(os.getenv("PROJECTION_WRITE_LOOKBACK_SECONDS", 30))
+
+# Fields that change on every write and are not part of a diff
+_UNDIFFED_FIELDS = ("created_at",)
+
+ProjectionKey = Tuple[str, str, str]
+
+
+def projection_key(projection: PlayerProjection) -> ProjectionKey:
+    """Identity of a projection row"""
+    return (projection.player_id, projection.game_id, projection.model_version)
+
+
+def catch_up_from(watermark: Optional[datetime]) -> Optional[datetime]:
+    """
+    Start of a catch-up read after the newest write seen
+
+    Args:
+        watermark: written_at of the newest write seen, or None if none was
+
+    Returns:
+        Optional[datetime]: Earliest written_at to re-read, or None for every row
+    """
+    return None if watermark is None else watermark - timedelta(seconds=WRITE_LOOKBACK_SECONDS)
+
+
+class ProjectionFeed:
+    """
+    Turns projection writes into diffs and fans them out to subscribers
+
+    Writes made through ProjectionService in this process are published
+    directly. Writes from other processes (the daily ingestion job, other
+    API pods) are picked up by a single watcher per process that polls the
+    data version and, when it moves, reads the newly written rows once for
+    every subscriber. The watcher only runs while someone is subscribed.
+
+    Rows are read by the written_at time the database stamps on every
+    write, starting WRITE_LOOKBACK_SECONDS before the newest write seen, so
+    a row that committed after a newer one was read is still picked up.
+    Rows re-read from that overlap have not changed and produce no diff;
+    a new watcher records the overlap before its first poll for the same
+    reason.
+
+    Each event is a list of diffs, one per changed projection, carrying the
+    row's identity and only the fields that changed (every field the first
+    time a row is seen). Rewrites with identical values produce no diff.
+    """
+
+    def __init__(self, poll_seconds: float = FEED_POLL_SECONDS, max_tracked: int = FEED_MAX_TRACKED):
+        """
+        Initialize the feed
+
+        Args:
+            poll_seconds: Seconds between data version checks
+            max_tracked: Number of projections remembered for diffing
+        """
+        self.poll_seconds = poll_seconds
+        self.max_tracked = max_tracked
+        self.broker = Broker()
+        self._known: "OrderedDict[ProjectionKey, Dict[str, Any]]" = OrderedDict()
+        self._watcher: Optional[asyncio.Task] = None
+
+    def diff(self, projections: Sequence[PlayerProjection]) -> List[Dict[str, Any]]:
+        """
+        Record projections and return the changes since they were last seen
+
+        Args:
+            projections: Projections that were written
+
+        Returns:
+            List[Dict[str, Any]]: One diff per changed projection
+        """
+        diffs = []
+        for projection in projections:
+            key = projection_key(projection)
+            row = projection.model_dump(mode='json', exclude=set(_UNDIFFED_FIELDS))
+            previous = self._known.pop(key, None)
+            self._known[key] = row
+
+            if previous is None:
+                changes = row
+            else:
+                changes = {field: value for field, value in row.items() if previous.get(field) != value}
+                if not changes:
+                    continue
+
+            diffs.append({
+                'player_id': projection.player_id,
+                'game_id': projection.game_id,
+                'model_version': projection.model_version,
+                'created_at': projection.created_at.isoformat(),
+                'full': previous is None,
+                'changes': changes,
+            })
+
+        while len(self._known) > self.max_tracked:
+            self._known.popitem(last=False)
+
+        return diffs
+
+    def publish_projections(self, projections: Sequence[PlayerProjection]) -> int:
+        """
+        Publish the changes in a batch of written projections
+
+        Args:
+            projections: Projections that were written
+
+        Returns:
+            int: Number of diffs published
+        """
+        diffs = self.diff(projections)
+        if diffs:
+            self.broker.publish(diffs)
+        return len(diffs)
+
+    def subscribe(self, repository) -> Subscription:
+        """
+        Subscribe to projection diffs, starting the watcher if needed
+
+        Args:
+            repository: Repository the watcher reads new projections from
+
+        Returns:
+            Subscription: Queue of diff lists
+        """
+        subscription = self.broker.subscribe()
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.ensure_future(self._watch(repository))
+        return subscription
+
+    async def _watch(self, repository) -> None:
+        """Poll the data version and publish rows written elsewhere until nobody is listening"""
+        version = None
+        watermark = None
+        while self.broker.subscriber_count:
+            try:
+                current = await repository.get_data_version()
+                if version is None:
+                    # Rows already written are not news, even when the first catch-up re-reads them
+                    watermark = await repository.get_latest_projection_write()
+                    recent, _ = await repository.get_projection_writes_since(catch_up_from(watermark))
+                    self.diff(recent)
+                elif current != version:
+                    projections, latest = await repository.get_projection_writes_since(catch_up_from(watermark))
+                    if latest is not None and (watermark is None or latest > watermark):
+                        watermark = latest
+                    self.publish_projections(projections)
+                version = current
+            except Exception as e:
+                logger.warning(f"Projection feed poll failed: {str(e)}")
+
+            await asyncio.sleep(self.poll_seconds)
+
+
+# Process-wide feed shared by all requests
+projection_feed = ProjectionFeed()
@@ -0,0 +1,203 @@
+"""
+Top-N projected stat leaderboards for today's games
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from bisect import bisect_left, insort
+from datetime import date, datetime, timezone
+import asyncio
+import heapq
+import itertools
+import logging
+
+from app.models.schemas import Game, PlayerProjection
+from app.projections.algorithms import PROJECTED_STATS
+from app.projections.feed import ProjectionKey, catch_up_from, projection_key
+from app.utils.http_cache import get_data_version
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Projection field ranked for each stat
+LEADERBOARD_FIELDS = {stat: f"projected_{stat}" for stat in PROJECTED_STATS}
+
+# (-value, player_id, game_id, model_version): ascending order is best first, ties broken by ID
+Entry = Tuple[float, str, str, str]
+
+
+def game_day(game: Game) -> date:
+    """
+    Date a game falls on, as the repository's date filter matches it
+
+    game_date is a datetime on games built in code but stays an ISO string
+    on games read from the database or a snapshot. Either way the date is
+    taken in UTC, like get_games(date).
+
+    Args:
+        game: Game
+
+    Returns:
+        date: The game's date
+    """
+    game_date = game.game_date
+    if isinstance(game_date, str):
+        game_date = datetime.fromisoformat(game_date.replace("Z", "+00:00"))
+    if game_date.tzinfo is not None:
+        game_date = game_date.astimezone(timezone.utc)
+    return game_date.date()
+
+
+class Leaderboards:
+    """
+    Projections for one date's games kept sorted by every projected stat
+
+    Each (model version, stat) pair has a list of entries in rank order.
+    Writing a projection moves its entries with one bisection per stat, so
+    upserts keep every board sorted without re-sorting, and a top-N read is
+    a slice of the first N entries.
+
+    Writes made through ProjectionService in this process are applied
+    directly. Writes from other processes are caught up on the next read
+    after the data version moves, by reading rows the database stamped
+    since shortly before the newest write seen (see ProjectionFeed). The
+    boards are rebuilt from the database when the date changes, and when
+    the version moved but no new write turned up, since then something
+    the catch-up cannot see changed (games, deleted rows, or a write that
+    committed later than the lookback allows).
+    """
+
+    def __init__(self):
+        """Initialize empty boards"""
+        self.date: Optional[date] = None
+        self.version: Optional[int] = None
+        self._watermark: Optional[datetime] = None
+        self._refreshing = asyncio.Lock()
+        self._game_ids: Set[str] = set()
+        self._projections: Dict[ProjectionKey, PlayerProjection] = {}
+        self._boards: Dict[Tuple[str, str], List[Entry]] = {}
+
+    def __len__(self) -> int:
+        return len(self._projections)
+
+    def reset(self, day: date, games: Iterable[Game]) -> None:
+        """
+        Empty the boards and start tracking a date's games
+
+        Args:
+            day: Date of the games
+            games: The date's games
+        """
+        self.date = day
+        self.version = None
+        self._watermark = None
+        self._game_ids = {game.id for game in games}
+        self._projections = {}
+        self._boards = {}
+
+    def apply(self, projections: Sequence[PlayerProjection], games: Iterable[Game] = ()) -> int:
+        """
+        Move written projections to their new places on every board
+
+        Args:
+            projections: Projections that were written
+            games: Games the projections belong to; those on the boards' date start being tracked
+
+        Returns:
+            int: Number of projections on the boards' games that were applied
+        """
+        self._game_ids.update(game.id for game in games if game_day(game) == self.date)
+
+        applied = 0
+        for projection in projections:
+            if projection.game_id not in self._game_ids:
+                continue
+            key = projection_key(projection)
+            previous = self._projections.get(key)
+            self._projections[key] = projection
+
+            for stat, field in LEADERBOARD_FIELDS.items():
+                board = self._boards.setdefault((projection.model_version, stat), [])
+                if previous is not None:
+                    entry = (-getattr(previous, field), *key)
+                    position = bisect_left(board, entry)
+                    if position < len(board) and board[position] == entry:
+                        del board[position]
+                insort(board, (-getattr(projection, field), *key))
+            applied += 1
+        return applied
+
+    def top(self, stat: str, model_versions: Sequence[str], limit: int = 10) -> List[Tuple[PlayerProjection, float]]:
+        """
+        Highest projections for a stat
+
+        Args:
+            stat: Stat name (a key of PROJECTED_STATS)
+            model_versions: Model versions to rank together
+            limit: Number of projections
+
+        Returns:
+            List[Tuple[PlayerProjection, float]]: Projections and their stat value, best first
+        """
+        boards = [self._boards.get((version, stat), []) for version in model_versions]
+        entries = boards[0] if len(boards) == 1 else heapq.merge(*boards)
+
+        return [(self._projections[entry[1:]], -entry[0]) for entry in itertools.islice(entries, limit)]
+
+    async def refresh(self, repository, day: Optional[date] = None) -> None:
+        """
+        Bring the boards up to date with the database
+
+        Rebuilds when the date changed or the catch-up finds no new write,
+        otherwise applies only rows written since the last refresh.
+        Concurrent callers share one refresh; once the boards are built,
+        they keep reading the current contents instead of waiting for it.
+
+        Args:
+            repository: Repository to read the data version and projections from
+            day: Date to rank (defaults to today)
+        """
+        day = day or date.today()
+        if self._refreshing.locked() and self.date == day:
+            return
+
+        async with self._refreshing:
+            version = await get_data_version(repository)
+            if self.date == day and self.version == version:
+                return
+
+            if self.date != day:
+                await self._rebuild(repository, day)
+            else:
+                await self._catch_up(repository, day)
+            self.version = version
+
+    async def _rebuild(self, repository, day: date) -> None:
+        """Load every projection for a date's games"""
+        games = await repository.get_games(day)
+        self.reset(day, games)
+
+        # Taken first, so rows written during the load are caught up on the next refresh
+        watermark = await repository.get_latest_projection_write()
+
+        projections: List[PlayerProjection] = []
+        for game in games:
+            projections.extend(await repository.get_player_projections(game_id=game.id))
+        self.apply(projections)
+        self._watermark = watermark
+        logger.info(f"Built leaderboards for {day}: {len(projections)} projections in {len(games)} games")
+
+    async def _catch_up(self, repository, day: date) -> None:
+        """Apply rows written since the newest write seen, or rebuild if there are none"""
+        projections, latest = await repository.get_projection_writes_since(catch_up_from(self._watermark))
+        if latest is None or (self._watermark is not None and latest <= self._watermark):
+            await self._rebuild(repository, day)
+            return
+
+        unknown = {p.game_id for p in projections} - self._game_ids
+        games = (await repository.get_games_by_ids(list(unknown))).values() if unknown else ()
+        self.apply(projections, games)
+        self._watermark = latest
+
+
+# Process-wide leaderboards shared by all requests
+leaderboards = Leaderboards()
@@ -0,0 +1,180 @@
+"""
+Registry of projection models by version
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+from collections import OrderedDict
+import importlib
+import json
+import logging
+import os
+import threading
+
+from app.utils.metrics import record_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Directory holding optional per-version model artifacts (<version>.json)
+MODEL_ARTIFACT_DIR = os.getenv("MODEL_ARTIFACT_DIR")
+
+# Number of model instances kept warm
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", 8))
+
+# Version served when none is requested
+DEFAULT_MODEL_VERSION = "moving_avg_0.1.0"
+
+
+class ModelSpec(NamedTuple):
+    """Registered model family"""
+    prefix: str                        # Version prefix the family answers to
+    factory: Union[str, Callable]      # Callable or "module:attribute" import path
+    artifact: Optional[str]            # Optional JSON artifact with constructor parameters
+
+
+def load_artifact(path: Optional[str]) -> Dict[str, Any]:
+    """
+    Load model constructor parameters from a JSON artifact
+
+    Args:
+        path: Artifact path, or None for no artifact
+
+    Returns:
+        Dict[str, Any]: Constructor keyword arguments
+    """
+    if not path or not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+class ModelRegistry:
+    """
+    Maps model version strings to factories and artifacts
+
+    Models are built lazily on first use and kept in an LRU of warm
+    instances, so several versions can be served side by side without
+    rebuilding models or reloading artifacts per request.
+    """
+
+    def __init__(self, max_warm: int = MODEL_CACHE_SIZE, artifact_dir: Optional[str] = MODEL_ARTIFACT_DIR):
+        """
+        Initialize the registry
+
+        Args:
+            max_warm: Maximum number of model instances kept warm
+            artifact_dir: Directory searched for <version>.json artifacts
+        """
+        self.max_warm = max_warm
+        self.artifact_dir = artifact_dir
+        self._specs: Dict[str, ModelSpec] = {}
+        self._warm: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        prefix: str,
+        factory: Union[str, Callable],
+        artifact: Optional[str] = None
+    ) -> None:
+        """
+        Register a model family
+
+        Args:
+            prefix: Version prefix (e.g. "moving_avg" matches "moving_avg_0.2.0")
+            factory: Callable taking model_version plus artifact parameters,
+                or a "module:attribute" path imported on first use
+            artifact: Optional JSON artifact with constructor parameters
+        """
+        with self._lock:
+            self._specs[prefix] = ModelSpec(prefix, factory, artifact)
+            # Drop warm instances that may have been built from the old spec
+            for version in [v for v in self._warm if v.startswith(prefix)]:
+                del self._warm[version]
+
+    def resolve(self, model_version: str) -> Optional[ModelSpec]:
+        """
+        Find the registered family for a version (longest prefix wins)
+
+        Args:
+            model_version: Model version
+
+        Returns:
+            Optional[ModelSpec]: Matching spec, or None if unregistered
+        """
+        matches = [spec for prefix, spec in self._specs.items() if model_version.startswith(prefix)]
+        if not matches:
+            return None
+        return max(matches, key=lambda spec: len(spec.prefix))
+
+    def is_registered(self, model_version: str) -> bool:
+        """Whether a model version can be served"""
+        return self.resolve(model_version) is not None
+
+    def prefixes(self) -> List[str]:
+        """Registered version prefixes"""
+        return sorted(self._specs)
+
+    def warm_versions(self) -> List[str]:
+        """Versions currently warm, least recently used first"""
+        return list(self._warm)
+
+    def _artifact_path(self, spec: ModelSpec, model_version: str) -> Optional[str]:
+        """Artifact for a version: a per-version file in the artifact dir, else the registered one"""
+        if self.artifact_dir:
+            path = os.path.join(self.artifact_dir, f"{model_version}.json")
+            if os.path.exists(path):
+                return path
+        return spec.artifact
+
+    def _build(self, spec: ModelSpec, model_version: str) -> Any:
+        """Import the factory if needed and build a model instance"""
+        factory = spec.factory
+        if isinstance(factory, str):
+            module_name, attribute = factory.split(":")
+            factory = getattr(importlib.import_module(module_name), attribute)
+
+        params = load_artifact(self._artifact_path(spec, model_version))
+        logger.info(f"Loading projection model {model_version}")
+        return factory(model_version=model_version, **params)
+
+    def get(self, model_version: str) -> Any:
+        """
+        Get a warm model instance, building it on first use
+
+        Args:
+            model_version: Model version
+
+        Returns:
+            BaseProjectionModel: Model instance
+        """
+        with self._lock:
+            model = self._warm.get(model_version)
+            record_cache("model_registry", model is not None)
+            if model is not None:
+                self._warm.move_to_end(model_version)
+                return model
+
+            spec = self.resolve(model_version)
+            if spec is None:
+                raise ValueError(f"Unknown model version {model_version}")
+
+            model = self._build(spec, model_version)
+            self._warm[model_version] = model
+            while len(self._warm) > self.max_warm:
+                self._warm.popitem(last=False)
+            return model
+
+    def clear(self) -> None:
+        """Drop all warm instances"""
+        with self._lock:
+            self._warm.clear()
+
+
+# Shared registry with the built-in model families
+model_registry = ModelRegistry()
+model_registry.register("moving_avg", "app.projections.algorithms:MovingAverageModel")
+model_registry.register("ewma", "app.projections.algorithms:EWMAModel")
+model_registry.register("regression", "app.projections.algorithms:RegressionModel")
+model_registry.register("ensemble", "app.projections.algorithms:EnsembleModel")
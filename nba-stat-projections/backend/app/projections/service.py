@@ -1,19 +1,140 @@
 """
 Projection service for generating and retrieving player projections
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 from datetime import date, datetime
 import logging
+import time
 
 from app.data.repository import NBARepository
+from app.data.player_search import player_index
+from app.data.shared_store import shared_store
+from app.data.snapshot import SNAPSHOT_DIR, build_snapshot, snapshot_path
 from app.data.nba_api_client import NBADataClient
-from app.models.schemas import Player, Game, Team, PlayerStats, PlayerProjection, ProjectionResponse
-from app.projections.algorithms import MovingAverageModel, RegressionModel
+from app.models.schemas import (
+    Player, Game, Team, PlayerStats, PlayerProjection, ProjectionResponse,
+    PropLine, PropLineEdge, PropScanResponse, NormalizedProjection, NormalizedProjectionsResponse,
+    PlayerSearchResult, LeaderboardEntry
+)
+from app.projections.algorithms import EnsembleModel, PROJECTED_STATS
+from app.projections.registry import model_registry, DEFAULT_MODEL_VERSION
+from app.projections.feed import projection_feed
+from app.projections.leaderboards import leaderboards
+from app.utils.singleflight import SingleFlight
+from app.utils.metrics import MODEL_COMPUTE, observe, record_cache
+from app.utils.tracing import span
+from app.utils.profiling import profile_stage
+from app.projections.simulation import (
+    ProjectionDistribution, DEFAULT_SAMPLES, DEFAULT_SEED, SIMULATED_STATS, scan_lines
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default and maximum page sizes for list endpoints
+DEFAULT_PAGE_LIMIT = 500
+MAX_PAGE_LIMIT = 1000
+
+# How long a simulated slate is reused before it is rebuilt from the database
+DISTRIBUTION_TTL_SECONDS = 300
+
+# Identical concurrent reads share one in-flight computation
+_flights = SingleFlight()
+
+# Simulated slates shared across requests, keyed by (date, model_version)
+_distribution_cache: Dict[Tuple[date, str], Tuple[float, ProjectionDistribution, List[PlayerProjection]]] = {}
+
+
+def meets_confidence(
+    projection: PlayerProjection,
+    min_confidence: float,
+    confidence_stat: Optional[str] = None
+) -> bool:
+    """
+    Check whether a projection meets a confidence threshold
+    
+    Args:
+        projection: Projection to check
+        min_confidence: Minimum confidence score (0-100)
+        confidence_stat: Optional stat name to use its per-stat confidence
+            instead of the headline confidence score
+        
+    Returns:
+        bool: True if the projection is confident enough
+    """
+    if confidence_stat is None:
+        return projection.confidence_score >= min_confidence
+    
+    if confidence_stat not in PROJECTED_STATS:
+        raise ValueError(f"Unknown stat {confidence_stat}")
+    
+    # Projections stored before per-stat confidence existed fall back to the headline score
+    if not projection.stat_confidence or confidence_stat not in projection.stat_confidence:
+        return projection.confidence_score >= min_confidence
+    
+    return projection.stat_confidence[confidence_stat] >= min_confidence
+
+
+def normalize_projection_responses(responses: List[ProjectionResponse]) -> NormalizedProjectionsResponse:
+    """
+    Collapse projection responses into ID-referenced maps
+    
+    Every response repeats its player, game and opponent team; the
+    normalized form emits each of them once and references them by ID.
+    
+    Args:
+        responses: Projection responses
+        
+    Returns:
+        NormalizedProjectionsResponse: Normalized projection listing
+    """
+    teams: Dict[str, Team] = {}
+    games: Dict[str, Game] = {}
+    players: Dict[str, Player] = {}
+    projections = []
+    
+    for response in responses:
+        teams[response.opponent_team.id] = response.opponent_team
+        games[response.game.id] = response.game
+        players[response.player.id] = response.player
+        projections.append(NormalizedProjection(
+            **response.projection.model_dump(),
+            opponent_team_id=response.opponent_team.id,
+            home_team=response.home_team
+        ))
+    
+    return NormalizedProjectionsResponse(teams=teams, games=games, players=players, projections=projections)
+
+
+def page_rows(
+    rows: List[Dict[str, Any]],
+    model: Any,
+    limit: int,
+    fields: Optional[List[str]] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Shape one keyset page of rows for the API
+    
+    Full rows are passed through their model so database-only columns are
+    dropped; partial rows are returned with just the requested fields.
+    
+    Args:
+        rows: Rows ordered by ID
+        model: Pydantic model for full rows
+        limit: Page size the rows were fetched with
+        fields: Requested fields, or None for full rows
+        
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[str]]: Rows and the next cursor
+    """
+    next_cursor = rows[-1]['id'] if len(rows) == limit else None
+    
+    if fields:
+        return [{field: row.get(field) for field in fields} for row in rows], next_cursor
+    
+    return [model(**row).model_dump() for row in rows], next_cursor
+
 
 class ProjectionService:
     """
@@ -24,7 +145,9 @@ class ProjectionService:
         self, 
         repository: Optional[NBARepository] = None,
         data_client: Optional[NBADataClient] = None,
-        model_version: str = "moving_avg_0.1.0"
+        model_version: str = DEFAULT_MODEL_VERSION,
+        ensemble_weights: Optional[Dict[str, float]] = None,
+        filter_model_version: bool = False
     ):
         """
         Initialize the projection service
@@ -33,19 +156,68 @@ class ProjectionService:
             repository: Database repository
             data_client: NBA data client
             model_version: Projection model version to use
+            ensemble_weights: Member weights when model_version is an ensemble
+            filter_model_version: Whether reads only return projections from model_version
         """
         self.repository = repository or NBARepository()
         self.data_client = data_client or NBADataClient()
         self.model_version = model_version
+        self.filter_model_version = filter_model_version
         
-        # Initialize projection model based on version
-        if model_version.startswith("moving_avg"):
-            self.projection_model = MovingAverageModel(model_version=model_version)
-        elif model_version.startswith("regression"):
-            self.projection_model = RegressionModel(model_version=model_version)
+        # Custom ensemble weights get their own instance; everything else
+        # comes warm from the shared registry
+        if ensemble_weights is not None:
+            self.projection_model = EnsembleModel(weights=ensemble_weights, model_version=model_version)
+        elif model_registry.is_registered(model_version):
+            self.projection_model = model_registry.get(model_version)
         else:
             # Default to moving average model
-            self.projection_model = MovingAverageModel()
+            self.projection_model = model_registry.get(DEFAULT_MODEL_VERSION)
+    
+    def _flight_key(self, name: str, *args: Any) -> Tuple[Any, ...]:
+        """
+        Key identifying a read for single-flight coalescing
+        
+        Args:
+            name: Name of the read
+            args: Arguments that change its result
+            
+        Returns:
+            Tuple[Any, ...]: Key including the served model versions
+        """
+        versions = self._served_model_versions()
+        return (name, self.model_version, tuple(versions) if versions else None) + args
+    
+    def _served_model_versions(self) -> Optional[List[str]]:
+        """
+        Model versions reads are restricted to
+        
+        Returns:
+            Optional[List[str]]: The model version and its default-projection
+            variant, or None when reads are not filtered
+        """
+        if not self.filter_model_version:
+            return None
+        return [self.model_version, f"{self.model_version}_default"]
+    
+    async def _read_source(self, game_id: Optional[str] = None) -> Any:
+        """
+        Where today's projection reads are served from
+        
+        Args:
+            game_id: Game the read is for, if any
+            
+        Returns:
+            Any: The shared store when enabled, current and covering the game,
+            otherwise the repository
+        """
+        if shared_store is None:
+            return self.repository
+        
+        snapshot = await shared_store.snapshot(self.repository, date.today())
+        if snapshot is None or (game_id is not None and not snapshot.has_game(game_id)):
+            return self.repository
+        return snapshot
     
     async def get_players(self) -> List[Player]:
         """
@@ -56,6 +228,181 @@ class ProjectionService:
         """
         return await self.repository.get_players()
     
+    async def search_players(
+        self,
+        query: str,
+        limit: int = 10,
+        active_only: bool = True,
+        team_id: Optional[str] = None
+    ) -> List[PlayerSearchResult]:
+        """
+        Find players by name
+        
+        Served from the in-process search index, which is rebuilt first if
+        the roster changed.
+        
+        Args:
+            query: Free-text name query
+            limit: Maximum number of matches
+            active_only: Only match active players
+            team_id: Optional team ID filter
+            
+        Returns:
+            List[PlayerSearchResult]: Matches, best first
+        """
+        await player_index.refresh(self.repository)
+        with span('search'):
+            return [
+                PlayerSearchResult(player=player, score=score)
+                for player, score in player_index.search(query, limit, active_only, team_id)
+            ]
+    
+    async def create_player(self, player: Player) -> Player:
+        """
+        Create a player and add them to the search index
+        
+        Args:
+            player: Player to create
+            
+        Returns:
+            Player: Created player
+        """
+        written, roster_version = await self.repository.create_player(player)
+        player_index.upsert(written, version=roster_version)
+        return written
+    
+    async def update_player(self, player: Player) -> Player:
+        """
+        Update a player and re-index their name
+        
+        Args:
+            player: Player to update
+            
+        Returns:
+            Player: Updated player
+        """
+        written, roster_version = await self.repository.update_player(player)
+        player_index.upsert(written, version=roster_version)
+        return written
+    
+    async def get_leaderboard(self, stat: str, limit: int = 10) -> List[LeaderboardEntry]:
+        """
+        Highest projections for a stat across today's games
+        
+        Only this service's model version is ranked, so each player appears
+        once; default projections for players with too little history are
+        left out.
+        
+        Args:
+            stat: Stat name (a key of PROJECTED_STATS)
+            limit: Number of entries
+            
+        Returns:
+            List[LeaderboardEntry]: Entries, best first
+        """
+        await leaderboards.refresh(self.repository)
+        top = leaderboards.top(stat, [self.model_version], limit)
+        
+        responses = await self._build_responses([projection for projection, _ in top])
+        values = {(projection.player_id, projection.game_id): value for projection, value in top}
+        return [
+            LeaderboardEntry(
+                rank=rank,
+                value=values[(response.projection.player_id, response.projection.game_id)],
+                **{field: getattr(response, field) for field in ProjectionResponse.model_fields}
+            )
+            for rank, response in enumerate(responses, 1)
+        ]
+    
+    async def stream_projection_changes(
+        self,
+        game_id: Optional[str] = None,
+        player_id: Optional[str] = None,
+        keepalive_seconds: float = 15.0
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield projection diffs as they are written
+        
+        Args:
+            game_id: Optional game ID filter
+            player_id: Optional player ID filter
+            keepalive_seconds: Longest quiet period before yielding None as a heartbeat
+            
+        Yields:
+            Optional[Dict[str, Any]]: {'diffs': [...]} for changes, {'resync': True}
+            when this subscriber fell behind and dropped diffs, or None as a heartbeat
+        """
+        versions = self._served_model_versions()
+        subscription = projection_feed.subscribe(self.repository)
+        try:
+            while True:
+                diffs = await subscription.get(timeout=keepalive_seconds)
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield {'resync': True}
+                    continue
+                
+                if diffs is None:
+                    yield None
+                    continue
+                
+                diffs = [
+                    d for d in diffs
+                    if (game_id is None or d['game_id'] == game_id)
+                    and (player_id is None or d['player_id'] == player_id)
+                    and (versions is None or d['model_version'] in versions)
+                ]
+                if diffs:
+                    yield {'diffs': diffs}
+        finally:
+            subscription.close()
+    
+    async def iter_players(
+        self,
+        active_only: bool = True,
+        team_id: Optional[str] = None,
+        position: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield player rows page by page as they are fetched
+        
+        Rows are shaped as in list_players, so a stream and a page with the
+        same cursor and fields carry the same players.
+        
+        Args:
+            active_only: Whether to return only active players
+            team_id: Optional team ID filter
+            position: Optional position filter
+            cursor: Start after this player ID
+            limit: Stop after this many players (None for all)
+            fields: Optional subset of player fields to return
+            
+        Yields:
+            Dict[str, Any]: Player rows ordered by ID
+        """
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = DEFAULT_PAGE_LIMIT if remaining is None else min(DEFAULT_PAGE_LIMIT, remaining)
+            rows = await self.repository.get_players_page(
+                active_only=active_only,
+                team_id=team_id,
+                position=position,
+                after=cursor,
+                limit=page_size,
+                fields=fields
+            )
+            players, cursor = page_rows(rows, Player, page_size, fields)
+            for player in players:
+                yield player
+            
+            if cursor is None:
+                return
+            if remaining is not None:
+                remaining -= len(players)
+    
     async def get_games(self, game_date: Optional[date] = None) -> List[Game]:
         """
         Get games with available projections
@@ -68,6 +415,74 @@ class ProjectionService:
         """
         return await self.repository.get_games(game_date)
     
+    async def list_players(
+        self,
+        active_only: bool = True,
+        team_id: Optional[str] = None,
+        position: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of players
+        
+        Args:
+            active_only: Whether to return only active players
+            team_id: Optional team ID filter
+            position: Optional position filter
+            cursor: Cursor returned with the previous page
+            limit: Page size
+            fields: Optional subset of player fields to return
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: Player rows and the
+            cursor for the next page (None on the last page)
+        """
+        rows = await self.repository.get_players_page(
+            active_only=active_only,
+            team_id=team_id,
+            position=position,
+            after=cursor,
+            limit=limit,
+            fields=fields
+        )
+        return page_rows(rows, Player, limit, fields)
+    
+    async def list_games(
+        self,
+        game_date: Optional[date] = None,
+        season: Optional[str] = None,
+        team_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of games
+        
+        Args:
+            game_date: Optional date filter
+            season: Optional season ID filter
+            team_id: Optional filter for games involving this team
+            cursor: Cursor returned with the previous page
+            limit: Page size
+            fields: Optional subset of game fields to return
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: Game rows and the
+            cursor for the next page (None on the last page)
+        """
+        rows = await self.repository.get_games_page(
+            game_date=game_date,
+            season=season,
+            team_id=team_id,
+            after=cursor,
+            limit=limit,
+            fields=fields
+        )
+        return page_rows(rows, Game, limit, fields)
+    
     async def generate_projection(
         self,
         player_id: str,
@@ -106,6 +521,16 @@ class ProjectionService:
         # Get historical stats for the player
         historical_stats = await self.repository.get_player_stats(player_id)
         
+        # Ensembles write every member alongside the blend from one stacked pass
+        if isinstance(self.projection_model, EnsembleModel):
+            by_version = self.projection_model.project_many_members(
+                [player_id], [game_id], [historical_stats], [is_home]
+            )
+            written = self._with_stored_quantiles([projections[0] for projections in by_version.values()])
+            await self.repository.create_player_projections(written)
+            self._publish_written(written, [game])
+            return self._model_projections(written)[0]
+        
         # Generate projection using the model
         projection = self.projection_model.project(
             player_id=player_id,
@@ -116,10 +541,288 @@ class ProjectionService:
         )
         
         # Save projection to database
+        [projection] = self._with_stored_quantiles([projection])
         await self.repository.create_player_projection(projection)
+        self._publish_written([projection], [game])
         
         return projection
     
+    def _with_stored_quantiles(self, projections: List[PlayerProjection]) -> List[PlayerProjection]:
+        """
+        Simulate freshly generated projections so their quantiles are written with them
+        
+        Args:
+            projections: Projections about to be written
+            
+        Returns:
+            List[PlayerProjection]: Copies carrying stat_quantiles
+        """
+        _, simulated = self.simulate_projections(projections)
+        return simulated
+    
+    def _model_projections(self, written: List[PlayerProjection]) -> List[PlayerProjection]:
+        """Projections from this service's model version among those written"""
+        version = self.projection_model.model_version
+        return [projection for projection in written if projection.model_version == version]
+    
+    def _publish_written(self, written: List[PlayerProjection], games: List[Game]) -> None:
+        """
+        Hand projections that were just stored to in-process readers
+        
+        Every write path calls this, so stream subscribers and the
+        leaderboards see a write as soon as it is stored.
+        
+        Args:
+            written: Projections written, for every model version
+            games: Games the projections belong to
+        """
+        projection_feed.publish_projections(written)
+        leaderboards.apply(written, games)
+    
+    async def _generate_for_games(self, games: List[Game]) -> List[PlayerProjection]:
+        """
+        Generate and store projections for every rostered player in a set of games
+        
+        Rosters and histories are fetched in bulk, the model runs once over
+        the whole batch, and results are upserted in a single write.
+        
+        Args:
+            games: Games to generate projections for
+            
+        Returns:
+            List[PlayerProjection]: Projections from this service's model version
+        """
+        side_by_team = {}
+        for game in games:
+            side_by_team[game.home_team_id] = (game.id, True)
+            side_by_team[game.visitor_team_id] = (game.id, False)
+        
+        players = await self.repository.get_players_by_team_ids(list(side_by_team))
+        if not players:
+            return []
+        
+        histories = await self.repository.get_player_stats_batch([player.id for player in players])
+        
+        player_ids = [player.id for player in players]
+        game_ids = [side_by_team[player.team_id][0] for player in players]
+        is_home = [side_by_team[player.team_id][1] for player in players]
+        stacked = [histories[player_id] for player_id in player_ids]
+        
+        # Ensembles write every member alongside the blend from one stacked pass
+        version = self.projection_model.model_version
+        if isinstance(self.projection_model, EnsembleModel):
+            with observe(MODEL_COMPUTE, version, 'project'), span('model-project'):
+                by_version = self.projection_model.project_many_members(player_ids, game_ids, stacked, is_home)
+            written = [projection for projections in by_version.values() for projection in projections]
+        else:
+            with observe(MODEL_COMPUTE, version, 'project'), span('model-project'):
+                written = self.projection_model.project_many(player_ids, game_ids, stacked, is_home)
+        
+        written = self._with_stored_quantiles(written)
+        await self.repository.upsert_player_projections(written)
+        projections = self._model_projections(written)
+        self._publish_written(written, games)
+        
+        logger.info(f"Generated {len(projections)} projections for {len(games)} games")
+        return projections
+    
+    async def generate_game_projections(self, game_id: str) -> List[PlayerProjection]:
+        """
+        Regenerate projections for every player in a game
+        
+        Args:
+            game_id: Game ID
+            
+        Returns:
+            List[PlayerProjection]: Generated projections
+        """
+        game = await self.repository.get_game(game_id)
+        if not game:
+            raise ValueError(f"Game {game_id} not found")
+        
+        with profile_stage("generate-game", game_id=game_id, model_version=self.model_version):
+            return await self._generate_for_games([game])
+    
+    async def generate_date_projections(self, game_date: date) -> List[PlayerProjection]:
+        """
+        Regenerate projections for every player in every game on a date
+        
+        Args:
+            game_date: Slate date
+            
+        Returns:
+            List[PlayerProjection]: Generated projections
+        """
+        games = await self.repository.get_games(game_date)
+        with profile_stage("generate-date", game_date=game_date.isoformat(), model_version=self.model_version):
+            projections = await self._generate_for_games(games)
+        
+        await self._publish_snapshot(game_date)
+        return projections
+    
+    async def _publish_snapshot(self, game_date: date) -> None:
+        """
+        Write a date's snapshot to SNAPSHOT_DIR for API pods, if configured
+        
+        Args:
+            game_date: Slate date
+        """
+        if not SNAPSHOT_DIR:
+            return
+        
+        try:
+            await build_snapshot(self.repository, game_date, snapshot_path(SNAPSHOT_DIR, game_date))
+        except Exception as e:
+            # Pods fall back to building their own store from the database
+            logger.error(f"Error publishing snapshot for {game_date}: {str(e)}")
+    
+    def simulate_projections(
+        self,
+        projections: List[PlayerProjection],
+        n_samples: int = DEFAULT_SAMPLES,
+        seed: Optional[int] = DEFAULT_SEED
+    ) -> Tuple[ProjectionDistribution, List[PlayerProjection]]:
+        """
+        Simulate stat distributions for a slate and attach their quantiles
+        
+        Args:
+            projections: Projections to simulate
+            n_samples: Number of samples per player-stat
+            seed: Random generator seed
+            
+        Returns:
+            Tuple[ProjectionDistribution, List[PlayerProjection]]: Simulated distributions
+            for over/under queries, and copies of the projections carrying their quantiles
+        """
+        with observe(MODEL_COMPUTE, self.projection_model.model_version, 'simulate'), span('model-simulate'):
+            distribution = ProjectionDistribution.simulate(projections, n_samples, seed)
+            simulated = distribution.with_quantiles(projections)
+        return distribution, simulated
+    
+    def _simulate_responses(self, responses: List[ProjectionResponse]) -> List[ProjectionResponse]:
+        """Copy responses with simulated quantiles on their projections"""
+        _, simulated = self.simulate_projections([response.projection for response in responses])
+        return [
+            response.model_copy(update={"projection": projection})
+            for response, projection in zip(responses, simulated)
+        ]
+    
+    def _select_model_projections(self, projections: List[PlayerProjection]) -> List[PlayerProjection]:
+        """
+        Keep one projection per player, preferring this service's model version
+        
+        Args:
+            projections: Projections possibly holding several model versions per player
+            
+        Returns:
+            List[PlayerProjection]: The chosen projection for each player
+        """
+        selected: Dict[str, PlayerProjection] = {}
+        for projection in projections:
+            current = selected.get(projection.player_id)
+            if current is None:
+                selected[projection.player_id] = projection
+                continue
+            
+            current_match = current.model_version == self.model_version
+            new_match = projection.model_version == self.model_version
+            if (new_match, projection.created_at) > (current_match, current.created_at):
+                selected[projection.player_id] = projection
+        
+        return list(selected.values())
+    
+    async def get_slate_distribution(
+        self,
+        game_date: Optional[date] = None
+    ) -> Tuple[ProjectionDistribution, List[PlayerProjection]]:
+        """
+        Get the simulated distributions for a date's slate
+        
+        Distributions are cached in memory and shared across requests, so
+        repeated scans against the same slate do not re-simulate.
+        
+        Args:
+            game_date: Slate date (defaults to today)
+            
+        Returns:
+            Tuple[ProjectionDistribution, List[PlayerProjection]]: Distributions and
+            the projections they were simulated from, in row order
+        """
+        game_date = game_date or date.today()
+        key = (game_date, self.model_version)
+        cached = _distribution_cache.get(key)
+        fresh = bool(cached) and time.monotonic() - cached[0] < DISTRIBUTION_TTL_SECONDS
+        record_cache("slate_distribution", fresh)
+        if fresh:
+            return cached[1], cached[2]
+        
+        return await _flights.do(
+            self._flight_key('slate', game_date),
+            lambda: self._simulate_slate(game_date)
+        )
+    
+    async def _simulate_slate(self, game_date: date) -> Tuple[ProjectionDistribution, List[PlayerProjection]]:
+        """Load and simulate a date's slate, then cache it"""
+        projections: List[PlayerProjection] = []
+        for game in await self.repository.get_games(game_date):
+            projections.extend(await self.repository.get_player_projections(
+                game_id=game.id,
+                model_versions=self._served_model_versions()
+            ))
+        projections = self._select_model_projections(projections)
+        
+        distribution, projections = self.simulate_projections(projections)
+        _distribution_cache[(game_date, self.model_version)] = (time.monotonic(), distribution, projections)
+        return distribution, projections
+    
+    async def scan_prop_lines(
+        self,
+        lines: List[PropLine],
+        game_date: Optional[date] = None
+    ) -> PropScanResponse:
+        """
+        Rank prop lines by edge against the simulated slate
+        
+        Args:
+            lines: Prop lines to scan
+            game_date: Slate date (defaults to today)
+            
+        Returns:
+            PropScanResponse: Matched lines ranked by edge and unmatched lines
+        """
+        distribution, projections = await self.get_slate_distribution(game_date)
+        
+        result = scan_lines(
+            distribution,
+            [line.player_id for line in lines],
+            [line.stat for line in lines],
+            [line.line for line in lines],
+            [line.over_odds for line in lines],
+            [line.under_odds for line in lines]
+        )
+        
+        matched_lines = [line for line, matched in zip(lines, result['matched']) if matched]
+        unmatched = [line for line, matched in zip(lines, result['matched']) if not matched]
+        
+        edges = []
+        for i in result['order']:
+            line = matched_lines[i]
+            projection = projections[result['row'][i]]
+            stat = SIMULATED_STATS[result['stat_index'][i]]
+            edges.append(PropLineEdge(
+                player_id=line.player_id,
+                game_id=projection.game_id,
+                stat=stat,
+                line=line.line,
+                projected=getattr(projection, f"projected_{stat}"),
+                prob_over=round(float(result['prob_over'][i]), 4),
+                prob_under=round(float(result['prob_under'][i]), 4),
+                side='over' if result['over'][i] else 'under',
+                edge=round(float(result['edge'][i]), 4)
+            ))
+        
+        return PropScanResponse(edges=edges, unmatched=unmatched)
+    
     async def get_player_projections(
         self,
         player_id: str,
@@ -128,6 +831,8 @@ class ProjectionService:
         """
         Get projections for a specific player
         
+        Concurrent identical requests share one set of database queries.
+        
         Args:
             player_id: Player ID
             game_id: Optional game ID filter
@@ -135,6 +840,17 @@ class ProjectionService:
         Returns:
             List[ProjectionResponse]: List of projection responses
         """
+        return list(await _flights.do(
+            self._flight_key('player', player_id, game_id),
+            lambda: self._load_player_projections(player_id, game_id)
+        ))
+    
+    async def _load_player_projections(
+        self,
+        player_id: str,
+        game_id: Optional[str] = None
+    ) -> List[ProjectionResponse]:
+        """Uncoalesced body of get_player_projections"""
         # Get player information
         player = await self.repository.get_player(player_id)
         if not player:
@@ -143,75 +859,146 @@ class ProjectionService:
         # Get projections for the player
         projections = await self.repository.get_player_projections(
             player_id=player_id,
-            game_id=game_id
+            game_id=game_id,
+            model_versions=self._served_model_versions()
         )
         
-        # Build response objects
+        return await self._build_responses(projections, players={player.id: player})
+    
+    async def _build_responses(
+        self,
+        projections: List[PlayerProjection],
+        players: Optional[Dict[str, Player]] = None
+    ) -> List[ProjectionResponse]:
+        """
+        Join projections with their players, games and opponents
+        
+        Metadata is fetched with one query per table for the whole batch.
+        
+        Args:
+            projections: Projections to build responses for
+            players: Optional players already loaded, keyed by ID
+            
+        Returns:
+            List[ProjectionResponse]: Projection responses, skipping any with missing metadata
+        """
+        players = dict(players or {})
+        missing_players = {p.player_id for p in projections} - set(players)
+        if missing_players:
+            players.update(await self.repository.get_players_by_ids(list(missing_players)))
+        
+        games = await self.repository.get_games_by_ids(list({p.game_id for p in projections}))
+        team_ids = {team_id for game in games.values() for team_id in (game.home_team_id, game.visitor_team_id)}
+        teams = await self.repository.get_teams_by_ids(list(team_ids))
+        
         responses = []
         for projection in projections:
-            # Get game information
-            game = await self.repository.get_game(projection.game_id)
+            player = players.get(projection.player_id)
+            if not player:
+                logger.warning(f"Player {projection.player_id} not found for projection")
+                continue
+            
+            game = games.get(projection.game_id)
             if not game:
                 logger.warning(f"Game {projection.game_id} not found for projection")
                 continue
             
             # Determine opponent team
-            if player.team_id == game.home_team_id:
-                is_home = True
-                opponent_id = game.visitor_team_id
-            else:
-                is_home = False
-                opponent_id = game.home_team_id
-                
-            # Get opponent team information
-            opponent_team = await self.repository.get_team(opponent_id)
+            is_home = player.team_id == game.home_team_id
+            opponent_id = game.visitor_team_id if is_home else game.home_team_id
+            
+            opponent_team = teams.get(opponent_id)
             if not opponent_team:
                 logger.warning(f"Team {opponent_id} not found for projection")
                 continue
             
-            # Build response
-            response = ProjectionResponse(
-                player=player,
-                game=game,
-                projection=projection,
-                opponent_team=opponent_team,
-                home_team=is_home
-            )
-            
-            responses.append(response)
+            with span('build'):
+                responses.append(ProjectionResponse(
+                    player=player,
+                    game=game,
+                    projection=projection,
+                    opponent_team=opponent_team,
+                    home_team=is_home
+                ))
         
         return responses
     
-    async def get_game_projections(
+    async def get_batch_projections(
         self,
-        game_id: str,
-        team_id: Optional[str] = None
+        player_ids: Optional[List[str]] = None,
+        game_ids: Optional[List[str]] = None
     ) -> List[ProjectionResponse]:
         """
-        Get projections for all players in a specific game
+        Get projections for many players and/or games at once
+        
+        Concurrent identical requests share one set of database queries.
+        
+        Args:
+            player_ids: Optional player IDs
+            game_ids: Optional game IDs (combined with player_ids when both are given)
+            
+        Returns:
+            List[ProjectionResponse]: Projection responses ordered by player, then game
+        """
+        return list(await _flights.do(
+            self._flight_key('batch', tuple(sorted(player_ids or [])), tuple(sorted(game_ids or []))),
+            lambda: self._load_batch_projections(player_ids, game_ids)
+        ))
+    
+    async def _load_batch_projections(
+        self,
+        player_ids: Optional[List[str]] = None,
+        game_ids: Optional[List[str]] = None
+    ) -> List[ProjectionResponse]:
+        """Uncoalesced body of get_batch_projections"""
+        if not player_ids and not game_ids:
+            raise ValueError("At least one player_id or game_id is required")
+        
+        projections = await self.repository.get_projections_batch(
+            player_ids=player_ids,
+            game_ids=game_ids,
+            model_versions=self._served_model_versions()
+        )
+        projections.sort(key=lambda p: (p.player_id, p.game_id, p.model_version))
+        return await self._build_responses(projections)
+    
+    async def iter_game_projections(
+        self,
+        game_id: str,
+        team_id: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        confidence_stat: Optional[str] = None
+    ) -> AsyncIterator[ProjectionResponse]:
+        """
+        Yield projections for all players in a specific game as they are assembled
         
         Args:
             game_id: Game ID
             team_id: Optional team ID filter
+            min_confidence: Optional minimum confidence score filter
+            confidence_stat: Optional stat whose confidence min_confidence applies to
             
-        Returns:
-            List[ProjectionResponse]: List of projection responses
+        Yields:
+            ProjectionResponse: Projection responses
         """
+        source = await self._read_source(game_id)
+        
         # Get game information
-        game = await self.repository.get_game(game_id)
+        game = await source.get_game(game_id)
         if not game:
             raise ValueError(f"Game {game_id} not found")
         
         # Get team information
-        home_team = await self.repository.get_team(game.home_team_id)
-        visitor_team = await self.repository.get_team(game.visitor_team_id)
+        home_team = await source.get_team(game.home_team_id)
+        visitor_team = await source.get_team(game.visitor_team_id)
         
         if not home_team or not visitor_team:
             raise ValueError(f"Team information missing for game {game_id}")
         
         # Get projections for the game
-        projections = await self.repository.get_player_projections(
-            game_id=game_id
+        projections = await source.get_player_projections(
+            game_id=game_id,
+            model_versions=self._served_model_versions()
         )
         
         # Filter by team if specified
@@ -219,11 +1006,19 @@ class ProjectionService:
             if team_id not in [game.home_team_id, game.visitor_team_id]:
                 raise ValueError(f"Team {team_id} is not playing in game {game_id}")
         
+        # Drop low-confidence projections before any player lookups
+        if min_confidence is not None:
+            projections = [
+                p for p in projections
+                if meets_confidence(p, min_confidence, confidence_stat)
+            ]
+        
+        # Get player information for every projection in one lookup
+        players = await source.get_players_by_ids([p.player_id for p in projections])
+        
         # Build response objects
-        responses = []
         for projection in projections:
-            # Get player information
-            player = await self.repository.get_player(projection.player_id)
+            player = players.get(projection.player_id)
             if not player:
                 logger.warning(f"Player {projection.player_id} not found for projection")
                 continue
@@ -241,50 +1036,151 @@ class ProjectionService:
                 opponent_team = home_team
             
             # Build response
-            response = ProjectionResponse(
-                player=player,
-                game=game,
-                projection=projection,
-                opponent_team=opponent_team,
-                home_team=is_home
-            )
+            with span('build'):
+                response = ProjectionResponse(
+                    player=player,
+                    game=game,
+                    projection=projection,
+                    opponent_team=opponent_team,
+                    home_team=is_home
+                )
+            yield response
+    
+    async def get_game_projections(
+        self,
+        game_id: str,
+        team_id: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        confidence_stat: Optional[str] = None,
+        simulate: bool = False
+    ) -> List[ProjectionResponse]:
+        """
+        Get projections for all players in a specific game
+        
+        Concurrent identical requests share one set of database queries.
+        
+        Args:
+            game_id: Game ID
+            team_id: Optional team ID filter
+            min_confidence: Optional minimum confidence score filter
+            confidence_stat: Optional stat whose confidence min_confidence applies to
+            simulate: Whether to attach simulated stat quantiles
             
-            responses.append(response)
+        Returns:
+            List[ProjectionResponse]: List of projection responses
+        """
+        return list(await _flights.do(
+            self._flight_key('game', game_id, team_id, min_confidence, confidence_stat, simulate),
+            lambda: self._load_game_projections(game_id, team_id, min_confidence, confidence_stat, simulate)
+        ))
+    
+    async def _load_game_projections(
+        self,
+        game_id: str,
+        team_id: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        confidence_stat: Optional[str] = None,
+        simulate: bool = False
+    ) -> List[ProjectionResponse]:
+        """Uncoalesced body of get_game_projections"""
+        responses = [
+            response async for response in self.iter_game_projections(
+                game_id, team_id, min_confidence, confidence_stat
+            )
+        ]
+        
+        if simulate and responses:
+            responses = self._simulate_responses(responses)
         
         return responses
     
-    async def get_today_projections(
+    async def iter_today_projections(
         self,
         player_id: Optional[str] = None,
-        team_id: Optional[str] = None
-    ) -> List[ProjectionResponse]:
+        team_id: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        confidence_stat: Optional[str] = None
+    ) -> AsyncIterator[ProjectionResponse]:
         """
-        Get projections for today's games
+        Yield projections for today's games as they are assembled
         
         Args:
             player_id: Optional player ID filter
             team_id: Optional team ID filter
+            min_confidence: Optional minimum confidence score filter
+            confidence_stat: Optional stat whose confidence min_confidence applies to
             
-        Returns:
-            List[ProjectionResponse]: List of projection responses
+        Yields:
+            ProjectionResponse: Projection responses
         """
         today = date.today()
         
         # Get games for today
-        games = await self.repository.get_games(today)
+        source = await self._read_source()
+        games = await source.get_games(today)
         
-        # Get projections for today's games
-        responses = []
         for game in games:
-            game_projections = await self.get_game_projections(
-                game_id=game.id,
-                team_id=team_id
-            )
+            # Skip games the requested team is not playing in
+            if team_id and team_id not in [game.home_team_id, game.visitor_team_id]:
+                continue
             
-            # Filter by player if specified
-            if player_id:
-                game_projections = [p for p in game_projections if p.player.id == player_id]
+            async for response in self.iter_game_projections(
+                game_id=game.id,
+                team_id=team_id,
+                min_confidence=min_confidence,
+                confidence_stat=confidence_stat
+            ):
+                # Filter by player if specified
+                if player_id and response.player.id != player_id:
+                    continue
                 
-            responses.extend(game_projections)
+                yield response
+    
+    async def get_today_projections(
+        self,
+        player_id: Optional[str] = None,
+        team_id: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        confidence_stat: Optional[str] = None,
+        simulate: bool = False
+    ) -> List[ProjectionResponse]:
+        """
+        Get projections for today's games
+        
+        Concurrent identical requests share one set of database queries.
+        
+        Args:
+            player_id: Optional player ID filter
+            team_id: Optional team ID filter
+            min_confidence: Optional minimum confidence score filter
+            confidence_stat: Optional stat whose confidence min_confidence applies to
+            simulate: Whether to attach simulated stat quantiles
+            
+        Returns:
+            List[ProjectionResponse]: List of projection responses
+        """
+        return list(await _flights.do(
+            self._flight_key('today', date.today(), player_id, team_id, min_confidence, confidence_stat, simulate),
+            lambda: self._load_today_projections(player_id, team_id, min_confidence, confidence_stat, simulate)
+        ))
+    
+    async def _load_today_projections(
+        self,
+        player_id: Optional[str] = None,
+        team_id: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        confidence_stat: Optional[str] = None,
+        simulate: bool = False
+    ) -> List[ProjectionResponse]:
+        """Uncoalesced body of get_today_projections"""
+        responses = [
+            response async for response in self.iter_today_projections(
+                player_id, team_id, min_confidence, confidence_stat
+            )
+        ]
+        
+        # Simulate the whole slate as one array rather than game by game
+        if simulate and responses:
+            responses = self._simulate_responses(responses)
         
-        return responses 
\ No newline at end of file
+        return responses
\ No newline at end of file
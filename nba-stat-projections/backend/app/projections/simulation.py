@@ -0,0 +1,325 @@
+"""
+Monte Carlo simulation of projection distributions
+"""
+from __future__ import annotations
+
+from typing import List, Dict, Optional, Sequence, Tuple
+
+from app.models.schemas import PlayerProjection
+from app.projections.algorithms import PROJECTED_STATS
+from app.utils.lazy import lazy_import
+
+# numpy loads on the first simulation, not at API start-up
+np = lazy_import("numpy")
+
+# Stats that are simulated, in array order
+SIMULATED_STATS = tuple(PROJECTED_STATS)
+
+# Quantiles stored on each projection
+QUANTILE_LEVELS = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+# Default number of samples drawn per player-stat
+DEFAULT_SAMPLES = 1000
+
+# Default generator seed so repeated simulations of a slate agree
+DEFAULT_SEED = 0
+
+_STAT_INDEX = {name: i for i, name in enumerate(SIMULATED_STATS)}
+
+
+def projection_moments(projections: Sequence[PlayerProjection]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack projected means and standard deviations for a slate
+
+    Projections without stored standard deviations fall back to a
+    Poisson-like spread (variance equal to the mean).
+
+    Args:
+        projections: Projections for the slate
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Means and standard deviations with shape (players, stats)
+    """
+    mean = np.array(
+        [[getattr(p, f"projected_{name}") for name in SIMULATED_STATS] for p in projections],
+        dtype=np.float64
+    ).reshape(len(projections), len(SIMULATED_STATS))
+    std = np.sqrt(np.maximum(mean, 0.0))
+
+    for row, projection in enumerate(projections):
+        if projection.stat_std:
+            for name, value in projection.stat_std.items():
+                if name in _STAT_INDEX:
+                    std[row, _STAT_INDEX[name]] = value
+
+    return mean, std
+
+
+def simulate_samples(
+    mean: np.ndarray,
+    std: np.ndarray,
+    n_samples: int = DEFAULT_SAMPLES,
+    seed: Optional[int] = DEFAULT_SEED
+) -> np.ndarray:
+    """
+    Draw samples for every player-stat of a slate in one call
+
+    Each player-stat is modelled as a gamma distribution fitted by the method
+    of moments, which keeps samples non-negative and allows the right skew
+    seen in counting stats. Stats without spread are returned as constants.
+
+    Args:
+        mean: Projected means with shape (players, stats)
+        std: Projected standard deviations with shape (players, stats)
+        n_samples: Number of samples per player-stat
+        seed: Random generator seed
+
+    Returns:
+        np.ndarray: Samples with shape (players, stats, samples), sorted along the last axis
+    """
+    rng = np.random.default_rng(seed)
+    mean = np.maximum(mean, 0.0)
+    variance = np.square(std)
+    degenerate = (mean <= 0) | (variance <= 0)
+
+    safe_mean = np.where(degenerate, 1.0, mean)
+    safe_variance = np.where(degenerate, 1.0, variance)
+    shape = safe_mean * safe_mean / safe_variance
+    scale = safe_variance / safe_mean
+
+    samples = rng.gamma(
+        shape[..., np.newaxis],
+        scale[..., np.newaxis],
+        size=mean.shape + (n_samples,)
+    ).astype(np.float32)
+    samples = np.where(degenerate[..., np.newaxis], mean[..., np.newaxis].astype(np.float32), samples)
+    samples.sort(axis=-1)
+    return samples
+
+
+class ProjectionDistribution:
+    """
+    Simulated stat distributions for a slate of projections
+
+    Samples are kept sorted per player-stat so over/under probabilities for
+    any line are answered by binary search instead of re-simulating.
+    """
+
+    def __init__(self, projections: Sequence[PlayerProjection], samples: np.ndarray):
+        """
+        Initialize the distribution
+
+        Args:
+            projections: Projections that were simulated, in row order
+            samples: Sorted samples with shape (players, stats, samples)
+        """
+        self.player_ids = [p.player_id for p in projections]
+        self.game_ids = [p.game_id for p in projections]
+        self.samples = samples
+        self.row_index = {player_id: row for row, player_id in enumerate(self.player_ids)}
+        self.quantiles = np.quantile(samples, QUANTILE_LEVELS, axis=-1).transpose(1, 2, 0)
+        self._flat = None
+        self._row_offset = None
+
+    @classmethod
+    def simulate(
+        cls,
+        projections: Sequence[PlayerProjection],
+        n_samples: int = DEFAULT_SAMPLES,
+        seed: Optional[int] = DEFAULT_SEED
+    ) -> "ProjectionDistribution":
+        """
+        Simulate distributions for a slate of projections
+
+        Args:
+            projections: Projections for the slate
+            n_samples: Number of samples per player-stat
+            seed: Random generator seed
+
+        Returns:
+            ProjectionDistribution: Simulated distributions
+        """
+        mean, std = projection_moments(projections)
+        return cls(projections, simulate_samples(mean, std, n_samples, seed))
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples per player-stat"""
+        return self.samples.shape[-1]
+
+    def stat_quantiles(self, row: int) -> Dict[str, List[float]]:
+        """
+        Get the compact quantiles for one projection
+
+        Args:
+            row: Projection row
+
+        Returns:
+            Dict[str, List[float]]: p10/p25/p50/p75/p90 keyed by stat name
+        """
+        return {
+            name: [round(float(q), 1) for q in self.quantiles[row, i]]
+            for i, name in enumerate(SIMULATED_STATS)
+        }
+
+    def with_quantiles(self, projections: Sequence[PlayerProjection]) -> List[PlayerProjection]:
+        """
+        Copy the simulated projections with their compact quantiles
+
+        The inputs are left untouched since they may be shared with caches,
+        coalesced requests and the leaderboards.
+
+        Args:
+            projections: Projections in the same order they were simulated
+
+        Returns:
+            List[PlayerProjection]: Copies carrying stat_quantiles
+        """
+        return [
+            projection.model_copy(update={"stat_quantiles": self.stat_quantiles(row)})
+            for row, projection in enumerate(projections)
+        ]
+
+    def _flatten(self) -> None:
+        """Lay all sorted rows end to end with offsets so one searchsorted covers the slate"""
+        rows = self.samples.reshape(-1, self.n_samples).astype(np.float64)
+        low = float(rows.min()) if rows.size else 0.0
+        high = float(rows.max()) if rows.size else 0.0
+        span = high - low + 2.0
+        self._low = low - 1.0
+        self._high = high + 1.0
+        self._row_offset = np.arange(rows.shape[0], dtype=np.float64) * span
+        self._flat = (rows - self._low + self._row_offset[:, np.newaxis]).ravel()
+
+    def prob_over_rows(self, rows: np.ndarray, stat_index: np.ndarray, lines: np.ndarray) -> np.ndarray:
+        """
+        Probability that each stat finishes above its line
+
+        Args:
+            rows: Projection row per line
+            stat_index: Index into SIMULATED_STATS per line
+            lines: Line values
+
+        Returns:
+            np.ndarray: P(stat > line) per line
+        """
+        if self._flat is None:
+            self._flatten()
+
+        flat_rows = np.asarray(rows) * len(SIMULATED_STATS) + np.asarray(stat_index)
+        clipped = np.clip(np.asarray(lines, dtype=np.float64), self._low, self._high)
+        targets = clipped - self._low + self._row_offset[flat_rows]
+        at_or_below = np.searchsorted(self._flat, targets, side='right') - flat_rows * self.n_samples
+        return 1.0 - at_or_below / self.n_samples
+
+    def prob_over(self, player_id: str, stat: str, line: float) -> float:
+        """
+        Probability that a player's stat finishes above a line
+
+        Args:
+            player_id: Player ID
+            stat: Stat name
+            line: Line value
+
+        Returns:
+            float: P(stat > line)
+        """
+        if player_id not in self.row_index:
+            raise ValueError(f"No simulated projection for player {player_id}")
+        if stat not in _STAT_INDEX:
+            raise ValueError(f"Unknown stat {stat}")
+
+        return float(self.prob_over_rows(
+            np.array([self.row_index[player_id]]),
+            np.array([_STAT_INDEX[stat]]),
+            np.array([line])
+        )[0])
+
+
+def implied_probability(odds: np.ndarray) -> np.ndarray:
+    """
+    Convert American odds to implied probabilities
+
+    Args:
+        odds: American odds (e.g. -110, +150)
+
+    Returns:
+        np.ndarray: Implied probabilities
+    """
+    odds = np.asarray(odds, dtype=np.float64)
+    favorite = odds < 0
+    probability = np.empty_like(odds)
+    # Each formula only sees its own side so neither divides by zero
+    probability[favorite] = -odds[favorite] / (100.0 - odds[favorite])
+    probability[~favorite] = 100.0 / (odds[~favorite] + 100.0)
+    return probability
+
+
+def scan_lines(
+    distribution: ProjectionDistribution,
+    player_ids: Sequence[str],
+    stats: Sequence[str],
+    lines: Sequence[float],
+    over_odds: Sequence[float],
+    under_odds: Sequence[float]
+) -> Dict[str, np.ndarray]:
+    """
+    Score a batch of prop lines against a simulated slate
+
+    Player and stat lookups, probabilities and edges are all computed as
+    array operations over the whole batch.
+
+    Args:
+        distribution: Simulated slate distributions
+        player_ids: Player ID per line
+        stats: Stat name per line
+        lines: Line value per line
+        over_odds: American odds for the over per line
+        under_odds: American odds for the under per line
+
+    Returns:
+        Dict[str, np.ndarray]: Per-line arrays for matched, row, stat_index,
+        prob_over, prob_under, over (True when the over is the better side),
+        edge and order (indices of matched lines ranked by edge, best first)
+    """
+    line_players = np.asarray(player_ids, dtype=object).astype(str)
+    line_stats = np.asarray(stats, dtype=object).astype(str)
+    n_lines = len(line_players)
+
+    # Vectorized lookups against sorted key arrays
+    slate_players = np.asarray(distribution.player_ids, dtype=str)
+    player_order = np.argsort(slate_players)
+    sorted_players = slate_players[player_order]
+    player_pos = np.clip(np.searchsorted(sorted_players, line_players), 0, max(len(sorted_players) - 1, 0))
+    player_found = (
+        sorted_players[player_pos] == line_players if len(sorted_players) else np.zeros(n_lines, dtype=bool)
+    )
+
+    stat_names = np.asarray(SIMULATED_STATS, dtype=str)
+    stat_order = np.argsort(stat_names)
+    sorted_stats = stat_names[stat_order]
+    stat_pos = np.clip(np.searchsorted(sorted_stats, line_stats), 0, len(sorted_stats) - 1)
+    stat_found = sorted_stats[stat_pos] == line_stats
+
+    matched = player_found & stat_found
+    rows = player_order[player_pos[matched]] if len(sorted_players) else np.zeros(0, dtype=int)
+    stat_index = stat_order[stat_pos[matched]]
+    line_values = np.asarray(lines, dtype=np.float64)[matched]
+
+    prob_over = distribution.prob_over_rows(rows, stat_index, line_values) if rows.size else np.zeros(0)
+    prob_under = 1.0 - prob_over
+    over_edge = prob_over - implied_probability(np.asarray(over_odds)[matched])
+    under_edge = prob_under - implied_probability(np.asarray(under_odds)[matched])
+    over = over_edge >= under_edge
+    edge = np.where(over, over_edge, under_edge)
+
+    return {
+        'matched': matched,
+        'row': rows,
+        'stat_index': stat_index,
+        'prob_over': prob_over,
+        'prob_under': prob_under,
+        'over': over,
+        'edge': edge,
+        'order': np.argsort(-edge, kind='stable'),
+    }
@@ -0,0 +1,126 @@
+"""
+Shared fixtures for the unit tests
+
+Run from the backend directory:
+
+    pytest app/tests
+
+Tests work on a small deterministic synthetic league (the same generator
+the benchmarks use) whose last day of games is today, served from the
+in-memory backend, so no Supabase project or NBA API access is needed.
+"""
+import os
+import socket
+import sys
+import threading
+import time as clock
+from datetime import date, datetime, time, timedelta
+from typing import List
+
+import pytest
+import uvicorn
+
+# Add the backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi.testclient import TestClient
+from supabase import create_client
+
+from app.api.projections import get_projection_service
+from app.data.repository import NBARepository
+from app.main import app
+from app.models.schemas import PlayerProjection
+from app.projections.algorithms import MovingAverageModel
+from app.projections.service import ProjectionService
+from app.utils import http_cache
+from benchmarks.local_backend import LocalSupabase
+from benchmarks.synthetic import SyntheticLeague, generate_league
+from loadtest.postgrest_stub import create_app
+
+# Rounds of games in the test league; the last one is played today
+GAMES_PER_TEAM = 10
+
+# Day of the schedule that falls on today
+TODAY = GAMES_PER_TEAM - 1
+
+
+@pytest.fixture(scope="session")
+def league() -> SyntheticLeague:
+    """Small synthetic season: 30 teams, 450 players, 150 games ending today"""
+    start = datetime.combine(date.today() - timedelta(days=TODAY), time(19, 30))
+    return generate_league(seed=0, games_per_team=GAMES_PER_TEAM, start=start)
+
+
+@pytest.fixture
+def backend(league: SyntheticLeague) -> LocalSupabase:
+    """Fresh in-memory backend holding the league"""
+    return LocalSupabase.from_league(league)
+
+
+@pytest.fixture(scope="session")
+def todays_projections(league: SyntheticLeague) -> List[PlayerProjection]:
+    """Moving average projections for every player in today's games"""
+    slate = league.slate(TODAY)
+    return MovingAverageModel().project_many(slate.player_ids, slate.game_ids, slate.histories, slate.is_home)
+
+
+@pytest.fixture
+def projected(backend: LocalSupabase, todays_projections: List[PlayerProjection]) -> LocalSupabase:
+    """The backend with today's projections written"""
+    for projection in todays_projections:
+        backend.write("player_projections", projection.model_dump())
+    return backend
+
+
+@pytest.fixture
+def repository(backend: LocalSupabase) -> NBARepository:
+    """Repository running against the in-memory backend"""
+    return NBARepository(client=backend)
+
+
+@pytest.fixture
+def http_repository(backend: LocalSupabase):
+    """
+    Repository using a real supabase-py client against the PostgREST stub
+
+    Requests go over HTTP and bodies are serialized by the client, as they
+    are against Supabase, rather than handed to the in-memory backend as
+    Python objects.
+    """
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(create_app(backend), log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [listener]}, daemon=True)
+    thread.start()
+    while not server.started:
+        clock.sleep(0.01)
+
+    yield NBARepository(client=create_client(f"http://127.0.0.1:{listener.getsockname()[1]}", "test-key"))
+
+    server.should_exit = True
+    thread.join()
+
+
+@pytest.fixture
+def service(repository: NBARepository) -> ProjectionService:
+    """Projection service reading and writing the in-memory backend"""
+    return ProjectionService(repository=repository, data_client=object())
+
+
+@pytest.fixture
+def client(repository: NBARepository):
+    """Test client for the app with services backed by the in-memory backend"""
+    app.dependency_overrides[get_projection_service] = lambda: ProjectionService(
+        repository=repository, data_client=object()
+    )
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_data_version():
+    """Forget the data version read by an earlier test"""
+    http_cache.record_data_version(-1)
+    http_cache._data_version["fetched_at"] = 0.0
+    yield
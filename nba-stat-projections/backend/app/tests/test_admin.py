@@ -0,0 +1,50 @@
+"""
+Tests for the admin key check
+"""
+import secrets
+
+import pytest
+
+from app.api import admin
+
+PROFILES = "/api/admin/profiles"
+
+
+@pytest.fixture
+def admin_key(monkeypatch):
+    """Configure an admin key"""
+    monkeypatch.setattr(admin, "ADMIN_API_KEY", "s3cret-key")
+    return "s3cret-key"
+
+
+def test_admin_disabled_without_key(client, monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_API_KEY", None)
+
+    assert client.get(PROFILES, headers={"X-Admin-Key": ""}).status_code == 403
+    assert client.get(PROFILES).status_code == 403
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Key": ""}, {"X-Admin-Key": "s3cret"}, {"X-Admin-Key": "s3cret-key2"}])
+def test_wrong_key_is_rejected(client, admin_key, headers):
+    response = client.get(PROFILES, headers=headers)
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Admin key required"
+
+
+def test_matching_key_is_accepted(client, admin_key):
+    assert client.get(PROFILES, headers={"X-Admin-Key": admin_key}).status_code == 200
+
+
+def test_key_is_compared_in_constant_time(client, admin_key, monkeypatch):
+    compared = []
+    original = secrets.compare_digest
+
+    def compare_digest(a, b):
+        compared.append((a, b))
+        return original(a, b)
+
+    monkeypatch.setattr(secrets, "compare_digest", compare_digest)
+    client.get(PROFILES, headers={"X-Admin-Key": "guess"})
+
+    assert compared == [(b"guess", admin_key.encode())]
@@ -0,0 +1,139 @@
+"""
+Tests for per-stat confidence scoring and the confidence filters
+"""
+import numpy as np
+import pytest
+
+from app.models.schemas import PlayerStats
+from app.projections.algorithms import MovingAverageModel, PROJECTED_STATS, consistency_confidence, stack_histories
+from app.projections.service import meets_confidence
+
+from app.tests.conftest import TODAY
+
+
+def box_score(game: int, **stats) -> PlayerStats:
+    """A box score line for game number `game` with the given stats and zeros elsewhere"""
+    values = {column: 0 for column in (
+        'points', 'assists', 'rebounds', 'steals', 'blocks', 'turnovers', 'three_pointers_made',
+        'field_goals_made', 'field_goals_attempted', 'free_throws_made', 'free_throws_attempted',
+    )}
+    values.update(stats)
+    return PlayerStats(player_id="p1", game_id=f"{game:010d}", team_id="t1", minutes=30.0, **values)
+
+
+@pytest.mark.parametrize("mean, variance, games_factor, expected", [
+    # Always zero: perfectly consistent
+    (0.0, 0.0, 1.0, 100.0),
+    # Zero mean but some spread: infinite CV, no confidence
+    (0.0, 4.0, 1.0, 0.0),
+    # No spread
+    (20.0, 0.0, 1.0, 100.0),
+    # CV of 0.25 -> 1 / 1.25
+    (20.0, 25.0, 1.0, 80.0),
+    # Half the window played halves the score
+    (20.0, 25.0, 0.5, 40.0),
+])
+def test_consistency_confidence(mean, variance, games_factor, expected):
+    confidence = consistency_confidence(np.array([[mean]]), np.array([[variance]]), np.array([games_factor]))
+    assert confidence[0, 0] == pytest.approx(expected)
+
+
+def test_consistency_confidence_is_elementwise():
+    mean = np.array([[0.0, 0.0, 10.0]])
+    variance = np.array([[0.0, 1.0, 0.0]])
+    np.testing.assert_allclose(consistency_confidence(mean, variance, np.array([1.0])), [[100.0, 0.0, 100.0]])
+
+
+def test_full_history_caps_games_factor():
+    # Twice the window of identical games: games factor is capped at 1
+    model = MovingAverageModel(window_size=5)
+    history = [box_score(game, points=20, rebounds=8, assists=5) for game in range(10)]
+
+    [projection] = model.project_many(["p1"], ["g1"], [history], [False])
+
+    assert projection.stat_confidence == {stat: 100.0 for stat in PROJECTED_STATS}
+    assert projection.confidence_score == 100.0
+
+
+def test_short_history_scales_confidence():
+    # 3 of 6 window slots played
+    model = MovingAverageModel(window_size=6)
+    history = [box_score(game, points=20, rebounds=8, assists=5) for game in range(3)]
+
+    [projection] = model.project_many(["p1"], ["g1"], [history], [False])
+
+    assert projection.stat_confidence["points"] == 50.0
+    assert projection.confidence_score == 50.0
+
+
+def test_inconsistent_stat_has_lower_confidence():
+    model = MovingAverageModel(window_size=6)
+    history = [box_score(game, points=20, rebounds=game % 2 * 10, assists=5) for game in range(6)]
+
+    [projection] = model.project_many(["p1"], ["g1"], [history], [False])
+
+    assert projection.stat_confidence["points"] == 100.0
+    assert projection.stat_confidence["rebounds"] < 60.0
+    # A stat the player never records is consistent, not unknown
+    assert projection.stat_confidence["steals"] == 100.0
+
+
+def test_meets_confidence_uses_stat_confidence():
+    model = MovingAverageModel(window_size=6)
+    history = [box_score(game, points=20, rebounds=game % 2 * 10, assists=5) for game in range(6)]
+    [projection] = model.project_many(["p1"], ["g1"], [history], [False])
+
+    assert meets_confidence(projection, 90.0, "points")
+    assert not meets_confidence(projection, 90.0, "rebounds")
+    assert meets_confidence(projection, 0.0)
+
+
+def test_meets_confidence_rejects_unknown_stat():
+    model = MovingAverageModel(window_size=6)
+    [projection] = model.project_many(["p1"], ["g1"], [[box_score(game, points=20) for game in range(6)]], [False])
+
+    with pytest.raises(ValueError):
+        meets_confidence(projection, 50.0, "dunks")
+
+
+@pytest.mark.parametrize("path", [
+    "/api/projections/games/0022400001/projections",
+    "/api/projections/today",
+])
+def test_unknown_confidence_stat_is_rejected(client, path):
+    response = client.get(path, params={"min_confidence": 50, "confidence_stat": "dunks"})
+
+    assert response.status_code == 400
+    assert "dunks" in response.json()["detail"]
+
+
+def test_batch_moments_match_each_history_alone(league):
+    slate = league.slate(TODAY)
+    model = MovingAverageModel()
+    values, counts = stack_histories(slate.histories, model.window_size)
+
+    batch = model.project_batch(values, counts, np.zeros(len(counts), dtype=bool))
+
+    for row, history in enumerate(slate.histories):
+        # The per-player weighted average over only the games the player has
+        games = min(len(history), model.window_size)
+        recent = stack_histories([history], model.window_size)[0][0, :games]
+        weights = np.linspace(1, model.recency_weight, games)
+        mean = np.average(recent, axis=0, weights=weights)
+        variance = np.average((recent - mean) ** 2, axis=0, weights=weights)
+
+        np.testing.assert_allclose(batch.mean[row], mean, rtol=1e-12)
+        np.testing.assert_allclose(batch.variance[row], variance, rtol=1e-12, atol=1e-9)
+
+
+def test_batch_moments_match_one_at_a_time(league):
+    slate = league.slate(TODAY)
+    model = MovingAverageModel()
+    is_home = np.asarray(slate.is_home)
+
+    batch = model.project_batch(*stack_histories(slate.histories, model.window_size), is_home)
+    for row, history in enumerate(slate.histories):
+        alone = model.project_batch(*stack_histories([history], model.window_size), is_home[row:row + 1])
+
+        np.testing.assert_allclose(batch.mean[row], alone.mean[0], rtol=1e-12)
+        np.testing.assert_allclose(batch.variance[row], alone.variance[0], rtol=1e-12, atol=1e-12)
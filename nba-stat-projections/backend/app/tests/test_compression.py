@@ -0,0 +1,167 @@
+"""
+Tests for the brotli/gzip response compression middleware
+"""
+import asyncio
+import gzip
+import zlib
+from typing import Dict, List, Optional
+
+import brotli
+import pytest
+
+from app.utils import compression
+from app.utils.compression import CompressionMiddleware, choose_encoding
+
+# Repetitive JSON, well above the size threshold
+BODY = b'{"player_id":"1630000","projected_points":21.4}\n' * 200
+
+
+def app_sending(body_chunks: List[bytes], headers: Optional[Dict[str, str]] = None):
+    """ASGI app that sends the body in the given chunks"""
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": raw_headers})
+        for i, chunk in enumerate(body_chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(body_chunks) - 1})
+
+    return app
+
+
+def run(app, accept_encoding: str = "gzip", minimum_size: int = 1024):
+    """Send one request through the middleware and capture the response messages"""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    asyncio.run(CompressionMiddleware(app, minimum_size=minimum_size)(scope, receive, send))
+
+    start, *bodies = messages
+    headers = {name.decode(): value.decode() for name, value in start["headers"]}
+    return headers, bodies
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("GZip", "gzip"),
+    ("deflate", None),
+    ("", None),
+    ("identity", None),
+    # Explicitly refused encodings are never used
+    ("br;q=0, gzip", "gzip"),
+    ("br; q=0.0, gzip;q=0", None),
+    # Higher quality wins; ties prefer brotli
+    ("br;q=0.5, gzip", "gzip"),
+    ("gzip;q=0.8, br;q=0.8", "br"),
+    ("gzip;q=0.2, br;q=0.9", "br"),
+    # The wildcard covers encodings the header does not name
+    ("*", "br"),
+    ("br;q=0, *;q=0.5", "gzip"),
+    ("gzip;q=bogus", None),
+])
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+def test_gzip_only_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+    assert choose_encoding("br, gzip") == "gzip"
+    assert choose_encoding("br") is None
+
+
+@pytest.mark.parametrize("encoding, decompress", [("gzip", gzip.decompress), ("br", brotli.decompress)])
+def test_compresses_single_body(encoding, decompress):
+    app = app_sending([BODY], {"Content-Type": "application/json", "Content-Length": str(len(BODY))})
+    headers, [body] = run(app, encoding)
+
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["content-length"] == str(len(body["body"]))
+    assert len(body["body"]) < len(BODY) / 10
+    assert decompress(body["body"]) == BODY
+
+
+def test_skips_small_bodies():
+    small = b'{"ok":true}'
+    app = app_sending([small], {"Content-Type": "application/json", "Content-Length": str(len(small))})
+    headers, [body] = run(app)
+
+    assert "content-encoding" not in headers
+    assert headers["content-length"] == str(len(small))
+    assert body["body"] == small
+
+
+def test_skips_when_client_accepts_no_supported_encoding():
+    headers, [body] = run(app_sending([BODY], {"Content-Type": "application/json"}), "identity")
+
+    assert "content-encoding" not in headers
+    assert body["body"] == BODY
+
+
+@pytest.mark.parametrize("headers", [
+    {"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    {"Content-Type": "image/png"},
+    {"Content-Type": "application/gzip"},
+    {"Content-Type": "text/event-stream"},
+])
+def test_skips_encoded_and_incompressible_bodies(headers):
+    response_headers, bodies = run(app_sending([BODY[:2000], BODY[2000:]], headers))
+
+    assert response_headers.get("content-encoding") == headers.get("Content-Encoding")
+    assert [body["body"] for body in bodies] == [BODY[:2000], BODY[2000:]]
+
+
+@pytest.mark.parametrize("encoding, decompressor", [
+    ("gzip", lambda: zlib.decompressobj(16 + zlib.MAX_WBITS)),
+    ("br", brotli.Decompressor),
+])
+def test_streams_chunk_by_chunk(encoding, decompressor):
+    rows = [b'{"row":%d,"projected_points":21.4}\n' % i for i in range(5)]
+    app = app_sending(rows, {"Content-Type": "application/x-ndjson", "Content-Length": "999"})
+    headers, bodies = run(app, encoding)
+
+    # Streams lose their Content-Length and keep one message per chunk
+    assert headers["content-encoding"] == encoding
+    assert "content-length" not in headers
+    assert [body.get("more_body", False) for body in bodies] == [True] * 4 + [False]
+
+    # Each flushed chunk decodes to exactly the row it carried
+    stream = decompressor()
+    decode = stream.decompress if encoding == "gzip" else stream.process
+    assert [decode(body["body"]) for body in bodies] == rows
+
+
+def test_small_first_chunk_of_a_stream_is_still_compressed():
+    rows = [b"a" * 10, b"b" * 5000]
+    headers, bodies = run(app_sending(rows, {"Content-Type": "application/x-ndjson"}))
+
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(b"".join(body["body"] for body in bodies)) == b"".join(rows)
+
+
+def test_existing_vary_is_extended_once():
+    headers, _ = run(app_sending([BODY], {"Content-Type": "application/json", "Vary": "Accept"}))
+    assert headers["vary"] == "Accept, Accept-Encoding"
+
+    headers, _ = run(app_sending([BODY], {"Content-Type": "application/json", "Vary": "Accept, Accept-Encoding"}))
+    assert headers["vary"] == "Accept, Accept-Encoding"
+
+
+def test_compresses_api_responses(client, projected):
+    response = client.get("/api/projections/today", headers={"Accept-Encoding": "br"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "br"
+    assert len(response.json()) == 450
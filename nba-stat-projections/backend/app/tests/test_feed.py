@@ -0,0 +1,253 @@
+"""
+Tests for projection diffs, subscriber queues and the SSE stream
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+
+from app.api.responses import _sse_messages
+from app.projections import service as service_module
+from app.projections.feed import ProjectionFeed
+from app.utils.http_cache import DATA_VERSION_KEY
+from app.utils.pubsub import Broker
+
+
+def regenerated(projection, **changes):
+    """The projection rewritten later, with some values changed"""
+    return projection.model_copy(update={"created_at": projection.created_at.replace(year=2099), **changes})
+
+
+@pytest.fixture
+def feed(monkeypatch) -> ProjectionFeed:
+    """A fresh feed used by the service"""
+    feed = ProjectionFeed(poll_seconds=60)
+    monkeypatch.setattr(service_module, "projection_feed", feed)
+    return feed
+
+
+def test_first_diff_is_full(todays_projections):
+    feed = ProjectionFeed()
+    projection = todays_projections[0]
+
+    [diff] = feed.diff([projection])
+
+    assert diff["full"] is True
+    assert (diff["player_id"], diff["game_id"], diff["model_version"]) == (
+        projection.player_id, projection.game_id, projection.model_version
+    )
+    assert diff["changes"]["projected_points"] == projection.projected_points
+    assert "created_at" not in diff["changes"]
+
+
+def test_later_diff_carries_only_changes(todays_projections):
+    feed = ProjectionFeed()
+    projection = todays_projections[0]
+    feed.diff([projection])
+
+    [diff] = feed.diff([regenerated(projection, projected_points=projection.projected_points + 2)])
+
+    assert diff["full"] is False
+    assert diff["changes"] == {"projected_points": projection.projected_points + 2}
+    assert diff["created_at"].startswith("2099")
+
+
+def test_unchanged_regeneration_publishes_nothing(todays_projections):
+    feed = ProjectionFeed()
+    subscription = feed.broker.subscribe()
+    assert feed.publish_projections(todays_projections[:10]) == 10
+
+    assert feed.publish_projections([regenerated(p) for p in todays_projections[:10]]) == 0
+    assert subscription.queue.qsize() == 1
+
+
+def test_forgotten_projection_is_resent_in_full(todays_projections):
+    feed = ProjectionFeed(max_tracked=2)
+    first, *others = todays_projections[:3]
+    feed.diff([first, *others])
+
+    [diff] = feed.diff([regenerated(first)])
+
+    assert diff["full"] is True
+
+
+def test_slow_subscriber_overflows_alone():
+    async def scenario():
+        broker = Broker(queue_size=2)
+        slow, fast = broker.subscribe(), broker.subscribe()
+        received = []
+        for event in range(3):
+            broker.publish(event)
+            received.append(await fast.get())
+        return slow, fast, received
+
+    slow, fast, received = asyncio.run(scenario())
+
+    assert received == [0, 1, 2]
+    assert not fast.overflowed
+    # The slow subscriber lost its backlog rather than blocking the publisher
+    assert slow.overflowed
+    assert slow.queue.empty()
+
+
+def test_closed_subscription_receives_nothing():
+    broker = Broker()
+    subscription = broker.subscribe()
+    subscription.close()
+
+    assert broker.publish("event") == 0
+    assert subscription.queue.empty()
+
+
+def test_stream_yields_diffs_then_keepalives(service, feed, projected, todays_projections):
+    game_id = todays_projections[0].game_id
+
+    async def scenario():
+        stream = service.stream_projection_changes(game_id=game_id, keepalive_seconds=0.05)
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        feed.publish_projections(todays_projections)
+        events = [await first]
+
+        # Same values again: only a heartbeat
+        feed.publish_projections([regenerated(p) for p in todays_projections])
+        events.append(await stream.__anext__())
+        await stream.aclose()
+        return events
+
+    diffs, keepalive = asyncio.run(scenario())
+
+    assert {d["game_id"] for d in diffs["diffs"]} == {game_id}
+    assert len(diffs["diffs"]) == 30
+    assert all(d["full"] for d in diffs["diffs"])
+    assert keepalive is None
+    assert feed.broker.subscriber_count == 0
+
+
+def test_stream_tells_slow_subscriber_to_resync(service, feed, projected, todays_projections):
+    async def scenario():
+        stream = service.stream_projection_changes(keepalive_seconds=0.05)
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        for points in range(feed.broker.queue_size + 2):
+            feed.publish_projections([regenerated(todays_projections[0], projected_points=float(points))])
+        events = [await first, await stream.__anext__()]
+        await stream.aclose()
+        return events
+
+    first, second = asyncio.run(scenario())
+
+    assert first == {"resync": True}
+    # The backlog was dropped, so nothing else is pending
+    assert second is None
+
+
+def watch(repository, writes):
+    """
+    Run the feed's watcher while other processes write
+
+    Args:
+        repository: Repository the watcher reads
+        writes: Callables that each write rows and bump the data version
+
+    Returns:
+        List[dict]: Diffs the watcher published, in order
+    """
+    feed = ProjectionFeed(poll_seconds=0.01)
+
+    async def scenario():
+        subscription = feed.subscribe(repository)
+        # The first poll records the data version and newest write
+        await asyncio.sleep(0.05)
+        diffs = []
+        for write in writes:
+            write()
+            await asyncio.sleep(0.05)
+            while not subscription.queue.empty():
+                diffs.extend(subscription.queue.get_nowait())
+        subscription.close()
+        await asyncio.sleep(0.02)
+        return diffs
+
+    return asyncio.run(scenario())
+
+
+def write_elsewhere(backend, projections, written_at=None):
+    """Write projections as another process would, optionally back-dating the database stamp"""
+    def write():
+        for projection in projections:
+            row = backend.write("player_projections", projection.model_dump(), ["player_id", "game_id", "model_version"])
+            if written_at is not None:
+                row["written_at"] = written_at()
+        backend.bump_version(DATA_VERSION_KEY)
+    return write
+
+
+def test_watcher_publishes_first_writes_to_an_empty_table(repository, backend, todays_projections):
+    diffs = watch(repository, [write_elsewhere(backend, todays_projections[:30])])
+
+    assert len(diffs) == 30
+    assert all(diff["full"] for diff in diffs)
+
+
+def test_watcher_publishes_each_change_once(repository, projected, todays_projections):
+    projection = todays_projections[0]
+
+    diffs = watch(repository, [
+        write_elsewhere(projected, [regenerated(projection, projected_points=99.0)]),
+        # Rewritten with the same values, then changed again
+        write_elsewhere(projected, [regenerated(projection, projected_points=99.0)]),
+        write_elsewhere(projected, [regenerated(projection, projected_points=97.0)]),
+    ])
+
+    assert [(diff["player_id"], diff["full"], diff["changes"]["projected_points"]) for diff in diffs] == [
+        (projection.player_id, False, 99.0),
+        (projection.player_id, False, 97.0),
+    ]
+
+
+def test_watcher_ignores_writer_clocks(repository, projected, todays_projections):
+    # A writer whose clock is a day behind still gets a current database stamp
+    behind = regenerated(todays_projections[0], projected_points=99.0)
+    behind = behind.model_copy(update={"created_at": datetime.now() - timedelta(days=1)})
+
+    diffs = watch(repository, [write_elsewhere(projected, [behind])])
+
+    assert [(diff["player_id"], diff["changes"]["projected_points"]) for diff in diffs] == [(behind.player_id, 99.0)]
+
+
+def test_watcher_picks_up_rows_committed_after_newer_ones(repository, projected, todays_projections):
+    newer = regenerated(todays_projections[0], projected_points=99.0)
+    late = regenerated(todays_projections[1], projected_points=98.0)
+
+    def stamped_before_newer():
+        # Stamped before the newer row, but only visible after it was read
+        [row] = [row for row in projected.tables["player_projections"] if row["player_id"] == newer.player_id]
+        return (datetime.fromisoformat(row["written_at"]) - timedelta(seconds=1)).isoformat(timespec="microseconds")
+
+    diffs = watch(repository, [
+        write_elsewhere(projected, [newer]),
+        write_elsewhere(projected, [late], written_at=stamped_before_newer),
+    ])
+
+    assert [(diff["player_id"], diff["changes"]["projected_points"]) for diff in diffs] == [
+        (newer.player_id, 99.0),
+        (late.player_id, 98.0),
+    ]
+
+
+def test_sse_framing():
+    async def events():
+        for event in ({"diffs": [{"player_id": "1"}]}, None, {"resync": True}):
+            yield event
+
+    async def frames():
+        return [frame async for frame in _sse_messages(events())]
+
+    assert asyncio.run(frames()) == [
+        b"retry: 5000\n\n",
+        b"id: 1\nevent: projections\ndata: " + orjson.dumps([{"player_id": "1"}]) + b"\n\n",
+        b": keepalive\n\n",
+        b"id: 2\nevent: resync\ndata: {}\n\n",
+    ]
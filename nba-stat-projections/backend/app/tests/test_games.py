@@ -0,0 +1,45 @@
+"""
+Tests for game paging and filters
+"""
+import asyncio
+
+import pytest
+
+GAMES = "/api/projections/games"
+
+
+def test_team_filter(client, league):
+    team_id = league.teams[0].id
+
+    games = client.get(GAMES, params={"team_id": team_id, "limit": 100}).json()
+
+    expected = sorted(
+        game.id for game in league.games if team_id in (game.home_team_id, game.visitor_team_id)
+    )
+    assert [game["id"] for game in games] == expected
+
+
+@pytest.mark.parametrize("team_id", [
+    "1610612747,home_team_id.neq.0",
+    "1610612747),id.gt.(0",
+    "1610612747\n",
+    "abc",
+    "",
+])
+def test_invalid_team_id_is_rejected(client, backend, team_id):
+    queries = backend.query_count
+
+    response = client.get(GAMES, params={"team_id": team_id})
+
+    assert response.status_code == 400
+    assert "team ID" in response.json()["detail"]
+    assert backend.query_count == queries
+
+
+def test_repository_rejects_invalid_team_id(repository, backend):
+    queries = backend.query_count
+
+    with pytest.raises(ValueError):
+        asyncio.run(repository.get_games_page(team_id="1,home_team_id.neq.0"))
+
+    assert backend.query_count == queries
@@ -0,0 +1,130 @@
+"""
+Tests for data-version ETags and conditional GETs
+"""
+import pytest
+from starlette.requests import Request
+
+from app.utils import http_cache
+from app.utils.http_cache import _matches, make_etag
+
+TODAY = "/api/projections/today"
+
+
+def request(path: str, query: str = "", accept: str = "application/json") -> Request:
+    """A bare GET request"""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(b"accept", accept.encode())],
+    })
+
+
+def vary(response) -> set:
+    """Header names listed in a response's Vary header"""
+    return {token.strip() for token in response.headers.get("vary", "").split(",")}
+
+
+@pytest.fixture
+def no_version_ttl(monkeypatch):
+    """Re-read the data version on every request"""
+    monkeypatch.setattr(http_cache, "DATA_VERSION_TTL_SECONDS", 0)
+
+
+@pytest.mark.parametrize("if_none_match, matched", [
+    ('W/"7-abc"', True),
+    # Weak comparison ignores W/ on either side
+    ('"7-abc"', True),
+    ('"1-abc", W/"7-abc"', True),
+    ("*", True),
+    ('W/"8-abc"', False),
+    ('W/"7-abd"', False),
+    ("", False),
+])
+def test_matches(if_none_match, matched):
+    assert _matches(if_none_match, 'W/"7-abc"') is matched
+
+
+def test_make_etag_varies_with_version_and_request():
+    etag = make_etag(7, request(TODAY))
+
+    assert etag.startswith('W/"7-')
+    assert make_etag(7, request(TODAY)) == etag
+    assert make_etag(8, request(TODAY)) != etag
+    assert make_etag(7, request(TODAY, "team_id=1")) != etag
+    assert make_etag(7, request(TODAY, accept="application/x-ndjson")) != etag
+    assert make_etag(7, request("/api/projections/stream")) != etag
+
+
+def test_response_carries_etag(client):
+    response = client.get(TODAY)
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["cache-control"] == http_cache.CACHE_CONTROL
+    assert {"Accept", "Accept-Encoding"} <= vary(response)
+
+
+@pytest.mark.parametrize("headers", [
+    {"Accept": "application/x-ndjson"},
+    {"Accept-Encoding": "gzip"},
+    {"Accept-Encoding": "identity"},
+])
+def test_every_representation_varies_on_accept_and_encoding(client, projected, headers):
+    response = client.get(TODAY, headers=headers)
+
+    assert response.status_code == 200
+    tokens = [token.strip() for token in response.headers["vary"].split(",")]
+    assert {"Accept", "Accept-Encoding"} <= set(tokens)
+    assert len(tokens) == len(set(tokens))
+
+
+@pytest.mark.parametrize("form", [lambda etag: etag, lambda etag: etag[2:], lambda etag: f'"other", {etag}'])
+def test_matching_if_none_match_is_not_modified(client, form):
+    etag = client.get(TODAY).headers["etag"]
+
+    response = client.get(TODAY, headers={"If-None-Match": form(etag)})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert {"Accept", "Accept-Encoding"} <= vary(response)
+
+
+def test_stale_if_none_match_gets_full_response(client):
+    response = client.get(TODAY, headers={"If-None-Match": 'W/"0-00000000"'})
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_etag_changes_with_data_version(client, backend, no_version_ttl):
+    etag = client.get(TODAY).headers["etag"]
+
+    backend.bump_version(http_cache.DATA_VERSION_KEY)
+    response = client.get(TODAY, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert client.get(TODAY, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+
+def test_etag_is_cached_for_the_ttl(client, backend):
+    etag = client.get(TODAY).headers["etag"]
+
+    # Within the TTL the pod keeps its last read of the version
+    backend.bump_version(http_cache.DATA_VERSION_KEY)
+
+    assert client.get(TODAY, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_unreadable_version_skips_etag(client, repository, monkeypatch, no_version_ttl):
+    async def unavailable(key=http_cache.DATA_VERSION_KEY):
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(repository, "get_data_version", unavailable)
+    response = client.get(TODAY, headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
@@ -0,0 +1,206 @@
+"""
+Tests for incrementally maintained stat leaderboards
+"""
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.models.schemas import Game
+from app.projections import service as service_module
+from app.projections.feed import ProjectionFeed
+from app.projections.leaderboards import Leaderboards, game_day
+from app.utils import http_cache
+
+from app.tests.conftest import TODAY
+
+
+@pytest.fixture
+def boards(monkeypatch) -> Leaderboards:
+    """Fresh leaderboards and feed used by the service"""
+    boards = Leaderboards()
+    monkeypatch.setattr(service_module, "leaderboards", boards)
+    monkeypatch.setattr(service_module, "projection_feed", ProjectionFeed())
+    return boards
+
+
+@pytest.fixture
+def db_games(repository):
+    """Today's games as read from the database, with string game_date"""
+    games = asyncio.run(repository.get_games(date.today()))
+    assert games and all(isinstance(game.game_date, str) for game in games)
+    return games
+
+
+def ranked_points(projections, limit):
+    """Brute-force top projected points"""
+    return sorted((p.projected_points for p in projections), reverse=True)[:limit]
+
+
+def game(game_date) -> Game:
+    return Game(
+        id="g", season_id="22024", season_type="Regular Season", game_date=game_date,
+        home_team_id="h", visitor_team_id="v", status="Scheduled"
+    )
+
+
+@pytest.mark.parametrize("game_date, expected", [
+    (datetime(2025, 1, 5, 19, 30), date(2025, 1, 5)),
+    ("2025-01-05T19:30:00", date(2025, 1, 5)),
+    ("2025-01-05T19:30:00+00:00", date(2025, 1, 5)),
+    ("2025-01-05T19:30:00Z", date(2025, 1, 5)),
+    # Dates are taken in UTC, like the repository's date filter
+    ("2025-01-05T19:30:00-05:00", date(2025, 1, 6)),
+    (datetime(2025, 1, 5, 23, 30, tzinfo=timezone(timedelta(hours=-5))), date(2025, 1, 6)),
+])
+def test_game_day(game_date, expected):
+    assert game_day(game(game_date)) == expected
+
+
+def test_apply_tracks_database_games(db_games, todays_projections):
+    boards = Leaderboards()
+    boards.reset(date.today(), [])
+
+    applied = boards.apply(todays_projections, db_games)
+
+    assert applied == len(todays_projections)
+    version = todays_projections[0].model_version
+    assert [value for _, value in boards.top("points", [version], 5)] == ranked_points(todays_projections, 5)
+
+
+def test_generating_database_games_updates_boards(service, repository, boards, db_games):
+    asyncio.run(boards.refresh(repository))
+    assert len(boards) == 0
+
+    projections = asyncio.run(service._generate_for_games(db_games[:2]))
+
+    assert len(projections) == 60
+    assert len(boards) == 60
+    top = boards.top("points", [service.model_version], 3)
+    assert [value for _, value in top] == ranked_points(projections, 3)
+
+
+def test_admin_generation_updates_boards(service, repository, boards, db_games):
+    asyncio.run(boards.refresh(repository))
+
+    projections = asyncio.run(service.generate_game_projections(db_games[0].id))
+
+    assert {p.player_id for p, _ in boards.top("rebounds", [service.model_version], 100)} == {
+        p.player_id for p in projections
+    }
+
+
+def test_single_projection_updates_boards(service, repository, boards, league, db_games):
+    asyncio.run(boards.refresh(repository))
+    player = next(p for p in league.players if p.team_id == db_games[0].home_team_id)
+
+    projection = asyncio.run(service.generate_projection(player.id, db_games[0].id))
+
+    assert boards.top("points", [service.model_version], 1) == [(projection, projection.projected_points)]
+
+
+@pytest.fixture
+def no_version_ttl(monkeypatch):
+    """Re-read the data version on every refresh"""
+    monkeypatch.setattr(http_cache, "DATA_VERSION_TTL_SECONDS", 0)
+
+
+def write_elsewhere(backend, projection, written_at=None):
+    """Write a projection as another process would, optionally back-dating the database stamp"""
+    row = backend.write("player_projections", projection.model_dump(), ["player_id", "game_id", "model_version"])
+    if written_at is not None:
+        row["written_at"] = written_at.isoformat(timespec="microseconds")
+    backend.bump_version(http_cache.DATA_VERSION_KEY)
+    return row
+
+
+def top_points(boards, projections, limit):
+    """Player IDs and points of the top projections"""
+    return [(p.player_id, value) for p, value in boards.top("points", [projections[0].model_version], limit)]
+
+
+def test_refresh_catches_up_external_writes_for_new_games(
+    repository, backend, boards, league, todays_projections, no_version_ttl
+):
+    asyncio.run(boards.refresh(repository))
+
+    # Another process schedules a game for today and projects it
+    template = league.games_on(TODAY)[0]
+    added = template.model_copy(update={"id": "0029900001"})
+    backend.write("games", added.model_dump())
+    later = datetime.now() + timedelta(seconds=1)
+    for projection in todays_projections:
+        if projection.game_id == template.id:
+            backend.write("player_projections", projection.model_copy(
+                update={"game_id": added.id, "projected_points": 99.0, "created_at": later}
+            ).model_dump())
+    backend.bump_version(http_cache.DATA_VERSION_KEY)
+
+    asyncio.run(boards.refresh(repository))
+
+    top = boards.top("points", [todays_projections[0].model_version], 30)
+    assert len(top) == 30
+    assert {projection.game_id for projection, _ in top} == {added.id}
+
+
+def test_refresh_ignores_writer_clocks(repository, projected, boards, todays_projections, no_version_ttl):
+    asyncio.run(boards.refresh(repository))
+    behind = todays_projections[5].model_copy(
+        update={"projected_points": 99.0, "created_at": datetime.now() - timedelta(days=1)}
+    )
+
+    write_elsewhere(projected, behind)
+    asyncio.run(boards.refresh(repository))
+
+    assert top_points(boards, todays_projections, 1) == [(behind.player_id, 99.0)]
+
+
+def test_refresh_picks_up_rows_committed_after_newer_ones(
+    repository, projected, boards, todays_projections, no_version_ttl
+):
+    asyncio.run(boards.refresh(repository))
+    newer = write_elsewhere(projected, todays_projections[5].model_copy(update={"projected_points": 99.0}))
+    asyncio.run(boards.refresh(repository))
+
+    # Stamped before the newer row, but only visible after it was read
+    stamped = datetime.fromisoformat(newer["written_at"]) - timedelta(seconds=1)
+    write_elsewhere(projected, todays_projections[6].model_copy(update={"projected_points": 98.0}), stamped)
+    asyncio.run(boards.refresh(repository))
+
+    assert top_points(boards, todays_projections, 2) == [
+        (todays_projections[5].player_id, 99.0),
+        (todays_projections[6].player_id, 98.0),
+    ]
+
+
+def test_refresh_rebuilds_when_no_new_write_is_visible(
+    repository, projected, boards, todays_projections, no_version_ttl
+):
+    asyncio.run(boards.refresh(repository))
+    newest = asyncio.run(repository.get_latest_projection_write())
+
+    # Committed so late that it falls before the catch-up's lookback
+    write_elsewhere(
+        projected, todays_projections[5].model_copy(update={"projected_points": 99.0}), newest - timedelta(hours=1)
+    )
+    asyncio.run(boards.refresh(repository))
+
+    assert top_points(boards, todays_projections, 1) == [(todays_projections[5].player_id, 99.0)]
+    assert len(boards) == len(todays_projections)
+
+
+def test_leaderboard_endpoint(client, projected, todays_projections, boards):
+    response = client.get("/api/projections/leaderboards/points", params={"limit": 5})
+
+    assert response.status_code == 200
+    entries = response.json()
+    assert [entry["rank"] for entry in entries] == [1, 2, 3, 4, 5]
+    assert [entry["value"] for entry in entries] == ranked_points(todays_projections, 5)
+    assert all(entry["projection"]["projected_points"] == entry["value"] for entry in entries)
+
+
+def test_leaderboard_endpoint_rejects_unknown_stat(client, boards):
+    response = client.get("/api/projections/leaderboards/dunks")
+
+    assert response.status_code == 404
+    assert "points" in response.json()["detail"]
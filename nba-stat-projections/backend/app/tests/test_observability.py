@@ -0,0 +1,105 @@
+"""
+Tests for the Prometheus metrics and Server-Timing headers
+"""
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.tracing import ServerTimingMiddleware, span
+
+GAMES = "/api/projections/games"
+# One Server-Timing entry: name;dur=12.34 with an optional ;desc="N calls"
+TIMING_ENTRY = re.compile(r'(?P<name>[\w-]+);dur=(?P<dur>\d+\.\d{2})(;desc="(?P<calls>\d+) calls")?')
+
+
+def sample(exposition: str, metric: str, **labels) -> float:
+    """Value of the first sample of a metric whose labels include the given ones"""
+    for line in exposition.splitlines():
+        if not line.startswith(metric + "{"):
+            continue
+        if all(f'{name}="{value}"' in line for name, value in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def timings(header: str) -> dict:
+    """Parse a Server-Timing header into {name: (duration_ms, calls)}"""
+    entries = {}
+    for entry in header.split(", "):
+        match = TIMING_ENTRY.fullmatch(entry)
+        assert match, entry
+        entries[match["name"]] = (float(match["dur"]), int(match["calls"] or 1))
+    return entries
+
+
+@pytest.fixture
+def traced_client(client):
+    """Test client for the app wrapped in Server-Timing, as when SERVER_TIMING is enabled"""
+    with TestClient(ServerTimingMiddleware(app, log=False)) as traced:
+        yield traced
+
+
+def test_metrics_exposition_after_request(client, backend):
+    route = GAMES + "/{game_id}/projections"
+    before = client.get("/metrics").text
+    queries = backend.query_count
+
+    game_id = client.get(GAMES).json()[0]["id"]
+    assert client.get(f"{GAMES}/{game_id}/projections").status_code == 200
+    assert backend.query_count > queries
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    after = response.text
+
+    # Requests are labelled by route template, not the raw path
+    count = "http_request_duration_seconds_count"
+    assert sample(after, count, method="GET", route=route, status="200") == (
+        sample(before, count, method="GET", route=route, status="200") + 1
+    )
+    assert game_id not in after
+    assert sample(after, "db_query_duration_seconds_count", table="games") > (
+        sample(before, "db_query_duration_seconds_count", table="games")
+    )
+
+
+def test_unmatched_routes_share_one_label(client):
+    client.get("/no/such/path")
+
+    after = client.get("/metrics").text
+
+    assert sample(after, "http_request_duration_seconds_count", route="unmatched", status="404") >= 1
+    assert "/no/such/path" not in after
+
+
+def test_server_timing_header(traced_client, league):
+    response = traced_client.get(GAMES, params={"team_id": league.teams[0].id})
+
+    assert response.status_code == 200
+    assert response.headers["timing-allow-origin"] == "*"
+    entries = timings(response.headers["server-timing"])
+    assert "db-games" in entries
+    assert list(entries)[-1] == "total"
+    assert entries["total"][0] >= entries["db-games"][0]
+
+
+def test_server_timing_counts_repeated_spans():
+    async def endpoint(scope, receive, send):
+        for _ in range(3):
+            with span("db-players"):
+                pass
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    response = TestClient(ServerTimingMiddleware(endpoint, log=False)).get("/")
+
+    entries = timings(response.headers["server-timing"])
+    assert set(entries) == {"db-players", "total"}
+    assert entries["db-players"][1] == 3
+
+
+def test_spans_outside_a_request_share_a_no_op():
+    assert span("db-games") is span("db-players")
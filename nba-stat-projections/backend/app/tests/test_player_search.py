@@ -0,0 +1,181 @@
+"""
+Tests for the in-memory player name search index
+"""
+import asyncio
+from typing import Optional
+
+import pytest
+
+from app.data.player_search import (
+    SCORE_EXACT,
+    SCORE_FUZZY,
+    SCORE_NAME_PREFIX,
+    SCORE_TOKEN_PREFIX,
+    PlayerSearchIndex,
+    normalize_name,
+)
+from app.models.schemas import Player
+from app.projections import service as service_module
+from app.utils.http_cache import DATA_VERSION_KEY, ROSTER_VERSION_KEY
+
+
+def make_player(player_id: str, full_name: str, is_active: bool = True, team_id: Optional[str] = "1") -> Player:
+    first_name, _, last_name = full_name.partition(" ")
+    return Player(
+        id=player_id,
+        first_name=first_name,
+        last_name=last_name,
+        full_name=full_name,
+        is_active=is_active,
+        team_id=team_id,
+    )
+
+
+PLAYERS = [
+    make_player("1", "LeBron James"),
+    make_player("2", "Bronny James", team_id="2"),
+    make_player("3", "James Harden"),
+    make_player("4", "Nikola Jokić"),
+    make_player("5", "Giannis Antetokounmpo"),
+    make_player("6", "James Jones", is_active=False),
+    make_player("7", "Victor Wembanyama"),
+]
+
+
+@pytest.fixture
+def index() -> PlayerSearchIndex:
+    index = PlayerSearchIndex(check_seconds=0)
+    index.build(PLAYERS)
+    return index
+
+
+def names(matches):
+    return [player.full_name for player, _ in matches]
+
+
+def versions(backend):
+    return {row["key"]: row["version"] for row in backend.tables["data_versions"]}
+
+
+def test_normalize_name_folds_accents_and_punctuation():
+    assert normalize_name("Nikola Jokić") == "nikola jokic"
+    assert normalize_name("  Shai Gilgeous-Alexander ") == "shai gilgeous alexander"
+
+
+def test_prefix_matches_rank_exact_then_name_then_token(index):
+    matches = index.search("james")
+
+    # Name prefixes first, active before inactive, then shorter and earlier names
+    assert names(matches) == ["James Harden", "James Jones", "Bronny James", "LeBron James"]
+    assert [score for _, score in matches] == [SCORE_NAME_PREFIX] * 2 + [SCORE_TOKEN_PREFIX] * 2
+    assert index.search("lebron james") == [(PLAYERS[0], SCORE_EXACT)]
+
+
+def test_every_query_word_must_start_a_name_word(index):
+    assert names(index.search("leb jam")) == ["LeBron James"]
+    assert names(index.search("jam har")) == ["James Harden"]
+
+
+def test_accents_are_folded(index):
+    assert names(index.search("jokic")) == ["Nikola Jokić"]
+
+
+def test_trigrams_match_typos_only_without_prefix_matches(index):
+    [(player, score)] = index.search("antetokumpo")
+    assert player.full_name == "Giannis Antetokounmpo"
+    assert 0 < score < SCORE_FUZZY
+
+    # "wemby" prefixes nothing, so partial names fall back to trigrams too
+    assert names(index.search("wemby")) == ["Victor Wembanyama"]
+    assert index.search("zzzz") == []
+
+
+def test_filters_and_limit(index):
+    assert names(index.search("james", active_only=True)) == ["James Harden", "Bronny James", "LeBron James"]
+    assert names(index.search("james", team_id="2")) == ["Bronny James"]
+    assert len(index.search("james", limit=2)) == 2
+
+
+def test_upsert_replaces_the_indexed_name(index):
+    index.upsert(make_player("3", "Jimmy Butler"))
+
+    assert "James Harden" not in names(index.search("james"))
+    assert names(index.search("butler")) == ["Jimmy Butler"]
+    assert len(index) == len(PLAYERS)
+
+
+def test_refresh_rebuilds_only_when_the_roster_version_moves(repository, backend, league):
+    index = PlayerSearchIndex(check_seconds=0)
+    asyncio.run(index.refresh(repository))
+    assert len(index) == len(league.players)
+    built_at = index.version
+
+    queries = backend.query_count
+    asyncio.run(index.refresh(repository))
+    # Only the version was read
+    assert backend.query_count == queries + 1
+    assert index.version == built_at
+
+    renamed = league.players[0].model_copy(update={"full_name": "Zebulon Quux"})
+    backend.write("players", renamed.model_dump(), conflict=["id"])
+    backend.bump_version(ROSTER_VERSION_KEY)
+    asyncio.run(index.refresh(repository))
+
+    assert index.version == built_at + 1
+    assert names(index.search("quux")) == ["Zebulon Quux"]
+
+
+def test_refresh_waits_for_the_check_interval(repository, backend):
+    index = PlayerSearchIndex(check_seconds=3600)
+    asyncio.run(index.refresh(repository))
+    queries = backend.query_count
+
+    backend.bump_version(ROSTER_VERSION_KEY)
+    asyncio.run(index.refresh(repository))
+
+    assert backend.query_count == queries
+
+
+def test_player_writes_bump_each_version_once(repository, backend, league):
+    before = versions(backend)
+    queries = backend.query_count
+
+    written, roster_version = asyncio.run(repository.update_player(
+        league.players[0].model_copy(update={"full_name": "Zebulon Quux"})
+    ))
+
+    after = versions(backend)
+    assert written.full_name == "Zebulon Quux"
+    assert roster_version == after[ROSTER_VERSION_KEY] == before.get(ROSTER_VERSION_KEY, 0) + 1
+    assert after[DATA_VERSION_KEY] == before[DATA_VERSION_KEY] + 1
+    # One update and one version call
+    assert backend.query_count == queries + 2
+
+
+def test_service_writes_update_the_index_without_a_rebuild(monkeypatch, service, repository, backend, league):
+    index = PlayerSearchIndex(check_seconds=0)
+    monkeypatch.setattr(service_module, "player_index", index)
+    asyncio.run(index.refresh(repository))
+
+    created = asyncio.run(service.create_player(make_player("9999999", "Zebulon Quux", team_id=league.teams[0].id)))
+
+    assert names(index.search("quux")) == ["Zebulon Quux"]
+    queries = backend.query_count
+    [result] = asyncio.run(service.search_players("quux"))
+    assert result.player == created
+    # The index took the write's roster version, so the search only read the version
+    assert backend.query_count == queries + 1
+
+
+def test_writes_elsewhere_still_trigger_a_rebuild(monkeypatch, service, repository, backend, league):
+    index = PlayerSearchIndex(check_seconds=0)
+    monkeypatch.setattr(service_module, "player_index", index)
+    asyncio.run(index.refresh(repository))
+
+    # Another process writes a player before this one does
+    backend.write("players", make_player("8888888", "Elsewhere Person").model_dump())
+    backend.bump_version(ROSTER_VERSION_KEY)
+    asyncio.run(service.update_player(league.players[0].model_copy(update={"full_name": "Zebulon Quux"})))
+
+    results = asyncio.run(service.search_players("elsewhere person"))
+    assert [result.player.full_name for result in results] == ["Elsewhere Person"]
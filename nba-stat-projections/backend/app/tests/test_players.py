@@ -0,0 +1,59 @@
+"""
+Tests for player paging, both as JSON pages and as NDJSON streams
+"""
+import orjson
+import pytest
+
+PLAYERS = "/api/projections/players"
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+def stream(client, **params):
+    """Players streamed as NDJSON"""
+    response = client.get(PLAYERS, params=params, headers=NDJSON)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [orjson.loads(line) for line in response.content.splitlines()]
+
+
+@pytest.fixture
+def active_ids(league):
+    """IDs of active players in cursor order"""
+    return sorted(player.id for player in league.players if player.is_active)
+
+
+def test_page_and_cursor(client, active_ids):
+    first = client.get(PLAYERS, params={"limit": 100})
+    second = client.get(PLAYERS, params={"limit": 100, "cursor": first.headers["x-next-cursor"]})
+
+    assert [p["id"] for p in first.json() + second.json()] == active_ids[:200]
+    assert first.headers["x-next-cursor"] == active_ids[99]
+
+
+def test_stream_returns_every_player(client, active_ids):
+    assert [p["id"] for p in stream(client)] == active_ids
+
+
+def test_stream_honors_cursor(client, active_ids):
+    assert [p["id"] for p in stream(client, cursor=active_ids[9])] == active_ids[10:]
+
+
+def test_stream_honors_limit(client, active_ids):
+    assert [p["id"] for p in stream(client, cursor=active_ids[9], limit=25)] == active_ids[10:35]
+
+
+def test_stream_honors_fields(client):
+    players = stream(client, fields="full_name,team_id", limit=3)
+
+    assert [set(p) for p in players] == [{"full_name", "team_id"}] * 3
+
+
+def test_stream_matches_page(client):
+    params = {"team_id": "1610612747", "fields": "id,full_name,position", "limit": 10}
+
+    assert stream(client, **params) == client.get(PLAYERS, params=params).json()
+
+
+def test_unknown_field_is_rejected_in_both_modes(client):
+    assert client.get(PLAYERS, params={"fields": "salary"}).status_code == 400
+    assert client.get(PLAYERS, params={"fields": "salary"}, headers=NDJSON).status_code == 400
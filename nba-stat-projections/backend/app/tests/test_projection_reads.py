@@ -0,0 +1,43 @@
+"""
+Tests for projection reads and the queries they make
+"""
+import asyncio
+
+from app.tests.conftest import TODAY
+
+
+def collect(iterator):
+    """Drain an async iterator"""
+    async def drain():
+        return [item async for item in iterator]
+    return asyncio.run(drain())
+
+
+def test_game_projections_look_up_players_in_one_query(service, projected, league):
+    game = league.games_on(TODAY)[0]
+
+    before = projected.query_count
+    responses = collect(service.iter_game_projections(game.id))
+    queries = projected.query_count - before
+
+    assert len(responses) == 30
+    assert {r.player.team_id for r in responses} == {game.home_team_id, game.visitor_team_id}
+    assert all(r.player.id == r.projection.player_id for r in responses)
+    # Game, two teams, projections and one batch of players
+    assert queries == 5
+
+
+def test_game_projections_team_filter(service, projected, league):
+    game = league.games_on(TODAY)[0]
+
+    responses = collect(service.iter_game_projections(game.id, team_id=game.visitor_team_id))
+
+    assert len(responses) == 15
+    assert all(r.player.team_id == game.visitor_team_id and not r.home_team for r in responses)
+    assert all(r.opponent_team.id == game.home_team_id for r in responses)
+
+
+def test_today_projections_cover_the_slate(service, projected, todays_projections):
+    responses = collect(service.iter_today_projections())
+
+    assert sorted(r.projection.player_id for r in responses) == sorted(p.player_id for p in todays_projections)
@@ -0,0 +1,134 @@
+"""
+Tests for prop line edges against simulated distributions
+"""
+import asyncio
+from datetime import datetime
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.models.schemas import PlayerProjection, PropLine
+from app.projections.simulation import SIMULATED_STATS, ProjectionDistribution, implied_probability, scan_lines
+
+# Implied probability of -110
+JUICE = 110 / 210
+
+
+def projection(player_id: str, game_id: str = "g1", value: float = 20.0) -> PlayerProjection:
+    """A projection with every stat projected at value"""
+    stats = {f"projected_{stat}": value for stat in SIMULATED_STATS}
+    return PlayerProjection(
+        player_id=player_id,
+        game_id=game_id,
+        projected_field_goal_percentage=0.5,
+        projected_free_throw_percentage=0.8,
+        confidence_score=50.0,
+        created_at=datetime(2025, 1, 1),
+        model_version="test",
+        **stats
+    )
+
+
+@pytest.fixture
+def distribution() -> ProjectionDistribution:
+    """Two players whose samples for every stat are 0, 1, ..., 99"""
+    projections = [projection("p1"), projection("p2", "g2")]
+    samples = np.broadcast_to(np.arange(100.0), (2, len(SIMULATED_STATS), 100)).copy()
+    return ProjectionDistribution(projections, samples)
+
+
+@pytest.mark.parametrize("odds, expected", [
+    (-110, JUICE),
+    (-200, 2 / 3),
+    (100, 0.5),
+    (150, 0.4),
+])
+def test_implied_probability(odds, expected):
+    assert implied_probability(np.array([odds]))[0] == pytest.approx(expected)
+
+
+def test_implied_probability_evaluates_each_side_on_its_own():
+    with np.errstate(all="raise"):
+        probabilities = implied_probability(np.array([-100, 100, -110, 150]))
+
+    np.testing.assert_allclose(probabilities, [0.5, 0.5, JUICE, 0.4])
+
+
+@pytest.mark.parametrize("odds", [0, 50, -50, 99, -99])
+def test_prop_line_rejects_impossible_odds(odds):
+    with pytest.raises(ValidationError):
+        PropLine(player_id="p1", stat="points", line=20.5, over_odds=odds)
+    with pytest.raises(ValidationError):
+        PropLine(player_id="p1", stat="points", line=20.5, under_odds=odds)
+
+
+def test_prop_edges_endpoint_rejects_impossible_odds(client):
+    response = client.post(
+        "/api/projections/props/edges",
+        json={"lines": [{"player_id": "p1", "stat": "points", "line": 20.5, "over_odds": -50}]}
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("line, over_odds, under_odds, prob_over, side, edge", [
+    # 70 of 100 samples above 29.5: the over has the edge
+    (29.5, -110, -110, 0.70, "over", 0.70 - JUICE),
+    # 20 above 79.5: the under has the edge
+    (79.5, -110, -110, 0.20, "under", 0.80 - JUICE),
+    # A coin flip at -110 either way is a negative edge; ties go to the over
+    (49.5, -110, -110, 0.50, "over", 0.50 - JUICE),
+    # Plus money on the under outweighs a slightly likelier over
+    (44.5, -110, 150, 0.55, "under", 0.45 - 0.4),
+    # Lines outside the samples
+    (-1.0, -110, -110, 1.00, "over", 1.00 - JUICE),
+    (500.0, -110, -110, 0.00, "under", 1.00 - JUICE),
+])
+def test_scan_lines(distribution, line, over_odds, under_odds, prob_over, side, edge):
+    result = scan_lines(distribution, ["p2"], ["points"], [line], [over_odds], [under_odds])
+
+    assert result["matched"].tolist() == [True]
+    assert result["row"].tolist() == [1]
+    assert result["prob_over"][0] == pytest.approx(prob_over)
+    assert result["prob_under"][0] == pytest.approx(1 - prob_over)
+    assert ("over" if result["over"][0] else "under") == side
+    assert result["edge"][0] == pytest.approx(edge)
+
+
+def test_scan_lines_splits_unmatched(distribution):
+    result = scan_lines(
+        distribution,
+        ["p1", "nobody", "p2", "p1"],
+        ["points", "points", "dunks", "rebounds"],
+        [10.5, 10.5, 10.5, 89.5],
+        [-110] * 4,
+        [-110] * 4
+    )
+
+    assert result["matched"].tolist() == [True, False, False, True]
+    # Matched arrays only hold matched lines, ranked best edge first
+    assert len(result["edge"]) == 2
+    assert result["order"].tolist() == [1, 0]
+
+
+def test_scan_prop_lines(service, distribution, monkeypatch):
+    async def slate_distribution(game_date=None):
+        return distribution, [projection("p1"), projection("p2", "g2")]
+
+    monkeypatch.setattr(service, "get_slate_distribution", slate_distribution)
+    lines = [
+        PropLine(player_id="p1", stat="points", line=29.5),
+        PropLine(player_id="nobody", stat="points", line=10.5),
+        PropLine(player_id="p2", stat="rebounds", line=89.5),
+        PropLine(player_id="p2", stat="dunks", line=1.5),
+    ]
+
+    result = asyncio.run(service.scan_prop_lines(lines))
+
+    assert [(e.player_id, e.stat, e.side) for e in result.edges] == [("p2", "rebounds", "under"), ("p1", "points", "over")]
+    assert result.edges[0].game_id == "g2"
+    assert result.edges[0].projected == 20.0
+    assert result.edges[0].prob_under == 0.9
+    assert result.edges[0].edge == round(0.9 - JUICE, 4)
+    assert result.unmatched == lines[1:2] + lines[3:]
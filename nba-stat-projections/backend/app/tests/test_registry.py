@@ -0,0 +1,146 @@
+"""
+Tests for the model registry and per-request model selection
+"""
+import json
+from typing import List
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.projections import get_projection_service
+from app.main import app
+from app.projections import service as service_module
+from app.projections.algorithms import MovingAverageModel
+from app.projections.registry import DEFAULT_MODEL_VERSION, MODEL_CACHE_SIZE, ModelRegistry, model_registry
+
+TODAY = "/api/projections/today"
+
+
+class Model:
+    """Stand-in model recording how it was built"""
+
+    def __init__(self, model_version: str, **params):
+        self.model_version = model_version
+        self.params = params
+
+
+@pytest.fixture
+def registry() -> ModelRegistry:
+    """Registry with two families sharing a prefix"""
+    registry = ModelRegistry(artifact_dir=None)
+    registry.register("moving_avg", Model)
+    registry.register("moving_avg_fast", Model)
+    return registry
+
+
+def test_longest_prefix_wins(registry):
+    assert registry.resolve("moving_avg_0.2.0").prefix == "moving_avg"
+    assert registry.resolve("moving_avg_fast_0.1.0").prefix == "moving_avg_fast"
+    assert registry.resolve("ewma_0.1.0") is None
+    assert not registry.is_registered("ewma_0.1.0")
+    assert registry.prefixes() == ["moving_avg", "moving_avg_fast"]
+
+
+def test_models_are_built_once_per_version(registry):
+    model = registry.get("moving_avg_0.2.0")
+
+    assert model.model_version == "moving_avg_0.2.0"
+    assert registry.get("moving_avg_0.2.0") is model
+    assert registry.get("moving_avg_0.3.0") is not model
+
+
+def test_unknown_version_raises(registry):
+    with pytest.raises(ValueError):
+        registry.get("ewma_0.1.0")
+    assert registry.warm_versions() == []
+
+
+def test_least_recently_used_model_is_evicted():
+    registry = ModelRegistry()
+    registry.register("moving_avg", Model)
+    assert registry.max_warm == MODEL_CACHE_SIZE
+
+    versions: List[str] = [f"moving_avg_0.{i}.0" for i in range(MODEL_CACHE_SIZE)]
+    first = registry.get(versions[0])
+    for version in versions[1:]:
+        registry.get(version)
+    # Touch the oldest so the second becomes least recently used
+    assert registry.get(versions[0]) is first
+
+    registry.get("moving_avg_1.0.0")
+
+    assert len(registry.warm_versions()) == MODEL_CACHE_SIZE
+    assert versions[1] not in registry.warm_versions()
+    assert registry.warm_versions()[-1] == "moving_avg_1.0.0"
+    assert registry.get(versions[0]) is first
+
+
+def test_reregistering_drops_warm_models(registry):
+    model = registry.get("moving_avg_0.2.0")
+
+    registry.register("moving_avg", Model)
+
+    assert registry.warm_versions() == []
+    assert registry.get("moving_avg_0.2.0") is not model
+
+
+def test_artifacts_supply_constructor_parameters(tmp_path):
+    registered = tmp_path / "registered.json"
+    registered.write_text(json.dumps({"window_size": 5}))
+    artifact_dir = tmp_path / "models"
+    artifact_dir.mkdir()
+    (artifact_dir / "moving_avg_0.3.0.json").write_text(json.dumps({"window_size": 3, "recency_weight": 0.9}))
+
+    registry = ModelRegistry(artifact_dir=str(artifact_dir))
+    registry.register("moving_avg", "app.projections.algorithms:MovingAverageModel", artifact=str(registered))
+
+    # A per-version artifact wins over the registered one
+    specific = registry.get("moving_avg_0.3.0")
+    assert isinstance(specific, MovingAverageModel)
+    assert (specific.window_size, specific.recency_weight) == (3, 0.9)
+    assert registry.get("moving_avg_0.2.0").window_size == 5
+
+
+def test_missing_artifact_uses_defaults(tmp_path):
+    registry = ModelRegistry(artifact_dir=str(tmp_path))
+    registry.register("moving_avg", Model, artifact=str(tmp_path / "missing.json"))
+
+    assert registry.get("moving_avg_0.2.0").params == {}
+
+
+def test_unknown_model_version_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        get_projection_service(model_version="bogus_0.1.0")
+
+    assert error.value.status_code == 400
+    assert all(prefix in error.value.detail for prefix in model_registry.prefixes())
+
+
+@pytest.fixture
+def unpatched_client(monkeypatch, repository):
+    """Test client resolving services through get_projection_service itself"""
+    monkeypatch.setattr(service_module, "NBARepository", lambda: repository)
+    monkeypatch.setattr(service_module, "NBADataClient", object)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_unknown_model_version_returns_400(unpatched_client, backend):
+    queries = backend.query_count
+
+    response = unpatched_client.get(TODAY, params={"model_version": "bogus_0.1.0"})
+
+    assert response.status_code == 400
+    assert "Unknown model version" in response.json()["detail"]
+    assert backend.query_count == queries
+
+
+def test_model_version_filters_projections(unpatched_client, projected, todays_projections):
+    served = unpatched_client.get(TODAY, params={"model_version": DEFAULT_MODEL_VERSION})
+    other = unpatched_client.get(TODAY, params={"model_version": "moving_avg_9.9.9"})
+
+    assert {p.model_version for p in todays_projections} == {DEFAULT_MODEL_VERSION}
+    assert len(served.json()) == len(todays_projections)
+    assert other.status_code == 200
+    assert other.json() == []
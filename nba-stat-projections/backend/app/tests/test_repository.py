@@ -0,0 +1,45 @@
+"""
+Tests for repository writes through a real Supabase client
+"""
+import asyncio
+
+import pytest
+
+from app.projections.algorithms import MovingAverageModel
+from benchmarks.synthetic import SyntheticLeague
+
+from app.tests.conftest import TODAY
+
+
+@pytest.fixture
+def projections(league: SyntheticLeague):
+    """Projections for today's slate"""
+    slate = league.slate(TODAY)
+    return MovingAverageModel().project_many(slate.player_ids, slate.game_ids, slate.histories, slate.is_home)
+
+
+def test_create_player_projection(http_repository, backend, projections):
+    created = asyncio.run(http_repository.create_player_projection(projections[0]))
+
+    assert created.model_dump(exclude={"created_at"}) == projections[0].model_dump(exclude={"created_at"})
+    assert created.created_at == projections[0].created_at
+    assert len(backend.tables["player_projections"]) == 1
+
+
+def test_create_player_projections(http_repository, backend, projections):
+    created = asyncio.run(http_repository.create_player_projections(projections))
+
+    assert [p.player_id for p in created] == [p.player_id for p in projections]
+    assert created[0].stat_confidence == projections[0].stat_confidence
+    assert len(backend.tables["player_projections"]) == len(projections)
+
+
+def test_upsert_player_projections(http_repository, backend, projections):
+    asyncio.run(http_repository.upsert_player_projections(projections))
+    regenerated = [p.model_copy(update={"projected_points": p.projected_points + 1}) for p in projections]
+
+    written = asyncio.run(http_repository.upsert_player_projections(regenerated))
+
+    assert [p.projected_points for p in written] == [p.projected_points for p in regenerated]
+    # Rows for the same player, game and model version are replaced in place
+    assert len(backend.tables["player_projections"]) == len(projections)
@@ -0,0 +1,74 @@
+"""
+Tests for simulated stat quantiles
+"""
+import asyncio
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.projections import service as service_module
+from app.projections.feed import ProjectionFeed
+from app.projections.leaderboards import Leaderboards
+from app.projections.simulation import QUANTILE_LEVELS, SIMULATED_STATS, ProjectionDistribution
+
+
+@pytest.fixture(autouse=True)
+def isolated_readers(monkeypatch):
+    """Fresh feed, leaderboards and slate cache so tests do not leak into each other"""
+    monkeypatch.setattr(service_module, "_distribution_cache", {})
+    monkeypatch.setattr(service_module, "leaderboards", Leaderboards())
+    monkeypatch.setattr(service_module, "projection_feed", ProjectionFeed())
+
+
+def test_with_quantiles_copies_projections(todays_projections):
+    projections = todays_projections[:5]
+    distribution = ProjectionDistribution.simulate(projections, n_samples=200)
+
+    simulated = distribution.with_quantiles(projections)
+
+    assert all(projection.stat_quantiles is None for projection in projections)
+    assert [p.player_id for p in simulated] == [p.player_id for p in projections]
+    for quantiles in (p.stat_quantiles for p in simulated):
+        assert set(quantiles) == set(SIMULATED_STATS)
+        assert all(len(levels) == len(QUANTILE_LEVELS) and levels == sorted(levels) for levels in quantiles.values())
+
+
+def test_generated_projections_are_stored_with_quantiles(service, repository):
+    [game] = asyncio.run(repository.get_games(date.today()))[:1]
+
+    generated = asyncio.run(service.generate_game_projections(game.id))
+    stored = asyncio.run(repository.get_player_projections(game_id=game.id))
+
+    assert stored and all(projection.stat_quantiles for projection in stored)
+    by_player = {projection.player_id: projection.stat_quantiles for projection in generated}
+    assert {p.player_id: p.stat_quantiles for p in stored} == by_player
+
+
+def test_single_generated_projection_is_stored_with_quantiles(service, repository, league):
+    [game] = asyncio.run(repository.get_games(date.today()))[:1]
+    player = next(p for p in league.players if p.team_id == game.home_team_id)
+
+    projection = asyncio.run(service.generate_projection(player.id, game.id))
+    [stored] = asyncio.run(repository.get_player_projections(game_id=game.id))
+
+    assert projection.stat_quantiles
+    assert stored.stat_quantiles == projection.stat_quantiles
+
+
+def test_simulated_reads_leave_shared_projections_untouched(service, projected, todays_projections):
+    simulated = asyncio.run(service.get_today_projections(simulate=True))
+    plain = asyncio.run(service.get_today_projections())
+
+    assert len(simulated) == len(todays_projections)
+    assert all(response.projection.stat_quantiles for response in simulated)
+    assert all(response.projection.stat_quantiles is None for response in plain)
+    assert all(projection.stat_quantiles is None for projection in todays_projections)
+
+
+def test_slate_distribution_matches_its_projections(service, projected):
+    distribution, projections = asyncio.run(service.get_slate_distribution())
+
+    assert [p.player_id for p in projections] == distribution.player_ids
+    medians = np.array([p.stat_quantiles["points"][2] for p in projections])
+    np.testing.assert_allclose(medians, np.round(distribution.quantiles[:, SIMULATED_STATS.index("points"), 2], 1))
@@ -0,0 +1,129 @@
+"""
+Tests for single-flight coalescing of concurrent reads
+"""
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+class Backend:
+    """Counts calls and holds each one open until released"""
+
+    def __init__(self, result="result", error=None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def fetch(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+async def start(flights, key, fn, n):
+    """Start n concurrent calls and let them all reach the flight"""
+    tasks = [asyncio.ensure_future(flights.do(key, fn)) for _ in range(n)]
+    await asyncio.sleep(0)
+    return tasks
+
+
+def test_concurrent_identical_calls_share_one_computation():
+    async def scenario():
+        flights, backend = SingleFlight(), Backend()
+        tasks = await start(flights, "today", backend.fetch, 20)
+        assert flights.in_flight() == 1
+
+        backend.release.set()
+        results = await asyncio.gather(*tasks)
+        return flights, backend, results
+
+    flights, backend, results = asyncio.run(scenario())
+
+    assert backend.calls == 1
+    assert results == ["result"] * 20
+    assert (flights.started, flights.coalesced) == (1, 19)
+
+
+def test_different_keys_are_not_coalesced():
+    async def scenario():
+        flights, backend = SingleFlight(), Backend()
+        tasks = await start(flights, "a", backend.fetch, 3) + await start(flights, "b", backend.fetch, 3)
+        assert flights.in_flight() == 2
+        backend.release.set()
+        await asyncio.gather(*tasks)
+        return backend
+
+    assert asyncio.run(scenario()).calls == 2
+
+
+def test_error_reaches_every_waiter():
+    async def scenario():
+        flights, backend = SingleFlight(), Backend(error=ConnectionError("database unavailable"))
+        tasks = await start(flights, "today", backend.fetch, 5)
+        backend.release.set()
+        return backend, await asyncio.gather(*tasks, return_exceptions=True)
+
+    backend, results = asyncio.run(scenario())
+
+    assert backend.calls == 1
+    assert len(results) == 5
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_key_is_released_after_the_flight():
+    async def scenario():
+        flights, backend = SingleFlight(), Backend(error=ConnectionError("database unavailable"))
+        backend.release.set()
+        with pytest.raises(ConnectionError):
+            await flights.do("today", backend.fetch)
+        assert flights.in_flight() == 0
+
+        # The next call recomputes rather than reusing the failure
+        backend.error = None
+        assert await flights.do("today", backend.fetch) == "result"
+        assert flights.in_flight() == 0
+        return backend
+
+    assert asyncio.run(scenario()).calls == 2
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    async def scenario():
+        flights, backend = SingleFlight(), Backend()
+        first, second = await start(flights, "today", backend.fetch, 2)
+        first.cancel()
+        await asyncio.sleep(0)
+        backend.release.set()
+        return first, await second
+
+    first, result = asyncio.run(scenario())
+
+    assert first.cancelled()
+    assert result == "result"
+
+
+def test_concurrent_today_reads_make_one_games_query(service, projected, monkeypatch):
+    calls = []
+    get_games = service.repository.get_games
+
+    async def counted_get_games(*args, **kwargs):
+        calls.append(args)
+        return await get_games(*args, **kwargs)
+
+    monkeypatch.setattr(service.repository, "get_games", counted_get_games)
+
+    async def scenario():
+        return await asyncio.gather(*(service.get_today_projections() for _ in range(20)))
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert len(results[0]) == 450
+    assert all(len(result) == 450 for result in results)
+    # Each caller gets its own list
+    assert len({id(result) for result in results}) == 20
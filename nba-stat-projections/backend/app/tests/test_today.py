@@ -0,0 +1,64 @@
+"""
+Tests for the /today listing in its JSON, normalized and NDJSON forms
+"""
+import orjson
+import pytest
+
+TODAY = "/api/projections/today"
+
+
+@pytest.fixture
+def listing(client, projected):
+    """Today's projections as the plain JSON array"""
+    response = client.get(TODAY)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_normalized_shape(client, listing, todays_projections):
+    response = client.get(TODAY, params={"normalized": "true"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"teams", "games", "players", "projections"}
+    assert len(body["projections"]) == len(todays_projections)
+    assert len(body["games"]) == 15
+    assert len(body["players"]) == len(todays_projections)
+    assert all(key == value["id"] for group in ("teams", "games", "players") for key, value in body[group].items())
+
+
+def test_normalized_references_resolve_to_the_full_listing(client, listing):
+    body = client.get(TODAY, params={"normalized": "true"}).json()
+
+    for full, projection in zip(listing, body["projections"]):
+        assert projection["player_id"] == full["player"]["id"]
+        assert body["players"][projection["player_id"]] == full["player"]
+        assert body["games"][projection["game_id"]] == full["game"]
+        assert body["teams"][projection["opponent_team_id"]] == full["opponent_team"]
+        assert projection["home_team"] == full["home_team"]
+        assert {key: projection[key] for key in full["projection"]} == full["projection"]
+
+
+def test_normalized_is_smaller(client, listing):
+    normalized = client.get(TODAY, params={"normalized": "true"})
+
+    assert len(normalized.content) < len(orjson.dumps(listing))
+
+
+def test_normalized_honors_filters(client, listing):
+    team_id = listing[0]["player"]["team_id"]
+
+    body = client.get(TODAY, params={"normalized": "true", "team_id": team_id}).json()
+
+    assert {p["player_id"] for p in body["projections"]} == {
+        p["player"]["id"] for p in listing if p["player"]["team_id"] == team_id
+    }
+    assert set(body["players"]) == {p["player_id"] for p in body["projections"]}
+
+
+def test_ndjson_matches_json(client, listing):
+    response = client.get(TODAY, headers={"Accept": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [orjson.loads(line) for line in response.content.splitlines()] == listing
@@ -0,0 +1,147 @@
+"""
+HTTP caching helpers: data-version ETags and conditional GETs
+"""
+import os
+import time
+import zlib
+from datetime import date
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.utils.metrics import record_cache
+
+# Counter key bumped whenever projections, games, players or teams change
+DATA_VERSION_KEY = "projections"
+
+# Counter key bumped whenever a player is created or updated
+ROSTER_VERSION_KEY = "players"
+
+# How long a pod trusts its last read of the data version before re-checking
+DATA_VERSION_TTL_SECONDS = float(os.getenv("DATA_VERSION_TTL_SECONDS", 5))
+
+# Cache-Control for projection endpoints; clients revalidate with If-None-Match
+CACHE_CONTROL = os.getenv("PROJECTIONS_CACHE_CONTROL", "public, max-age=30, must-revalidate")
+
+# Request headers that select the representation: JSON or NDJSON by Accept,
+# and the body encoding chosen by CompressionMiddleware
+VARY = "Accept, Accept-Encoding"
+
+# Last data version seen by this process and when it was read
+_data_version: Dict[str, float] = {"version": -1, "fetched_at": 0.0}
+
+
+def record_data_version(version: int) -> None:
+    """
+    Record a data version read from, or written to, the database
+
+    Args:
+        version: Data version
+    """
+    _data_version["version"] = version
+    _data_version["fetched_at"] = time.monotonic()
+
+
+async def get_data_version(repository) -> int:
+    """
+    Get the data version, reading the database at most once per TTL
+
+    Args:
+        repository: Repository to read the counter from
+
+    Returns:
+        int: Current data version
+    """
+    stale = time.monotonic() - _data_version["fetched_at"] >= DATA_VERSION_TTL_SECONDS
+    record_cache("data_version", not stale)
+    if stale:
+        record_data_version(await repository.get_data_version())
+    return int(_data_version["version"])
+
+
+def make_etag(version: int, request: Request) -> str:
+    """
+    Build a weak ETag for a request at a data version
+
+    The tag covers the path, query string, Accept header and current date
+    (so /today rolls over at midnight) as well as the data version.
+
+    Args:
+        version: Data version
+        request: Incoming request
+
+    Returns:
+        str: Weak ETag
+    """
+    key = "|".join([
+        request.url.path,
+        request.url.query,
+        request.headers.get("accept", ""),
+        date.today().isoformat(),
+    ])
+    return f'W/"{version}-{zlib.crc32(key.encode()):08x}"'
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """Caching headers sent with projection responses"""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": VARY}
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Whether the client already has the representation for an ETag
+
+    Args:
+        request: Incoming request
+        etag: Current ETag
+
+    Returns:
+        bool: True if If-None-Match matches the ETag
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    matched = _matches(if_none_match, etag)
+    record_cache("etag", matched)
+    return matched
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+
+    # Weak comparison: ignore W/ prefixes
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+async def conditional_etag(request: Request, repository) -> Optional[str]:
+    """
+    Compute the ETag for a request, tolerating an unavailable version counter
+
+    Args:
+        request: Incoming request
+        repository: Repository to read the data version from
+
+    Returns:
+        Optional[str]: ETag, or None if the data version could not be read
+    """
+    try:
+        version = await get_data_version(repository)
+    except Exception:
+        return None
+    return make_etag(version, request)
+
+
+def not_modified_response(etag: str) -> Response:
+    """Empty 304 response for a matching ETag"""
+    return Response(status_code=304, headers=cache_headers(etag))
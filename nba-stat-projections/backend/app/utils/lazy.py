@@ -0,0 +1,50 @@
+"""
+Deferred imports for heavy dependencies that most requests never use
+"""
+import importlib
+import sys
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """
+    Stand-in for a module that imports it on first attribute access
+
+    After loading, the real module's namespace is copied onto the stand-in,
+    so later attribute lookups cost the same as on the module itself.
+    """
+
+    def _load(self) -> ModuleType:
+        # import_module holds the import lock, so concurrent first uses load once
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attribute: str) -> Any:
+        # Only called for attributes missing from the stand-in's own namespace
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module on first use instead of now
+
+    Nothing is imported until an attribute of the returned module is used,
+    so start-up does not pay for modules that only some code paths need.
+    Annotations that name the module's attributes must not be evaluated at
+    import time (use "from __future__ import annotations").
+
+    Args:
+        name: Fully qualified module name (e.g. "numpy")
+
+    Returns:
+        ModuleType: The module itself if already imported, else a stand-in
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
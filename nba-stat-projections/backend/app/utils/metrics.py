@@ -0,0 +1,157 @@
+"""
+Prometheus metrics for the API and its hot paths
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Latency buckets (seconds) for requests and database queries
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Supabase query latency by table and operation",
+    ["table", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "In-process cache lookups by cache and result (hit or miss)",
+    ["cache", "result"],
+)
+
+NBA_API_LATENCY = Histogram(
+    "nba_api_request_duration_seconds",
+    "NBA API call latency by endpoint, excluding rate-limit waits",
+    ["endpoint"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+NBA_API_RATE_LIMIT_WAIT = Counter(
+    "nba_api_rate_limit_wait_seconds_total",
+    "Time spent sleeping to respect the NBA API rate limit",
+)
+
+MODEL_COMPUTE = Histogram(
+    "model_compute_duration_seconds",
+    "Model compute time per batch by model version and stage",
+    ["model_version", "stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """
+    Count a cache lookup
+
+    Args:
+        cache: Cache name
+        hit: Whether the lookup was served from the cache
+    """
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+@contextmanager
+def observe(histogram: Histogram, *labels: str) -> Iterator[None]:
+    """
+    Time a block into a labelled histogram
+
+    Args:
+        histogram: Histogram to observe into
+        labels: Label values, in the histogram's label order
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(*labels).observe(time.perf_counter() - start)
+
+
+def render_metrics() -> bytes:
+    """
+    Render all metrics in the Prometheus text format
+
+    When PROMETHEUS_MULTIPROC_DIR is set (several uvicorn workers), metrics
+    from every worker process are aggregated.
+
+    Returns:
+        bytes: Exposition-format metrics
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Full path template of the route that handled a request
+
+    Newer FastAPI releases keep routes from included routers relative to
+    their prefix and record the full template in their own scope entry;
+    older releases store the full template on the route itself.
+
+    Args:
+        scope: ASGI scope after routing
+
+    Returns:
+        str: Path template, or "unmatched" if no route handled the request
+    """
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    template = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return template or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per route template
+
+    Routes are labelled by their template (e.g. /api/projections/games/{game_id}/projections)
+    rather than the raw path, so label cardinality stays bounded. Streamed
+    responses are timed until their last chunk is sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = ["500"]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.labels(
+                scope["method"],
+                route_template(scope),
+                status[0],
+            ).observe(time.perf_counter() - start)
+
+
+def metrics_content_type() -> str:
+    """Content type of the metrics exposition format"""
+    return CONTENT_TYPE_LATEST
@@ -0,0 +1,306 @@
+"""
+Opt-in profiling of requests and projection pipeline stages
+"""
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from cProfile import Profile
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import route_template
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover - pyinstrument is optional
+    pyinstrument = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Capture profiles (off by default)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+
+# Where profiles are written
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "nba-profiles"))
+
+# "cprofile" (deterministic, every call) or "pyinstrument" (sampling, async-aware; optional dependency)
+PROFILER = os.getenv("PROFILER", "cprofile").lower()
+
+# Fraction of requests profiled; a request with "X-Profile: 1" is always profiled
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 1.0))
+
+# Profiles of requests faster than this are discarded
+PROFILE_MIN_MS = float(os.getenv("PROFILE_MIN_MS", 0))
+
+# Newest profiles kept on disk
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 200))
+
+# Functions listed in a cProfile summary
+PROFILE_TOP_FUNCTIONS = 30
+
+# Paths never profiled
+PROFILE_SKIPPED_PATHS = ("/health", "/metrics", "/api/admin/profiles", "/api/projections/stream")
+
+_PROFILE_ID = re.compile(r"^[\w.-]+$")
+_UNSAFE_ID_CHARS = re.compile(r"[^\w.-]")
+
+# Profilers hook the interpreter, so one capture runs at a time per process
+_capture_lock = threading.Lock()
+
+
+class _Capture:
+    """One running profiler and the files it writes"""
+
+    def __init__(self, profiler: str = PROFILER):
+        if profiler == "pyinstrument" and pyinstrument is None:
+            logger.warning("pyinstrument is not installed; profiling with cProfile")
+            profiler = "cprofile"
+        self.profiler = profiler
+        if profiler == "pyinstrument":
+            self._profiler = pyinstrument.Profiler(async_mode="enabled")
+        else:
+            self._profiler = Profile()
+
+    def __enter__(self) -> "_Capture":
+        self.start = time.perf_counter()
+        if self.profiler == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.profiler == "pyinstrument":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+        self.duration_ms = (time.perf_counter() - self.start) * 1000
+
+    def summary(self) -> Dict[str, Any]:
+        """Functions with the most self time (cProfile) or the call tree as text (pyinstrument)"""
+        if self.profiler == "pyinstrument":
+            return {"text": self._profiler.output_text(unicode=False, color=False)}
+
+        stats = pstats.Stats(self._profiler, stream=io.StringIO())
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        return {"top_functions": [
+            {
+                "function": f"{name} ({os.path.basename(filename)}:{line})",
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _) in rows[:PROFILE_TOP_FUNCTIONS]
+        ]}
+
+    def save(self, kind: str, name: str, metadata: Dict[str, Any], directory: str = PROFILE_DIR) -> str:
+        """
+        Write the profile and a JSON sidecar describing it
+
+        Args:
+            kind: "request" or "stage"
+            name: Request ID or stage name, part of the profile ID
+            metadata: Extra fields for the sidecar
+            directory: Output directory
+
+        Returns:
+            str: Profile ID
+        """
+        os.makedirs(directory, exist_ok=True)
+        profile_id = f"{int(time.time() * 1000)}-{kind}-{_UNSAFE_ID_CHARS.sub('_', name)}"
+        extension = ".html" if self.profiler == "pyinstrument" else ".prof"
+
+        if self.profiler == "pyinstrument":
+            with open(os.path.join(directory, profile_id + extension), "w") as f:
+                f.write(self._profiler.output_html())
+        else:
+            self._profiler.dump_stats(os.path.join(directory, profile_id + extension))
+
+        with open(os.path.join(directory, profile_id + ".json"), "w") as f:
+            json.dump({
+                "id": profile_id,
+                "kind": kind,
+                "profiler": self.profiler,
+                "file": profile_id + extension,
+                "created_at": datetime.now().isoformat(),
+                "duration_ms": round(self.duration_ms, 2),
+                **metadata,
+                **self.summary(),
+            }, f)
+
+        _prune(directory)
+        return profile_id
+
+
+def _prune(directory: str, keep: int = PROFILE_KEEP) -> None:
+    """Delete all but the newest profiles"""
+    for sidecar in sorted(_sidecars(directory), reverse=True)[keep:]:
+        profile_id = sidecar[:-len(".json")]
+        for extension in (".json", ".prof", ".html"):
+            try:
+                os.remove(os.path.join(directory, profile_id + extension))
+            except FileNotFoundError:
+                pass
+
+
+def _sidecars(directory: str) -> List[str]:
+    try:
+        return [name for name in os.listdir(directory) if name.endswith(".json")]
+    except FileNotFoundError:
+        return []
+
+
+@contextmanager
+def profile_stage(name: str, **metadata: Any) -> Iterator[None]:
+    """
+    Profile a pipeline stage when profiling is enabled
+
+    Stages inside a profiled request (or another stage) are already covered
+    by that capture and are not profiled separately. Awaits inside the block
+    let other tasks run, and their work is included in the profile.
+
+    Args:
+        name: Stage name (e.g. "generate-date")
+        metadata: Details recorded with the profile (e.g. game_id)
+    """
+    if not PROFILING_ENABLED or not _capture_lock.acquire(blocking=False):
+        yield
+        return
+
+    try:
+        with _Capture() as capture:
+            yield
+        capture.save("stage", name, {"stage": name, "details": metadata})
+    finally:
+        _capture_lock.release()
+
+
+def list_profiles(limit: int = 20, directory: str = PROFILE_DIR) -> List[Dict[str, Any]]:
+    """
+    Newest profiles first
+
+    Args:
+        limit: Maximum number of profiles
+        directory: Profile directory
+
+    Returns:
+        List[Dict[str, Any]]: Sidecar contents, including each profile's summary
+    """
+    profiles = []
+    for sidecar in sorted(_sidecars(directory), reverse=True)[:limit]:
+        try:
+            with open(os.path.join(directory, sidecar)) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            # Pruned or half-written by another worker
+            continue
+    return profiles
+
+
+def profile_file(profile_id: str, directory: str = PROFILE_DIR) -> Optional[str]:
+    """
+    Path of a profile's raw file (.prof for cProfile, .html for pyinstrument)
+
+    Args:
+        profile_id: Profile ID
+        directory: Profile directory
+
+    Returns:
+        Optional[str]: Path, or None if there is no such profile
+    """
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    for extension in (".prof", ".html"):
+        path = os.path.join(directory, profile_id + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Profile sampled requests and write one profile per request
+
+    Profiled responses carry an X-Request-ID header (taken from the request
+    when present), which is also part of the profile ID. Requests that arrive while another
+    request is being profiled run unprofiled; concurrent requests interleave
+    with the profiled one on the event loop, so their work can appear in
+    its profile too.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        min_ms: float = PROFILE_MIN_MS
+    ):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Wrapped ASGI app
+            sample_rate: Fraction of requests profiled
+            min_ms: Profiles of faster requests are discarded
+        """
+        self.app = app
+        self.sample_rate = sample_rate
+        self.min_ms = min_ms
+
+    def _wanted(self, scope: Scope, headers: Headers) -> bool:
+        if scope["type"] != "http" or scope["path"].startswith(PROFILE_SKIPPED_PATHS):
+            return False
+        return headers.get("x-profile") == "1" or random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not self._wanted(scope, headers) or not _capture_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = headers.get("x-request-id") or uuid.uuid4().hex
+        status = [500]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Request-ID"] = request_id
+            await send(message)
+
+        capture = _Capture()
+        try:
+            with capture:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            try:
+                if capture.duration_ms >= self.min_ms:
+                    capture.save("request", request_id, {
+                        "request_id": request_id,
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": route_template(scope),
+                        "query": scope.get("query_string", b"").decode("latin-1"),
+                        "status": status[0],
+                    })
+            except Exception as e:
+                logger.warning(f"Could not save profile for request {request_id}: {str(e)}")
+            finally:
+                _capture_lock.release()
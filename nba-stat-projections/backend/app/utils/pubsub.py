@@ -0,0 +1,99 @@
+"""
+In-process publish/subscribe fan-out
+"""
+import asyncio
+from typing import Any, Optional, Set
+
+# Events buffered per subscriber before it is considered too slow
+DEFAULT_QUEUE_SIZE = 256
+
+
+class Subscription:
+    """
+    One subscriber's bounded event queue
+
+    A subscriber that falls more than queue_size events behind loses its
+    backlog and is flagged with `overflowed`, so it can tell its client to
+    resynchronize rather than silently miss updates.
+    """
+
+    def __init__(self, broker: "Broker", queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.broker = broker
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def offer(self, event: Any) -> None:
+        """Queue an event without blocking the publisher"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.overflowed = True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Wait for the next event
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            Optional[Any]: Next event, or None if the timeout expired
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        """Stop receiving events"""
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """
+    Fan events out to every subscriber's queue
+
+    Publishing is synchronous and never waits on subscribers, so one write
+    reaches any number of connected clients at the cost of a queue put each.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        """
+        Initialize the broker
+
+        Args:
+            queue_size: Events buffered per subscriber
+        """
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+
+    def subscribe(self) -> Subscription:
+        """Register a new subscriber"""
+        subscription = Subscription(self, self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber"""
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: Any) -> int:
+        """
+        Deliver an event to every subscriber
+
+        Args:
+            event: Event to deliver
+
+        Returns:
+            int: Number of subscribers the event was queued for
+        """
+        for subscription in list(self._subscribers):
+            subscription.offer(event)
+        return len(self._subscribers)
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers"""
+        return len(self._subscribers)
@@ -0,0 +1,62 @@
+"""
+Single-flight coalescing of identical concurrent async calls
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from app.utils.metrics import record_cache
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one in-flight computation
+
+    The first caller for a key starts the computation as a task; callers
+    arriving while it runs await the same task and receive its result (or
+    its exception). Nothing is cached: once the task finishes, the next call
+    starts a fresh computation.
+
+    The shared task is shielded, so a caller that is cancelled (e.g. its
+    client disconnected) does not cancel the computation for the others.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight"""
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn, or join an identical call already in flight
+
+        Args:
+            key: Identity of the call; equal keys share one computation
+            fn: Zero-argument coroutine function producing the result
+
+        Returns:
+            Any: Result of the shared computation
+        """
+        task = self._calls.get(key)
+        record_cache("singleflight", task is not None)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _, key=key: self._forget(key, task))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a finished call so the next one recomputes"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+        return len(self._calls)
@@ -0,0 +1,167 @@
+"""
+Per-request timing spans reported through the Server-Timing header
+"""
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Record spans and send Server-Timing headers (off by default)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "").lower() in ("1", "true", "yes")
+
+# Also write one structured log line per traced request
+SERVER_TIMING_LOG = os.getenv("SERVER_TIMING_LOG", "").lower() in ("1", "true", "yes")
+
+# Trace for the request being handled, if tracing is on
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("request_trace", default=None)
+
+
+class RequestTrace:
+    """Spans recorded while handling one request, aggregated by name"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add one span's duration"""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def elapsed(self) -> float:
+        """Seconds since the request started"""
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """
+        Render the spans as a Server-Timing header value
+
+        Returns:
+            str: e.g. 'db-games;dur=4.10;desc="2 calls", serialize;dur=1.32, total;dur=9.87'
+        """
+        entries: List[str] = []
+        for name, seconds in self.durations.items():
+            entry = f"{name};dur={seconds * 1000:.2f}"
+            if self.counts[name] > 1:
+                entry += f';desc="{self.counts[name]} calls"'
+            entries.append(entry)
+        entries.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(entries)
+
+
+class _Span:
+    """Context manager adding its duration to a request trace"""
+
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: RequestTrace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.trace.add(self.name, time.perf_counter() - self.start)
+
+
+class _NullSpan:
+    """Shared no-op span used outside traced requests"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    """
+    Time a block as a span of the current request
+
+    Outside a traced request this is a context variable lookup returning a
+    shared no-op context manager.
+
+    Args:
+        name: Span name (a Server-Timing metric name, e.g. "db-players")
+
+    Returns:
+        Context manager timing the block
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name)
+
+
+class ServerTimingMiddleware:
+    """
+    Collect spans per request and report them in a Server-Timing header
+
+    The header carries the spans recorded before the response starts, which
+    covers database calls, model compute and serialization for regular
+    responses. Streamed responses report what happened before the first
+    chunk; the optional log line is written when the response finishes and
+    includes every span.
+    """
+
+    def __init__(self, app: ASGIApp, log: bool = SERVER_TIMING_LOG):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Wrapped ASGI app
+            log: Whether to log one structured line per request
+        """
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace()
+        token = _current_trace.set(trace)
+        status = [500]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", trace.server_timing())
+                # Let the cross-origin frontend read the timings in devtools
+                headers["Timing-Allow-Origin"] = "*"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            if self.log:
+                logger.info(json.dumps({
+                    "event": "request_trace",
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status[0],
+                    "total_ms": round(trace.elapsed() * 1000, 2),
+                    "spans": {
+                        name: {"ms": round(seconds * 1000, 2), "calls": trace.counts[name]}
+                        for name, seconds in trace.durations.items()
+                    },
+                }))
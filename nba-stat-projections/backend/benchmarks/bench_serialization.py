@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark response serialization for the /today endpoint
+
+Compares three ways of returning a synthetic 400-projection slate:
+- response_model validation plus jsonable_encoder and the stdlib JSON
+  encoder (what FastAPI releases before the pydantic-core fast path do)
+- the installed FastAPI's own response_model path
+- pre-validated models returned through ORJSONResponse
+
+Usage:
+    python benchmarks/bench_serialization.py [--projections 400] [--requests 200]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime
+from typing import List
+
+# Add the backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.api.responses import ORJSONResponse
+from app.models.schemas import Player, Team, Game, PlayerProjection, ProjectionResponse
+
+
+def build_slate(n_projections: int, seed: int = 0) -> List[ProjectionResponse]:
+    """
+    Build a synthetic slate of projection responses
+
+    Args:
+        n_projections: Number of projections in the slate
+        seed: Random seed
+
+    Returns:
+        List[ProjectionResponse]: Synthetic projection responses
+    """
+    rng = random.Random(seed)
+    teams = [
+        Team(
+            id=str(1610612737 + i), full_name=f"Team {i}", abbreviation=f"T{i:02d}",
+            nickname=f"Nickname {i}", city=f"City {i}", state=f"State {i}", year_founded=1946 + i
+        )
+        for i in range(30)
+    ]
+    games = [
+        Game(
+            id=f"00224{i:05d}", season_id="22024", season_type="Regular Season",
+            game_date=datetime(2024, 1, 15, 19, 30), home_team_id=teams[2 * i].id,
+            visitor_team_id=teams[2 * i + 1].id, status="Scheduled"
+        )
+        for i in range(15)
+    ]
+
+    slate = []
+    for i in range(n_projections):
+        game = games[i % len(games)]
+        is_home = (i // len(games)) % 2 == 0
+        team_id = game.home_team_id if is_home else game.visitor_team_id
+        opponent_id = game.visitor_team_id if is_home else game.home_team_id
+        player = Player(
+            id=str(200000 + i), first_name=f"First{i}", last_name=f"Last{i}",
+            full_name=f"First{i} Last{i}", is_active=True, team_id=team_id,
+            jersey_number=str(i % 99), position=rng.choice(["G", "F", "C"]),
+            height="6-6", weight="215"
+        )
+        projection = PlayerProjection(
+            player_id=player.id, game_id=game.id,
+            projected_minutes=round(rng.uniform(10, 38), 1),
+            projected_points=round(rng.uniform(2, 32), 1),
+            projected_assists=round(rng.uniform(0, 10), 1),
+            projected_rebounds=round(rng.uniform(0, 13), 1),
+            projected_steals=round(rng.uniform(0, 2), 1),
+            projected_blocks=round(rng.uniform(0, 2), 1),
+            projected_turnovers=round(rng.uniform(0, 4), 1),
+            projected_three_pointers=round(rng.uniform(0, 4), 1),
+            projected_field_goal_percentage=round(rng.uniform(0.38, 0.6), 3),
+            projected_free_throw_percentage=round(rng.uniform(0.6, 0.92), 3),
+            confidence_score=round(rng.uniform(20, 95), 1),
+            stat_confidence={"points": 70.0, "rebounds": 65.0, "assists": 60.0},
+            stat_std={"points": 5.5, "rebounds": 2.5, "assists": 2.0},
+            created_at=datetime(2024, 1, 15, 8, 0),
+            model_version="moving_avg_0.1.0"
+        )
+        slate.append(ProjectionResponse(
+            player=player,
+            game=game,
+            projection=projection,
+            opponent_team=next(t for t in teams if t.id == opponent_id),
+            home_team=is_home
+        ))
+
+    return slate
+
+
+def build_app(slate: List[ProjectionResponse]) -> FastAPI:
+    """Build an app serving the slate through each response path"""
+    app = FastAPI()
+    adapter = TypeAdapter(List[ProjectionResponse])
+
+    @app.get("/stdlib", response_model=List[ProjectionResponse])
+    async def stdlib():
+        return JSONResponse(jsonable_encoder(adapter.validate_python(slate)))
+
+    @app.get("/baseline", response_model=List[ProjectionResponse])
+    async def baseline():
+        return slate
+
+    @app.get("/orjson", response_model=List[ProjectionResponse], response_class=ORJSONResponse)
+    async def fast():
+        return ORJSONResponse(slate)
+
+    return app
+
+
+def measure(client: TestClient, path: str, n_requests: int) -> float:
+    """
+    Measure throughput of an endpoint
+
+    Args:
+        client: Test client
+        path: Endpoint path
+        n_requests: Number of requests to time
+
+    Returns:
+        float: Requests per second
+    """
+    # Warm up
+    for _ in range(5):
+        client.get(path)
+
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        response = client.get(path)
+        response.raise_for_status()
+    return n_requests / (time.perf_counter() - start)
+
+
+def main():
+    """Run the serialization benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projections", type=int, default=400, help="Projections in the slate")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    args = parser.parse_args()
+
+    slate = build_slate(args.projections)
+    client = TestClient(build_app(slate))
+
+    # All paths must produce the same document
+    expected = client.get("/orjson").json()
+    assert client.get("/stdlib").json() == expected
+    assert client.get("/baseline").json() == expected
+
+    print(f"=== Serializing a {args.projections}-projection slate, {args.requests} requests each ===")
+    stdlib = measure(client, "/stdlib", args.requests)
+    baseline = measure(client, "/baseline", args.requests)
+    fast = measure(client, "/orjson", args.requests)
+    print(f"response_model + stdlib json:      {stdlib:8.1f} req/s")
+    print(f"installed FastAPI response_model:  {baseline:8.1f} req/s")
+    print(f"pre-validated + orjson:            {fast:8.1f} req/s")
+    print(f"speedup vs stdlib json:            {fast / stdlib:8.2f}x")
+    print(f"speedup vs installed FastAPI:      {fast / baseline:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
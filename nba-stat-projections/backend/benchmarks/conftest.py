@@ -0,0 +1,90 @@
+"""
+Shared fixtures for the benchmark suite
+
+Install the test dependencies and run from the backend directory:
+
+    pip install -r requirements-dev.txt
+    pytest benchmarks                       # run and save results to benchmarks/.benchmarks
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:15%
+                                            # fail if any benchmark is >15% slower than the last saved run
+
+Every benchmark works on the same deterministic synthetic league, served
+from an in-memory backend, so no Supabase project or NBA API access is needed.
+"""
+import os
+import sys
+import asyncio
+
+import pytest
+
+# Add the backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.api.projections import get_projection_service
+from app.data.repository import NBARepository
+from app.main import app
+from app.projections.algorithms import MovingAverageModel
+from app.projections.service import ProjectionService
+from benchmarks.local_backend import LocalSupabase
+from benchmarks.synthetic import Slate, SyntheticLeague, generate_league
+
+# Saved results live next to the suite unless --benchmark-storage is given
+BENCHMARK_STORAGE = "file://" + os.path.join(os.path.dirname(os.path.abspath(__file__)), ".benchmarks")
+
+# Day of the season used as "today's" slate (histories cover the games before it)
+SLATE_DAY = 60
+
+
+def pytest_configure(config):
+    """Point the default result storage at benchmarks/.benchmarks"""
+    if hasattr(config.option, "benchmark_storage") and config.option.benchmark_storage == "file://./.benchmarks":
+        config.option.benchmark_storage = BENCHMARK_STORAGE
+
+
+@pytest.fixture(scope="session")
+def league() -> SyntheticLeague:
+    """Full synthetic season: 30 teams, 450 players, 1230 games"""
+    return generate_league(seed=0)
+
+
+@pytest.fixture(scope="session")
+def slate(league: SyntheticLeague) -> Slate:
+    """The slate on SLATE_DAY with histories truncated to earlier games"""
+    return league.slate(SLATE_DAY)
+
+
+@pytest.fixture(scope="session")
+def backend(league: SyntheticLeague, slate: Slate) -> LocalSupabase:
+    """In-memory backend holding the league and projections for the slate"""
+    backend = LocalSupabase.from_league(league)
+    projections = MovingAverageModel().project_many(slate.player_ids, slate.game_ids, slate.histories, slate.is_home)
+    for projection in projections:
+        backend.write("player_projections", projection.model_dump())
+    return backend
+
+
+@pytest.fixture(scope="session")
+def repository(backend: LocalSupabase) -> NBARepository:
+    """Repository running against the in-memory backend"""
+    return NBARepository(client=backend)
+
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine to completion on a dedicated event loop"""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def api_client(repository: NBARepository):
+    """Test client for the app with services backed by the in-memory backend"""
+    app.dependency_overrides[get_projection_service] = lambda: ProjectionService(
+        repository=repository, data_client=object()
+    )
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
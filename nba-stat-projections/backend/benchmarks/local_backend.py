@@ -0,0 +1,347 @@
+"""
+In-memory stand-in for the Supabase client
+
+Implements the subset of the supabase-py query builder that NBARepository
+uses (select/insert/update/upsert, eq/gt/gte/lt/lte/in_/or_ filters,
+order/limit/range, and the bump_data_version RPC) over plain Python lists,
+so repository and API code paths can be benchmarked without a network.
+"""
+import csv
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from benchmarks.synthetic import SyntheticLeague
+
+# Filter operators shared by method filters and or_() expressions
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda value, target: value == target,
+    "neq": lambda value, target: value != target,
+    "gt": lambda value, target: value is not None and value > target,
+    "gte": lambda value, target: value is not None and value >= target,
+    "lt": lambda value, target: value is not None and value < target,
+    "lte": lambda value, target: value is not None and value <= target,
+}
+
+
+# Columns the database stamps with its own clock on every insert and update
+_WRITE_STAMPS = {"player_projections": "written_at"}
+
+
+def _to_json(value: Any) -> Any:
+    """Store values the way PostgREST would return them"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _coerce(value: Any, target: Any) -> Any:
+    """Coerce a filter value to the stored value's type, as Postgres would"""
+    if value is None or target is None or isinstance(target, type(value)):
+        return target
+    if isinstance(value, bool):
+        return str(target).lower() == "true"
+    if isinstance(value, (int, float)):
+        return type(value)(target)
+    return str(target)
+
+
+class LocalResponse:
+    """Query response with the same data attribute as supabase-py's"""
+
+    def __init__(self, data: Any):
+        self.data = data
+
+
+class LocalQuery:
+    """Chainable query against one in-memory table"""
+
+    def __init__(self, backend: "LocalSupabase", table: str):
+        self.backend = backend
+        self.table = table
+        self.operation = "select"
+        self.columns: Optional[List[str]] = None
+        self.payload: Any = None
+        self.on_conflict: Optional[List[str]] = None
+        self.filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self.lookup: Optional[Tuple[str, List[Any]]] = None
+        self.ordering: List[Tuple[str, bool]] = []
+        self.bounds: Tuple[int, Optional[int]] = (0, None)
+
+    # Operations
+
+    def select(self, columns: str = "*", **kwargs) -> "LocalQuery":
+        if "(" in columns:
+            raise NotImplementedError("Embedded resources are not supported by the local backend")
+        self.columns = None if columns.strip() == "*" else [c.strip() for c in columns.split(",")]
+        return self
+
+    def insert(self, rows: Any, **kwargs) -> "LocalQuery":
+        self.operation, self.payload = "insert", rows
+        return self
+
+    def update(self, values: Dict[str, Any], **kwargs) -> "LocalQuery":
+        self.operation, self.payload = "update", values
+        return self
+
+    def upsert(self, rows: Any, on_conflict: str = "", **kwargs) -> "LocalQuery":
+        self.operation, self.payload = "upsert", rows
+        self.on_conflict = [c.strip() for c in on_conflict.split(",") if c.strip()] or ["id"]
+        return self
+
+    # Filters
+
+    def _filter(self, column: str, operator: str, target: Any) -> "LocalQuery":
+        compare = _OPERATORS[operator]
+        self.filters.append(lambda row: compare(row.get(column), _coerce(row.get(column), target)))
+        return self
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        if self.lookup is None:
+            self.lookup = (column, [value])
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "lte", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "LocalQuery":
+        targets = set(values)
+        if self.lookup is None:
+            self.lookup = (column, list(targets))
+        self.filters.append(lambda row: row.get(column) in targets)
+        return self
+
+    def filter(self, column: str, operator: str, criteria: str) -> "LocalQuery":
+        """
+        Apply a filter given in PostgREST's text form, as sent over HTTP
+
+        Args:
+            column: Column name
+            operator: PostgREST operator (eq, neq, gt, gte, lt, lte or in)
+            criteria: Value text, e.g. "42" or '(a,b,"c,d")' for in
+
+        Returns:
+            LocalQuery: This query
+        """
+        if operator == "in":
+            return self.in_(column, next(csv.reader([criteria.strip("()")])) if criteria.strip("()") else [])
+        if operator not in _OPERATORS:
+            raise NotImplementedError(f"Operator {operator} is not supported by the local backend")
+        return getattr(self, operator)(column, criteria)
+
+    def or_(self, expression: str) -> "LocalQuery":
+        clauses = []
+        for clause in expression.split(","):
+            column, operator, target = clause.split(".", 2)
+            clauses.append((column, _OPERATORS[operator], target))
+        self.filters.append(lambda row: any(
+            compare(row.get(column), _coerce(row.get(column), target))
+            for column, compare, target in clauses
+        ))
+        return self
+
+    # Modifiers
+
+    def order(self, column: str, desc: bool = False, **kwargs) -> "LocalQuery":
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, count: int) -> "LocalQuery":
+        self.bounds = (self.bounds[0], self.bounds[0] + count)
+        return self
+
+    def range(self, start: int, end: int) -> "LocalQuery":
+        self.bounds = (start, end + 1)
+        return self
+
+    # Execution
+
+    def _matching(self) -> List[Dict[str, Any]]:
+        if self.lookup is None:
+            candidates = self.backend.tables[self.table]
+        else:
+            # Narrow to rows matching the first eq/in_ filter through a hash index
+            column, values = self.lookup
+            rows = self.backend.tables[self.table]
+            stored = rows[0].get(column) if rows else None
+            index = self.backend.index(self.table, (column,))
+            candidates = [row for value in values for row in index.get((_coerce(stored, value),), ())]
+        return [row for row in candidates if all(f(row) for f in self.filters)]
+
+    def execute(self) -> LocalResponse:
+        """Run the query against the in-memory tables"""
+        self.backend.query_count += 1
+        if self.operation == "select":
+            return LocalResponse(self._select())
+        if self.operation == "update":
+            rows = self._matching()
+            for row in rows:
+                row.update({k: _to_json(v) for k, v in self.payload.items()})
+                self.backend.stamp(self.table, row)
+            self.backend._modified(self.table, self.payload)
+            return LocalResponse([dict(row) for row in rows])
+
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        written = [self.backend.write(self.table, row, self.on_conflict) for row in rows]
+        return LocalResponse([dict(row) for row in written])
+
+    def _select(self) -> List[Dict[str, Any]]:
+        rows = self._matching()
+        for column, desc in reversed(self.ordering):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        start, end = self.bounds
+        rows = rows[start:end]
+        if self.columns is None:
+            return [dict(row) for row in rows]
+        return [{column: row.get(column) for column in self.columns} for row in rows]
+
+
+class LocalRpc:
+    """Call of a database function"""
+
+    def __init__(self, backend: "LocalSupabase", name: str, params: Dict[str, Any]):
+        self.backend = backend
+        self.name = name
+        self.params = params
+
+    def execute(self) -> LocalResponse:
+        self.backend.query_count += 1
+        if self.name == "bump_data_version":
+            return LocalResponse(self.backend.bump_version(self.params.get("version_key", "projections")))
+        if self.name == "bump_data_versions":
+            keys = dict.fromkeys(self.params["version_keys"])
+            return LocalResponse([{"key": key, "version": self.backend.bump_version(key)} for key in keys])
+        raise NotImplementedError(f"Unknown function {self.name}")
+
+
+class LocalSupabase:
+    """
+    In-memory database with a supabase-py compatible client surface
+
+    Pass an instance to NBARepository(client=...) to run repository code
+    against it.
+    """
+
+    TABLES = ("teams", "players", "games", "player_stats", "player_projections", "data_versions")
+
+    def __init__(self):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {name: [] for name in self.TABLES}
+        self._next_id: Dict[str, int] = {}
+        self._indexes: Dict[str, Dict[Tuple[str, ...], Dict[tuple, List[Dict[str, Any]]]]] = {}
+        self.query_count = 0
+
+    def table(self, name: str) -> LocalQuery:
+        """Start a query on a table"""
+        return LocalQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None) -> LocalRpc:
+        """Call a database function"""
+        return LocalRpc(self, name, params or {})
+
+    def index(self, table: str, columns: Tuple[str, ...]) -> Dict[tuple, List[Dict[str, Any]]]:
+        """
+        Hash index of a table on some columns, built on first use
+
+        Args:
+            table: Table name
+            columns: Indexed columns
+
+        Returns:
+            Dict[tuple, List[Dict[str, Any]]]: Rows keyed by their column values
+        """
+        indexes = self._indexes.setdefault(table, {})
+        if columns not in indexes:
+            index: Dict[tuple, List[Dict[str, Any]]] = {}
+            for row in self.tables[table]:
+                index.setdefault(tuple(row.get(c) for c in columns), []).append(row)
+            indexes[columns] = index
+        return indexes[columns]
+
+    def _modified(self, table: str, changed: Iterable[str]) -> None:
+        """Drop indexes covering columns whose values changed in place"""
+        changed = set(changed)
+        indexes = self._indexes.get(table, {})
+        for columns in [c for c in indexes if changed.intersection(c)]:
+            del indexes[columns]
+
+    def write(self, table: str, row: Dict[str, Any], conflict: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Insert a row, or replace the row matching the conflict columns
+
+        Args:
+            table: Table name
+            row: Row to write
+            conflict: Columns identifying an existing row to replace
+
+        Returns:
+            Dict[str, Any]: Stored row
+        """
+        row = self.stamp(table, {key: _to_json(value) for key, value in row.items()})
+        if conflict:
+            matches = self.index(table, tuple(conflict)).get(tuple(row.get(c) for c in conflict))
+            if matches:
+                existing = matches[0]
+                changes = {k: v for k, v in row.items() if k != "id" and existing.get(k) != v}
+                existing.update(changes)
+                self._modified(table, changes)
+                return existing
+
+        if row.get("id") is None and table in ("player_stats", "player_projections"):
+            self._next_id[table] = self._next_id.get(table, 0) + 1
+            row["id"] = self._next_id[table]
+        self.tables[table].append(row)
+        for columns, index in self._indexes.get(table, {}).items():
+            index.setdefault(tuple(row.get(c) for c in columns), []).append(row)
+        return row
+
+    def stamp(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Set the table's write timestamp on a row, as a database trigger would"""
+        column = _WRITE_STAMPS.get(table)
+        if column:
+            row[column] = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+        return row
+
+    def bump_version(self, key: str) -> int:
+        """Increment a data version counter"""
+        for row in self.tables["data_versions"]:
+            if row["key"] == key:
+                row["version"] += 1
+                return row["version"]
+        self.write("data_versions", {"key": key, "version": 1})
+        return 1
+
+    @classmethod
+    def from_league(cls, league: SyntheticLeague) -> "LocalSupabase":
+        """
+        Load a synthetic league
+
+        Args:
+            league: Generated league
+
+        Returns:
+            LocalSupabase: Backend holding the league's teams, players, games and stats
+        """
+        backend = cls()
+        for table, models in (
+            ("teams", league.teams),
+            ("players", league.players),
+            ("games", league.games),
+            ("player_stats", league.stats),
+        ):
+            for model in models:
+                backend.write(table, model.model_dump())
+        backend.tables["data_versions"].append({"key": "projections", "version": 1})
+        return backend
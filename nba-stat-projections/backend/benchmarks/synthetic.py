@@ -0,0 +1,254 @@
+"""
+Deterministic synthetic league for benchmarks and load tests
+
+Builds 30 teams, 15-man rosters, a full round-robin schedule and a box
+score line for every rostered player in every game, all from one seed, so
+benchmark runs on different machines and days work on identical data.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from app.models.schemas import Team, Player, Game, PlayerStats
+
+# League shape
+N_TEAMS = 30
+PLAYERS_PER_TEAM = 15
+GAMES_PER_TEAM = 82
+
+SEASON_ID = "22024"
+SEASON_START = datetime(2024, 10, 22, 19, 30)
+
+# Typical minutes by rotation slot (starters first, end of bench last)
+ROTATION_MINUTES = (34, 33, 32, 30, 28, 24, 22, 20, 17, 14, 10, 8, 5, 3, 2)
+
+POSITIONS = ("G", "G", "F", "F", "C")
+
+
+class Slate(NamedTuple):
+    """One day's games with every rostered player's prior history"""
+    games: List[Game]
+    player_ids: List[str]
+    game_ids: List[str]
+    is_home: List[bool]
+    histories: List[List[PlayerStats]]
+
+
+class SyntheticLeague(NamedTuple):
+    """A generated league"""
+    teams: List[Team]
+    players: List[Player]
+    games: List[Game]
+    stats: List[PlayerStats]
+
+    def stats_by_player(self) -> Dict[str, List[PlayerStats]]:
+        """Box score lines keyed by player ID"""
+        histories: Dict[str, List[PlayerStats]] = {player.id: [] for player in self.players}
+        for stats in self.stats:
+            histories[stats.player_id].append(stats)
+        return histories
+
+    def games_on(self, day: int) -> List[Game]:
+        """Games on the given day of the schedule (0 = opening night)"""
+        game_date = (self.games[0].game_date + timedelta(days=day)).date()
+        return [game for game in self.games if game.game_date.date() == game_date]
+
+    def slate(self, day: int) -> Slate:
+        """
+        Games on a day of the schedule with histories truncated to earlier games
+
+        Args:
+            day: Day of the schedule (0 = opening night)
+
+        Returns:
+            Slate: The day's games and, for every player in them, their game,
+                side and box scores from before the slate
+        """
+        games = self.games_on(day)
+        first_game_id = min(game.id for game in games)
+        histories: Dict[str, List[PlayerStats]] = {}
+        for stats in self.stats:
+            if stats.game_id < first_game_id:
+                histories.setdefault(stats.player_id, []).append(stats)
+
+        sides = {}
+        for game in games:
+            sides[game.home_team_id] = (game.id, True)
+            sides[game.visitor_team_id] = (game.id, False)
+
+        players = [player for player in self.players if player.team_id in sides]
+        return Slate(
+            games=games,
+            player_ids=[player.id for player in players],
+            game_ids=[sides[player.team_id][0] for player in players],
+            is_home=[sides[player.team_id][1] for player in players],
+            histories=[histories.get(player.id, []) for player in players],
+        )
+
+
+def generate_teams() -> List[Team]:
+    """Generate the league's teams"""
+    return [
+        Team(
+            id=str(1610612737 + i),
+            full_name=f"Synthetic City {i} Team {i}",
+            abbreviation=f"S{i:02d}",
+            nickname=f"Team {i}",
+            city=f"Synthetic City {i}",
+            state=f"State {i % 20}",
+            year_founded=1946 + i
+        )
+        for i in range(N_TEAMS)
+    ]
+
+
+def generate_players(teams: List[Team], rng: random.Random) -> List[Player]:
+    """Generate a full roster for every team"""
+    players = []
+    for t, team in enumerate(teams):
+        for slot in range(PLAYERS_PER_TEAM):
+            number = t * PLAYERS_PER_TEAM + slot
+            players.append(Player(
+                id=str(1630000 + number),
+                first_name=f"First{number}",
+                last_name=f"Last{number}",
+                full_name=f"First{number} Last{number}",
+                is_active=True,
+                team_id=team.id,
+                jersey_number=str(rng.randint(0, 99)),
+                position=POSITIONS[slot % len(POSITIONS)],
+                height=f"6-{rng.randint(0, 11)}",
+                weight=str(rng.randint(180, 260))
+            ))
+    return players
+
+
+def generate_schedule(
+    teams: List[Team],
+    games_per_team: int = GAMES_PER_TEAM,
+    start: datetime = SEASON_START
+) -> List[Game]:
+    """
+    Generate a round-robin schedule, one round per day
+
+    Uses the circle method, so every team plays exactly once per round and
+    exactly games_per_team games overall. Game IDs sort chronologically,
+    which the models rely on when ordering histories.
+    """
+    team_ids = [team.id for team in teams]
+    n = len(team_ids)
+    games = []
+    for round_index in range(games_per_team):
+        rotation = round_index % (n - 1)
+        order = [team_ids[0]] + team_ids[1:][rotation:] + team_ids[1:][:rotation]
+        game_date = start + timedelta(days=round_index)
+        for i in range(n // 2):
+            first, second = order[i], order[n - 1 - i]
+            home, visitor = (first, second) if (round_index + i) % 2 == 0 else (second, first)
+            games.append(Game(
+                id=f"00224{len(games) + 1:05d}",
+                season_id=SEASON_ID,
+                season_type="Regular Season",
+                game_date=game_date,
+                home_team_id=home,
+                visitor_team_id=visitor,
+                home_team_score=None,
+                visitor_team_score=None,
+                status="Final"
+            ))
+    return games
+
+
+def generate_stats(players: List[Player], games: List[Game], seed: int) -> List[PlayerStats]:
+    """
+    Generate a box score line for every rostered player in every game
+
+    Each player gets fixed per-minute rates; game lines draw minutes around
+    the player's rotation slot, counting stats from Poisson distributions and
+    makes from binomials, with points following from the shooting line, so
+    histories have realistic spread and occasional zero-minute games.
+    """
+    rng = np.random.default_rng(seed)
+    roster: Dict[str, List[int]] = {}
+    for index, player in enumerate(players):
+        roster.setdefault(player.team_id, []).append(index)
+
+    n_players = len(players)
+    slot = np.array([i % PLAYERS_PER_TEAM for i in range(n_players)])
+    base_minutes = np.array(ROTATION_MINUTES, dtype=float)[slot]
+    rates = {
+        'assists': rng.uniform(0.02, 0.30, n_players),
+        'rebounds': rng.uniform(0.08, 0.40, n_players),
+        'steals': rng.uniform(0.01, 0.06, n_players),
+        'blocks': rng.uniform(0.0, 0.08, n_players),
+        'turnovers': rng.uniform(0.02, 0.10, n_players),
+    }
+    shot_rate = rng.uniform(0.25, 0.60, n_players)
+    three_share = rng.uniform(0.05, 0.55, n_players)
+    free_throw_rate = rng.uniform(0.02, 0.25, n_players)
+    fg_pct = rng.uniform(0.40, 0.58, n_players)
+    three_pct = rng.uniform(0.28, 0.42, n_players)
+    ft_pct = rng.uniform(0.60, 0.92, n_players)
+
+    stats = []
+    for game in games:
+        for team_id in (game.home_team_id, game.visitor_team_id):
+            index = np.array(roster[team_id])
+            minutes = np.clip(rng.normal(base_minutes[index], 4.0), 0, 48).round()
+            draws = {name: rng.poisson(rate[index] * minutes) for name, rate in rates.items()}
+            fga = rng.poisson(shot_rate[index] * minutes)
+            three_pa = rng.binomial(fga, three_share[index])
+            fgm = rng.binomial(fga, fg_pct[index])
+            three_pm = np.minimum(rng.binomial(three_pa, three_pct[index]), fgm)
+            fta = rng.poisson(free_throw_rate[index] * minutes)
+            ftm = rng.binomial(fta, ft_pct[index])
+            points = 2 * fgm + three_pm + ftm
+            plus_minus = rng.integers(-20, 21, len(index))
+
+            for k, player_index in enumerate(index):
+                stats.append(PlayerStats(
+                    player_id=players[player_index].id,
+                    game_id=game.id,
+                    team_id=team_id,
+                    minutes=float(minutes[k]),
+                    points=int(points[k]),
+                    assists=int(draws['assists'][k]),
+                    rebounds=int(draws['rebounds'][k]),
+                    steals=int(draws['steals'][k]),
+                    blocks=int(draws['blocks'][k]),
+                    turnovers=int(draws['turnovers'][k]),
+                    field_goals_made=int(fgm[k]),
+                    field_goals_attempted=int(fga[k]),
+                    three_pointers_made=int(three_pm[k]),
+                    three_pointers_attempted=int(three_pa[k]),
+                    free_throws_made=int(ftm[k]),
+                    free_throws_attempted=int(fta[k]),
+                    plus_minus=float(plus_minus[k])
+                ))
+    return stats
+
+
+def generate_league(
+    seed: int = 0,
+    games_per_team: int = GAMES_PER_TEAM,
+    start: datetime = SEASON_START
+) -> SyntheticLeague:
+    """
+    Generate a complete synthetic league
+
+    Args:
+        seed: Seed for every random draw
+        games_per_team: Season length (82 for a full season)
+        start: Tip-off time of opening night; later rounds follow daily
+
+    Returns:
+        SyntheticLeague: Teams, players, schedule and box scores
+    """
+    rng = random.Random(seed)
+    teams = generate_teams()
+    players = generate_players(teams, rng)
+    games = generate_schedule(teams, games_per_team, start)
+    stats = generate_stats(players, games, seed)
+    return SyntheticLeague(teams, players, games, stats)
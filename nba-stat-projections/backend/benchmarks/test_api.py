@@ -0,0 +1,50 @@
+"""
+Benchmarks for API endpoints served from the in-memory backend
+"""
+
+
+def test_game_projections_endpoint(benchmark, api_client, slate):
+    """GET /games/{game_id}/projections"""
+    url = f"/api/projections/games/{slate.game_ids[0]}/projections"
+
+    response = benchmark(api_client.get, url)
+    assert response.status_code == 200 and response.json()
+
+
+def test_player_projections_endpoint(benchmark, api_client, slate):
+    """GET /players/{player_id}/projections"""
+    url = f"/api/projections/players/{slate.player_ids[0]}/projections"
+
+    response = benchmark(api_client.get, url)
+    assert response.status_code == 200 and len(response.json()) == 1
+
+
+def test_batch_endpoint(benchmark, api_client, slate):
+    """POST /batch for a 10-player comparison"""
+    body = {"player_ids": slate.player_ids[:10]}
+
+    response = benchmark(api_client.post, "/api/projections/batch", json=body)
+    assert response.status_code == 200 and len(response.json()) == 10
+
+
+def test_players_endpoint(benchmark, api_client):
+    """GET /players, one 500-row page"""
+    response = benchmark(api_client.get, "/api/projections/players")
+    assert response.status_code == 200 and len(response.json()) == 450
+
+
+def test_games_by_date_endpoint(benchmark, api_client, slate):
+    """GET /games?date=..."""
+    url = f"/api/projections/games?date={slate.games[0].game_date.date().isoformat()}"
+
+    response = benchmark(api_client.get, url)
+    assert response.status_code == 200 and len(response.json()) == len(slate.games)
+
+
+def test_player_search_endpoint(benchmark, api_client, league):
+    """GET /players/search for a name prefix"""
+    player = league.players[0]
+    url = f"/api/projections/players/search?q={player.full_name[:-1]}&active_only=false"
+
+    response = benchmark(api_client.get, url)
+    assert response.status_code == 200 and response.json()[0]["player"]["id"] == player.id
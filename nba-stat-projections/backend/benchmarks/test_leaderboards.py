@@ -0,0 +1,51 @@
+"""
+Benchmarks for incrementally maintained stat leaderboards
+"""
+import pytest
+
+from app.projections.algorithms import MovingAverageModel
+from app.projections.leaderboards import Leaderboards
+
+MODEL_VERSION = MovingAverageModel().model_version
+
+
+@pytest.fixture(scope="module")
+def projections(slate):
+    """Projections for every player on the slate"""
+    return MovingAverageModel().project_many(slate.player_ids, slate.game_ids, slate.histories, slate.is_home)
+
+
+@pytest.fixture
+def boards(slate, projections) -> Leaderboards:
+    """Fresh boards holding the slate"""
+    boards = Leaderboards()
+    boards.reset(slate.games[0].game_date.date(), slate.games)
+    boards.apply(projections)
+    return boards
+
+
+def test_build_boards(benchmark, slate, projections):
+    """Ranking a whole slate on every stat"""
+    def build():
+        boards = Leaderboards()
+        boards.reset(slate.games[0].game_date.date(), slate.games)
+        boards.apply(projections)
+        return boards
+
+    boards = benchmark(build)
+    assert len(boards) == len(projections)
+
+
+def test_upsert_game(benchmark, boards, projections, slate):
+    """Re-ranking one regenerated game, as an upsert does"""
+    game_id = slate.game_ids[0]
+    game = [p.model_copy(update={"projected_points": p.projected_points + 1}) for p in projections if p.game_id == game_id]
+
+    applied = benchmark(boards.apply, game)
+    assert applied == len(game)
+
+
+def test_top_ten(benchmark, boards, projections):
+    """Top 10 scorers on the slate"""
+    top = benchmark(boards.top, "points", [MODEL_VERSION], 10)
+    assert [value for _, value in top] == sorted((p.projected_points for p in projections), reverse=True)[:10]
@@ -0,0 +1,53 @@
+"""
+Benchmarks for projection models
+"""
+import pytest
+
+from app.projections.algorithms import MovingAverageModel, stack_frame, stack_histories
+from app.projections.registry import model_registry
+from app.projections.simulation import ProjectionDistribution
+
+MODEL_VERSIONS = ("moving_avg_0.1.0", "ewma_0.1.0", "regression_0.1.0", "ensemble_0.1.0")
+
+
+def test_moving_average_project(benchmark, slate):
+    """One player, one game: the per-call path used by generate_projection"""
+    model = MovingAverageModel()
+    history = max(slate.histories, key=len)
+
+    projection = benchmark(
+        model.project, slate.player_ids[0], slate.game_ids[0], history, "opponent", slate.is_home[0]
+    )
+    assert projection.model_version == model.model_version
+
+
+def test_stack_histories(benchmark, slate):
+    """Stacking a slate's box scores into the models' window array"""
+    values, counts = benchmark(stack_histories, slate.histories, 10)
+    assert values.shape == (len(slate.histories), 10, values.shape[2]) and counts.max() == 10
+
+
+def test_stack_frame(benchmark, slate):
+    """The same stack built from a pandas DataFrame through the optional adapter"""
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame([stats.model_dump() for history in slate.histories for stats in history])
+
+    values, counts = benchmark(stack_frame, frame, slate.player_ids, 10)
+    assert counts.max() == 10
+
+
+@pytest.mark.parametrize("model_version", MODEL_VERSIONS)
+def test_project_slate(benchmark, slate, model_version):
+    """Every rostered player on a 15-game slate in one batched call"""
+    model = model_registry.get(model_version)
+
+    projections = benchmark(model.project_many, slate.player_ids, slate.game_ids, slate.histories, slate.is_home)
+    assert len(projections) == len(slate.player_ids)
+
+
+def test_simulate_slate(benchmark, slate):
+    """Monte Carlo quantiles for a full slate"""
+    projections = MovingAverageModel().project_many(slate.player_ids, slate.game_ids, slate.histories, slate.is_home)
+
+    distribution = benchmark(ProjectionDistribution.simulate, projections)
+    assert distribution.samples.shape[0] == len(projections)
@@ -0,0 +1,39 @@
+"""
+Benchmarks for the player name search index
+"""
+import pytest
+
+from app.data.player_search import PlayerSearchIndex
+
+
+@pytest.fixture(scope="module")
+def index(league) -> PlayerSearchIndex:
+    """Index over every player in the league"""
+    index = PlayerSearchIndex()
+    index.build(league.players)
+    return index
+
+
+def test_build_index(benchmark, league):
+    """Indexing the whole league, paid at start-up and on roster changes"""
+    index = PlayerSearchIndex()
+
+    benchmark(index.build, league.players)
+    assert len(index) == len(league.players)
+
+
+def test_search_prefix(benchmark, index, league):
+    """A partly typed name, matched by prefix"""
+    player = league.players[0]
+
+    matches = benchmark(index.search, player.full_name[:-1].lower())
+    assert matches[0][0].id == player.id
+
+
+def test_search_fuzzy(benchmark, index, league):
+    """A misspelled name, matched by trigram similarity"""
+    player = league.players[0]
+    misspelled = player.full_name.replace("i", "y", 1)
+
+    matches = benchmark(index.search, misspelled)
+    assert matches[0][0].id == player.id
@@ -0,0 +1,41 @@
+"""
+Benchmarks for repository round trips against the in-memory backend
+"""
+
+
+def test_get_players_page(benchmark, repository, run):
+    """One 500-row keyset page of players"""
+    rows = benchmark(lambda: run(repository.get_players_page(limit=500)))
+    assert len(rows) == 450
+
+
+def test_get_game_projections(benchmark, repository, slate, run):
+    """All projections for one game"""
+    game_id = slate.game_ids[0]
+
+    projections = benchmark(lambda: run(repository.get_player_projections(game_id=game_id)))
+    assert projections
+
+
+def test_get_projections_batch(benchmark, repository, slate, run):
+    """Projections for a 10-player comparison"""
+    player_ids = slate.player_ids[:10]
+
+    projections = benchmark(lambda: run(repository.get_projections_batch(player_ids=player_ids)))
+    assert len(projections) == 10
+
+
+def test_get_player_stats_batch(benchmark, repository, slate, run):
+    """Season histories for both rosters of one game"""
+    player_ids = [p for p, g in zip(slate.player_ids, slate.game_ids) if g == slate.game_ids[0]]
+
+    histories = benchmark(lambda: run(repository.get_player_stats_batch(player_ids)))
+    assert len(histories) == len(player_ids)
+
+
+def test_upsert_slate_projections(benchmark, repository, slate, run):
+    """Rewriting a full slate of projections in place"""
+    projections = run(repository.get_projections_batch(game_ids=[game.id for game in slate.games]))
+
+    written = benchmark(lambda: run(repository.upsert_player_projections(projections)))
+    assert len(written) == len(projections)
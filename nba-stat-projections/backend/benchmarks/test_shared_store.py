@@ -0,0 +1,55 @@
+"""
+Benchmarks for projection snapshots and the shared-memory store built from them
+"""
+import pytest
+
+from app.data.shared_store import SharedStore
+from app.data.snapshot import ProjectionSnapshot, read_date, write_snapshot
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory, run, repository, slate) -> SharedStore:
+    """Store built for the slate's date"""
+    store = SharedStore(str(tmp_path_factory.mktemp("store")), snapshot_dir="")
+    run(store.rebuild(repository, slate.games[0].game_date.date(), 0))
+    return store
+
+
+def test_rebuild_store(benchmark, run, repository, slate, tmp_path):
+    """Reading a slate from the database and writing the store, paid once per data version"""
+    store = SharedStore(str(tmp_path), snapshot_dir="")
+    day = slate.games[0].game_date.date()
+
+    benchmark(lambda: run(store.rebuild(repository, day, 0)))
+    assert ProjectionSnapshot(store.path).date == day
+
+
+def test_write_snapshot(benchmark, run, repository, slate, tmp_path):
+    """Encoding a slate already in memory, as the pipeline does after generating it"""
+    day = slate.games[0].game_date.date()
+    games, teams, players, projections = run(read_date(repository, day))
+    path = str(tmp_path / "slate.snap")
+
+    benchmark(write_snapshot, path, day, 0, games, teams, players, projections)
+    assert ProjectionSnapshot(path).rows == len(projections)
+
+
+def test_attach_store(benchmark, store, slate):
+    """Mapping the store and reading its header, paid by each worker per data version"""
+    snapshot = benchmark(ProjectionSnapshot, store.path)
+    assert all(snapshot.has_game(game_id) for game_id in slate.game_ids)
+
+
+def test_store_slate_reads(benchmark, run, store, slate):
+    """Every projection on the slate and its player, read from the mapping"""
+    snapshot = ProjectionSnapshot(store.path)
+
+    async def read_slate():
+        rows = []
+        for game_id in sorted(set(slate.game_ids)):
+            for projection in await snapshot.get_player_projections(game_id):
+                rows.append((projection, await snapshot.get_player(projection.player_id)))
+        return rows
+
+    rows = benchmark(lambda: run(read_slate()))
+    assert len(rows) == len(slate.player_ids)
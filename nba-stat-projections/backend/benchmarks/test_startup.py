@@ -0,0 +1,46 @@
+"""
+Benchmarks for API cold start: importing the app in a fresh interpreter
+"""
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies only model compute and NBA API ingestion need; the API must start without them
+DEFERRED_MODULES = ("numpy", "pandas", "nba_api")
+
+_IMPORT_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "loaded": [name for name in {DEFERRED_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def import_app():
+    """Import app.main in a new interpreter and report what it cost"""
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_app(benchmark):
+    """Interpreter start plus import app.main, as paid by a new pod"""
+    report = benchmark.pedantic(import_app, rounds=5, iterations=1, warmup_rounds=1)
+    benchmark.extra_info["import_seconds"] = report["seconds"]
+    assert report["loaded"] == []
+
+
+def test_heavy_modules_deferred():
+    """numpy, pandas and nba_api are not imported until first used"""
+    assert import_app()["loaded"] == []
@@ -0,0 +1,191 @@
+"""
+PostgREST-compatible HTTP stub serving a synthetic league
+
+Answers the REST calls supabase-py makes (table reads with filters,
+ordering and paging, inserts, upserts, updates and RPCs) from an
+in-memory LocalSupabase, after an injected delay standing in for the
+network and database. Point SUPABASE_URL at it to run the real app,
+including its HTTP client, without a Supabase project:
+
+    python -m loadtest.postgrest_stub --port 54321 --latency-ms 5
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+# Add the backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.projections.algorithms import MovingAverageModel
+from benchmarks.local_backend import LocalQuery, LocalRpc, LocalSupabase
+from benchmarks.synthetic import generate_league
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Day of the synthetic season served as today's slate
+SLATE_DAY = 60
+
+# Query parameters that are not filters
+_RESERVED_PARAMS = ("select", "order", "limit", "offset", "or", "on_conflict", "columns")
+
+
+def build_backend(seed: int = 0, slate_day: int = SLATE_DAY) -> LocalSupabase:
+    """
+    Build a backend whose slate day falls on today's date
+
+    The synthetic season is shifted so that its slate day is today and
+    projections exist for every player on it, which gives /today, game and
+    player projection endpoints real data to serve.
+
+    Args:
+        seed: Synthetic league seed
+        slate_day: Day of the season to place on today's date
+
+    Returns:
+        LocalSupabase: Backend holding the league and today's projections
+    """
+    start = datetime.combine(datetime.now().date() - timedelta(days=slate_day), time(19, 30))
+    league = generate_league(seed=seed, start=start)
+    slate = league.slate(slate_day)
+
+    backend = LocalSupabase.from_league(league)
+    projections = MovingAverageModel().project_many(slate.player_ids, slate.game_ids, slate.histories, slate.is_home)
+    for projection in projections:
+        backend.write("player_projections", projection.model_dump())
+    return backend
+
+
+def _json_response(data: Any, status_code: int = 200) -> Response:
+    return Response(orjson.dumps(data), status_code=status_code, media_type="application/json")
+
+
+def _error(status_code: int, code: str, message: str) -> Response:
+    """Error body in PostgREST's format, which supabase-py raises as APIError"""
+    return _json_response({"code": code, "message": message, "details": None, "hint": None}, status_code)
+
+
+def apply_params(query: LocalQuery, params: List[Tuple[str, str]]) -> LocalQuery:
+    """
+    Apply PostgREST query parameters to a local query
+
+    Args:
+        query: Query to build on
+        params: Query string pairs, in order
+
+    Returns:
+        LocalQuery: The query with filters, ordering and paging applied
+    """
+    limit: Optional[int] = None
+    offset = 0
+    for key, value in params:
+        if key == "select":
+            query.select(value)
+        elif key == "order":
+            for term in value.split(","):
+                column, *modifiers = term.split(".")
+                query.order(column, desc="desc" in modifiers)
+        elif key == "limit":
+            # supabase-py sends limit twice when range() follows limit(); the last wins
+            limit = int(value)
+        elif key == "offset":
+            offset = int(value)
+        elif key == "or":
+            query.or_(value.strip("()"))
+        elif key not in _RESERVED_PARAMS:
+            operator, _, criteria = value.partition(".")
+            query.filter(key, operator, criteria)
+
+    if limit is not None:
+        query.range(offset, offset + limit - 1)
+    elif offset:
+        query.range(offset, 1 << 62)
+    return query
+
+
+def create_app(backend: LocalSupabase, latency_ms: float = 0.0, jitter: float = 0.0) -> Starlette:
+    """
+    Create the stub's ASGI app
+
+    Args:
+        backend: In-memory database to serve
+        latency_ms: Delay added to every request
+        jitter: Relative spread of the delay (0.2 = +/-20%)
+
+    Returns:
+        Starlette: App serving /rest/v1
+    """
+    async def delay() -> None:
+        if latency_ms > 0:
+            spread = latency_ms * jitter
+            await asyncio.sleep(max(0.0, random.uniform(latency_ms - spread, latency_ms + spread)) / 1000)
+
+    async def table_endpoint(request: Request) -> Response:
+        table = request.path_params["table"]
+        if table not in backend.tables:
+            return _error(404, "42P01", f'relation "public.{table}" does not exist')
+
+        await delay()
+        query = LocalQuery(backend, table)
+        try:
+            if request.method == "POST":
+                rows = orjson.loads(await request.body())
+                if "resolution=merge-duplicates" in request.headers.get("prefer", ""):
+                    query.upsert(rows, on_conflict=request.query_params.get("on_conflict", ""))
+                else:
+                    query.insert(rows)
+                return _json_response(query.execute().data, 201)
+            if request.method == "PATCH":
+                query.update(orjson.loads(await request.body()))
+            apply_params(query, request.query_params.multi_items())
+            return _json_response(query.execute().data)
+        except NotImplementedError as e:
+            return _error(400, "PGRST100", str(e))
+
+    async def rpc_endpoint(request: Request) -> Response:
+        await delay()
+        body = await request.body()
+        try:
+            result = LocalRpc(backend, request.path_params["name"], orjson.loads(body) if body else {}).execute()
+        except NotImplementedError as e:
+            return _error(404, "PGRST202", str(e))
+        return _json_response(result.data)
+
+    return Starlette(routes=[
+        Route("/rest/v1/rpc/{name}", rpc_endpoint, methods=["POST"]),
+        Route("/rest/v1/{table}", table_endpoint, methods=["GET", "POST", "PATCH"]),
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PostgREST-compatible stub serving a synthetic league")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Delay added to every request")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Relative spread of the delay")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic league seed")
+    args = parser.parse_args()
+
+    backend = build_backend(seed=args.seed)
+    logger.info(
+        f"Serving {len(backend.tables['players'])} players, {len(backend.tables['games'])} games and "
+        f"{len(backend.tables['player_projections'])} projections with {args.latency_ms}ms latency"
+    )
+    uvicorn.run(create_app(backend, args.latency_ms, args.jitter), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
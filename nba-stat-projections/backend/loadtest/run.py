@@ -0,0 +1,387 @@
+"""
+Load test the API at several worker counts
+
+Starts the PostgREST stub (with injected latency), then for each worker
+count starts the app under uvicorn pointed at the stub, drives a weighted
+mix of /today, game projection and player projection requests from
+concurrent clients, and reports throughput and latency percentiles.
+
+Run from the backend directory:
+
+    python -m loadtest.run --workers 1,2,4 --concurrency 64 --duration 30
+    python -m loadtest.run --mix today=1,game=3,player=6 --latency-ms 20 --json results.json
+
+Clients run in their own processes (--client-processes) so the load
+generator is not the bottleneck; the stub is a single process, so at high
+worker counts check that its latency, not its CPU, dominates.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import httpx
+import orjson
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Relative weights of the endpoints in each named traffic mix
+TRAFFIC_MIXES: Dict[str, Dict[str, float]] = {
+    # Site traffic: landing page, then drilling into games and players
+    "default": {"today": 0.2, "game": 0.4, "player": 0.4},
+    # Slate lock: everyone refreshing the full slate
+    "slate": {"today": 0.6, "game": 0.3, "player": 0.1},
+    # Research: player pages dominate
+    "player": {"today": 0.05, "game": 0.15, "player": 0.8},
+}
+
+PERCENTILES = (50, 90, 99)
+
+
+class Targets(NamedTuple):
+    """IDs with projections to request"""
+    player_ids: List[str]
+    game_ids: List[str]
+
+
+class Sample(NamedTuple):
+    """One request's outcome"""
+    endpoint: str
+    seconds: float
+    status: int
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """
+    Parse a traffic mix name or "endpoint=weight,..." spec
+
+    Args:
+        value: Mix name (see TRAFFIC_MIXES) or weights, e.g. "today=1,game=2,player=1"
+
+    Returns:
+        Dict[str, float]: Weight per endpoint
+    """
+    if value in TRAFFIC_MIXES:
+        return TRAFFIC_MIXES[value]
+
+    mix = {}
+    for term in value.split(","):
+        endpoint, _, weight = term.partition("=")
+        if endpoint not in TRAFFIC_MIXES["default"]:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint {endpoint}; expected today, game or player")
+        mix[endpoint] = float(weight or 1)
+    return mix
+
+
+def request_path(endpoint: str, targets: Targets, rng: random.Random) -> str:
+    """Path of a request to an endpoint for a random target"""
+    if endpoint == "today":
+        return "/api/projections/today"
+    if endpoint == "game":
+        return f"/api/projections/games/{rng.choice(targets.game_ids)}/projections"
+    return f"/api/projections/players/{rng.choice(targets.player_ids)}/projections"
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of pre-sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples: Sequence[Sample], duration: float) -> Dict[str, Dict[str, float]]:
+    """
+    Throughput and latency percentiles per endpoint and overall
+
+    Args:
+        samples: Measured requests
+        duration: Length of the measured window in seconds
+
+    Returns:
+        Dict[str, Dict[str, float]]: Stats keyed by endpoint, plus "all"
+    """
+    groups: Dict[str, List[Sample]] = {"all": list(samples)}
+    for sample in samples:
+        groups.setdefault(sample.endpoint, []).append(sample)
+
+    summary = {}
+    for name, group in groups.items():
+        latencies = sorted(s.seconds * 1000 for s in group if s.status == 200)
+        stats = {
+            "requests": len(group),
+            "errors": sum(1 for s in group if s.status != 200),
+            "rps": len(latencies) / duration,
+        }
+        for pct in PERCENTILES:
+            stats[f"p{pct}_ms"] = percentile(latencies, pct)
+        stats["max_ms"] = latencies[-1] if latencies else 0.0
+        summary[name] = stats
+    return summary
+
+
+async def _client_loop(
+    client: httpx.AsyncClient,
+    mix: Dict[str, float],
+    targets: Targets,
+    rng: random.Random,
+    measure_from: float,
+    deadline: float,
+    samples: List[Sample]
+) -> None:
+    """One virtual user issuing requests back to back until the deadline"""
+    endpoints, weights = list(mix), list(mix.values())
+    while True:
+        start = time.perf_counter()
+        if start >= deadline:
+            return
+        endpoint = rng.choices(endpoints, weights)[0]
+        try:
+            response = await client.get(request_path(endpoint, targets, rng))
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 0
+        if start >= measure_from:
+            samples.append(Sample(endpoint, time.perf_counter() - start, status))
+
+
+async def _drive(
+    base_url: str,
+    mix: Dict[str, float],
+    targets: Targets,
+    concurrency: int,
+    warmup: float,
+    duration: float,
+    seed: int
+) -> List[Sample]:
+    samples: List[Sample] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        now = time.perf_counter()
+        measure_from, deadline = now + warmup, now + warmup + duration
+        await asyncio.gather(*(
+            _client_loop(client, mix, targets, random.Random(seed * 10007 + i), measure_from, deadline, samples)
+            for i in range(concurrency)
+        ))
+    return samples
+
+
+def _drive_process(args: Tuple) -> List[Sample]:
+    """Entry point of a client process"""
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return asyncio.run(_drive(*args))
+
+
+def drive(
+    base_url: str,
+    mix: Dict[str, float],
+    targets: Targets,
+    concurrency: int,
+    warmup: float,
+    duration: float,
+    processes: int = 1
+) -> List[Sample]:
+    """
+    Drive traffic at the API from several client processes
+
+    Args:
+        base_url: API base URL
+        mix: Endpoint weights
+        targets: IDs to request
+        concurrency: Total concurrent virtual users, split across processes
+        warmup: Seconds of traffic before measuring
+        duration: Seconds of measured traffic
+        processes: Client processes
+
+    Returns:
+        List[Sample]: Requests started in the measured window
+    """
+    shares = [concurrency // processes + (1 if i < concurrency % processes else 0) for i in range(processes)]
+    jobs = [(base_url, mix, targets, share, warmup, duration, i) for i, share in enumerate(shares) if share]
+    with multiprocessing.get_context("spawn").Pool(len(jobs)) as pool:
+        return [sample for samples in pool.map(_drive_process, jobs) for sample in samples]
+
+
+def free_port() -> int:
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 120.0) -> None:
+    """
+    Poll a URL until it answers
+
+    Raises:
+        RuntimeError: If the process exits or the URL does not answer in time
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(process.args)} exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"{url} did not become ready within {timeout:.0f}s")
+
+
+def stop(process: subprocess.Popen) -> None:
+    """Terminate a server process and its workers"""
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def fetch_targets(stub_url: str) -> Targets:
+    """Players and games that have projections in the stub"""
+    response = httpx.get(f"{stub_url}/rest/v1/player_projections", params={"select": "player_id,game_id"})
+    response.raise_for_status()
+    rows = response.json()
+    return Targets(
+        player_ids=sorted({row["player_id"] for row in rows}),
+        game_ids=sorted({row["game_id"] for row in rows}),
+    )
+
+
+def print_report(results: Dict[int, Dict[str, Dict[str, float]]]) -> None:
+    """Print one table row per worker count and endpoint"""
+    header = f"{'workers':>7}  {'endpoint':<8} {'requests':>9} {'errors':>6} {'req/s':>8}"
+    header += "".join(f" {f'p{pct} ms':>8}" for pct in PERCENTILES) + f" {'max ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for workers, summary in results.items():
+        for endpoint, stats in summary.items():
+            row = f"{workers:>7}  {endpoint:<8} {stats['requests']:>9} {stats['errors']:>6} {stats['rps']:>8.1f}"
+            row += "".join(f" {stats[f'p{pct}_ms']:>8.1f}" for pct in PERCENTILES) + f" {stats['max_ms']:>8.1f}"
+            print(row)
+
+
+def run(
+    worker_counts: Sequence[int],
+    mix: Dict[str, float],
+    concurrency: int,
+    warmup: float,
+    duration: float,
+    latency_ms: float,
+    jitter: float,
+    client_processes: int,
+    app_env: Optional[Dict[str, str]] = None
+) -> Dict[int, Dict[str, Dict[str, float]]]:
+    """
+    Run the load test at each worker count
+
+    Args:
+        worker_counts: uvicorn worker counts to test
+        mix: Endpoint weights
+        concurrency: Concurrent virtual users
+        warmup: Seconds of unmeasured traffic per run
+        duration: Seconds of measured traffic per run
+        latency_ms: Latency the stub adds to every database call
+        jitter: Relative spread of the stub latency
+        client_processes: Load generator processes
+        app_env: Extra environment variables for the app
+
+    Returns:
+        Dict[int, Dict[str, Dict[str, float]]]: Summary per worker count
+    """
+    stub_port = free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "loadtest.postgrest_stub", "--port", str(stub_port),
+         "--latency-ms", str(latency_ms), "--jitter", str(jitter)],
+        cwd=BACKEND_DIR,
+    )
+    results = {}
+    try:
+        wait_until_ready(f"{stub_url}/rest/v1/data_versions", stub)
+        targets = fetch_targets(stub_url)
+        logger.info(f"Stub ready with {len(targets.player_ids)} players in {len(targets.game_ids)} games")
+
+        env = {**os.environ, "SUPABASE_URL": stub_url, "SUPABASE_KEY": "loadtest", **(app_env or {})}
+        cores = os.cpu_count() or 1
+        for workers in worker_counts:
+            if workers + client_processes + 1 > cores:
+                logger.warning(
+                    f"{workers} worker(s), {client_processes} client process(es) and the stub share {cores} CPU(s); "
+                    f"throughput will understate how the app scales"
+                )
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            app = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+                 "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+                cwd=BACKEND_DIR,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_until_ready(f"{base_url}/health", app)
+                logger.info(f"Driving {concurrency} clients at {workers} worker(s) for {warmup:.0f}s + {duration:.0f}s")
+                samples = drive(base_url, mix, targets, concurrency, warmup, duration, client_processes)
+                results[workers] = summarize(samples, duration)
+            finally:
+                stop(app)
+    finally:
+        stop(stub)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the projections API against a PostgREST stub")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated uvicorn worker counts")
+    parser.add_argument("--mix", type=parse_mix, default="default",
+                        help=f"Traffic mix: {', '.join(TRAFFIC_MIXES)} or e.g. today=1,game=2,player=1")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent virtual users")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds per run")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds per run")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Latency added to every database call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Relative spread of the database latency")
+    parser.add_argument("--client-processes", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = run(
+        worker_counts=[int(w) for w in args.workers.split(",")],
+        mix=args.mix,
+        concurrency=args.concurrency,
+        warmup=args.warmup,
+        duration=args.duration,
+        latency_ms=args.latency_ms,
+        jitter=args.jitter,
+        client_processes=args.client_processes,
+    )
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "wb") as f:
+            f.write(orjson.dumps({
+                "mix": args.mix,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "latency_ms": args.latency_ms,
+                "cpus": os.cpu_count(),
+                "results": results,
+            }, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+if __name__ == "__main__":
+    main()
@@ -128,7 +128,7 @@ async def test_player_operations(team_id):
         )
         
         # Create player
-        created_player = await repo.create_player(player)
+        created_player, _ = await repo.create_player(player)
         print(f"✅ Successfully created player: {created_player.full_name}")
         
         # Retrieve player to verify